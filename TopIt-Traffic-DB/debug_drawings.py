@@ -1,10 +1,13 @@
-import fitz
 import json
+import os
+import sys
 from collections import Counter
 
-doc = fitz.open(r'C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf')
-page = doc[0]
-drawings = page.get_drawings()
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from pdf_geometry import load_geometry
+
+geometry = load_geometry(r'C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf')
+drawings = geometry.drawings()
 
 # Analyze item types across all drawings
 op_counts = Counter()
@@ -57,5 +60,3 @@ for d in drawings:
 print("\n(has_fill, has_stroke) counts:")
 for k, cnt in fill_counts.most_common():
     print(f"  fill={k[0]}, stroke={k[1]}: {cnt}")
-
-doc.close()
@@ -1,6 +1,10 @@
-import fitz
 import json
-import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from spatial_index import node_grid
+from pdf_geometry import load_geometry
 
 with open(r'C:\JJUN_DEV\TopIt-Traffic-DB\pdf_extracted_nodes.json', 'r', encoding='utf-8') as f:
     nodes = json.load(f)
@@ -8,17 +12,13 @@ with open(r'C:\JJUN_DEV\TopIt-Traffic-DB\pdf_extracted_nodes.json', 'r', encodin
 node_pts = [(n['node_cx'], n['node_cy']) for n in nodes]
 node_codes = [n['code'] for n in nodes]
 
+node_index = node_grid(nodes)
+
 def nearest_node_info(px, py):
-    best_i, best_d = None, float('inf')
-    for i, (nx, ny) in enumerate(node_pts):
-        d = math.hypot(px - nx, py - ny)
-        if d < best_d:
-            best_i, best_d = i, d
-    return best_i, best_d
+    return node_index.nearest(px, py)
 
-doc = fitz.open(r'C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf')
-page = doc[0]
-drawings = page.get_drawings()
+geometry = load_geometry(r'C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf')
+drawings = geometry.drawings()
 
 # Focus on line ('l') items: look at segments near nodes
 # and also look at curves ('c') items
@@ -113,5 +113,3 @@ print(f"Orange paths: {len(orange_paths)}")
 green_paths = [d for d in drawings if d.get('color') and 
                abs(d['color'][1] - 0.69) < 0.05 and abs(d['color'][2] - 0.31) < 0.05]
 print(f"Green paths: {len(green_paths)}")
-
-doc.close()
@@ -1,6 +1,10 @@
-import fitz
 import json
-import math
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from spatial_index import PointGrid
+from pdf_geometry import load_geometry
 
 with open(r'C:\JJUN_DEV\TopIt-Traffic-DB\pdf_extracted_nodes.json', 'r', encoding='utf-8') as f:
     nodes = json.load(f)
@@ -17,39 +21,38 @@ isolated_codes = ['002','003','004','005','007','009','010','011','023',
 
 code_to_idx = {n['code']: i for i, n in enumerate(nodes)}
 
-doc = fitz.open(r'C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf')
-page = doc[0]
-drawings = page.get_drawings()
+geometry = load_geometry(r'C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf')
+drawings = geometry.drawings()
+
+# Index every line/curve endpoint once (in drawing order, so ties resolve as before)
+endpoints = []
+endpoint_info = []
+for d_i, d in enumerate(drawings):
+    for item in d['items']:
+        pts = []
+        if item[0] == 'l':
+            pts = [(item[1].x, item[1].y), (item[2].x, item[2].y)]
+        elif item[0] == 'c':
+            pts = [(item[1].x, item[1].y), (item[4].x, item[4].y)]
+        elif item[0] == 're':
+            # Rectangle: item[1] is Rect
+            continue
+
+        for px, py in pts:
+            endpoints.append((px, py))
+            endpoint_info.append((d_i, item[0], px, py, d.get('color'), d.get('width')))
+endpoint_index = PointGrid(endpoints)
 
 # For each isolated node, find the closest line endpoint in any drawing
 for code in isolated_codes:
     idx = code_to_idx[code]
     nx, ny = node_pts[idx]
-    
-    best_dist = float('inf')
-    best_info = None
-    
-    for d_i, d in enumerate(drawings):
-        for item in d['items']:
-            pts = []
-            if item[0] == 'l':
-                pts = [(item[1].x, item[1].y), (item[2].x, item[2].y)]
-            elif item[0] == 'c':
-                pts = [(item[1].x, item[1].y), (item[4].x, item[4].y)]
-            elif item[0] == 're':
-                # Rectangle: item[1] is Rect
-                continue
-            
-            for px, py in pts:
-                d_val = math.hypot(px - nx, py - ny)
-                if d_val < best_dist:
-                    best_dist = d_val
-                    best_info = (d_i, item[0], px, py, d.get('color'), d.get('width'))
-    
+
+    best_i, best_dist = endpoint_index.nearest(nx, ny)
+    best_info = endpoint_info[best_i] if best_i is not None else None
+
     n = nodes[idx]
     if best_dist < 60:
         print(f"[{code}] {n['name']:<14s} node=({nx:.1f},{ny:.1f})  closest_pt=({best_info[2]:.1f},{best_info[3]:.1f})  dist={best_dist:.1f}  op={best_info[1]}  color={best_info[4]}  width={best_info[5]}")
     else:
         print(f"[{code}] {n['name']:<14s} node=({nx:.1f},{ny:.1f})  FARAWAY  closest_dist={best_dist:.1f}")
-
-doc.close()
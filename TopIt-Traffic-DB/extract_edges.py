@@ -1,6 +1,11 @@
 import json
 import math
-import fitz  # PyMuPDF
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scripts'))
+from spatial_index import node_grid
+from pdf_geometry import load_geometry
 
 # ── 1. Load nodes ──────────────────────────────────────────────────
 with open(r'C:\JJUN_DEV\TopIt-Traffic-DB\pdf_extracted_nodes.json', 'r', encoding='utf-8') as f:
@@ -12,23 +17,17 @@ node_pts = [(n['node_cx'], n['node_cy']) for n in nodes]
 node_codes = [n['code'] for n in nodes]
 node_names = [n['name'] for n in nodes]
 
+node_index = node_grid(nodes)
+
 def nearest_node(px, py, max_dist=40.0):
     """Return (index, distance) of closest node within max_dist, or (None, inf)."""
-    best_i, best_d = None, float('inf')
-    for i, (nx, ny) in enumerate(node_pts):
-        d = math.hypot(px - nx, py - ny)
-        if d < best_d:
-            best_i, best_d = i, d
-    if best_d <= max_dist:
-        return best_i, best_d
-    return None, best_d
+    return node_index.nearest(px, py, max_dist)
 
 # ── 2. Open PDF & get drawings ─────────────────────────────────────
-doc = fitz.open(r'C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf')
-page = doc[0]
-print(f"Page size: {page.rect.width:.0f} x {page.rect.height:.0f} pts")
+geometry = load_geometry(r'C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf')
+print(f"Page size: {geometry.page_width:.0f} x {geometry.page_height:.0f} pts")
 
-drawings = page.get_drawings()
+drawings = geometry.drawings()
 print(f"Total drawing paths: {len(drawings)}")
 
 # ── 3. Extract edges ───────────────────────────────────────────────
@@ -176,5 +175,3 @@ with open(output_path, 'w', encoding='utf-8') as f:
     json.dump(edges, f, ensure_ascii=False, indent=2)
 
 print(f"\nSaved {len(edges)} edges to: {output_path}")
-
-doc.close()
@@ -1,7 +1,9 @@
 import json
-import math
-import fitz
-from collections import defaultdict, Counter
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from spatial_index import node_grid
 
 with open(r"C:\JJUN_DEV\TopIt-Traffic-DB\pdf_extracted_nodes.json", "r", encoding="utf-8") as f:
     nodes = json.load(f)
@@ -11,12 +13,7 @@ node_pts = [(n["node_cx"], n["node_cy"]) for n in nodes]
 node_codes = [n["code"] for n in nodes]
 code_to_node = {n["code"]: n for n in nodes}
 
+node_index = node_grid(nodes)
+
 def nearest_node(px, py, max_dist=40.0):
-    best_i, best_d = None, float("inf")
-    for i, (nx, ny) in enumerate(node_pts):
-        d = math.hypot(px - nx, py - ny)
-        if d < best_d:
-            best_i, best_d = i, d
-    if best_d <= max_dist:
-        return best_i, best_d
-    return None, best_d
+    return node_index.nearest(px, py, max_dist)
@@ -1,6 +1,12 @@
 import json
 import math
-import fitz
+import os
+import sys
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "scripts"))
+from spatial_index import node_grid
+from pdf_geometry import load_geometry
 
 # == 1. Load nodes ==
 with open(r"C:\JJUN_DEV\TopIt-Traffic-DB\pdf_extracted_nodes.json", "r", encoding="utf-8") as f:
@@ -14,22 +20,16 @@ node_names = [n["name"] for n in nodes]
 code_to_node = {n["code"]: n for n in nodes}
 code_to_idx = {n["code"]: i for i, n in enumerate(nodes)}
 
+node_index = node_grid(nodes)
+
 def nearest_node(px, py, max_dist=40.0):
-    best_i, best_d = None, float("inf")
-    for i, (nx, ny) in enumerate(node_pts):
-        d = math.hypot(px - nx, py - ny)
-        if d < best_d:
-            best_i, best_d = i, d
-    if best_d <= max_dist:
-        return best_i, best_d
-    return None, best_d
+    return node_index.nearest(px, py, max_dist)
 
 # == 2. Open PDF ==
-doc = fitz.open(r"C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf")
-page = doc[0]
-print(f"Page size: {page.rect.width:.0f} x {page.rect.height:.0f} pts")
+geometry = load_geometry(r"C:\JJUN_DEV\TopIt-Traffic-DB\복사본 A3size_보령 신호제어기 요도(적색점멸용)20240710.pdf")
+print(f"Page size: {geometry.page_width:.0f} x {geometry.page_height:.0f} pts")
 
-drawings = page.get_drawings()
+drawings = geometry.drawings()
 print(f"Total drawing paths: {len(drawings)}")
 
 # == 3. Build edge set ==
@@ -96,45 +96,33 @@ for d in drawings:
 print(f"After Strategy A+B: {len(edge_set)} unique edges")
 
 # Strategy C: chain projection on line segments
-def point_to_segment_dist(px, py, x1, y1, x2, y2):
-    dx, dy = x2 - x1, y2 - y1
-    seg_len_sq = dx*dx + dy*dy
-    if seg_len_sq < 1e-10:
-        return math.hypot(px - x1, py - y1)
-    t = max(0, min(1, ((px - x1)*dx + (py - y1)*dy) / seg_len_sq))
-    proj_x = x1 + t * dx
-    proj_y = y1 + t * dy
-    return math.hypot(px - proj_x, py - proj_y)
-
+# Segment-to-node projection is broadcast over SEG_BATCH segments x all nodes at once
 PROX_DIST = 15.0
+SEG_BATCH = 4096
+
+segments = geometry.chords(geometry.select("l", "c"))  # l: p1-p2, c: p1-p4
+seg_dx = segments[:, 2] - segments[:, 0]
+seg_dy = segments[:, 3] - segments[:, 1]
+segments = segments[np.hypot(seg_dx, seg_dy) >= 5]
+
+node_xy = np.array(node_pts, dtype=np.float64).reshape(-1, 2)
+node_x, node_y = node_xy[:, 0], node_xy[:, 1]
+
 chain_added = 0
-for d in drawings:
-    for item in d.get("items", []):
-        if item[0] == "l":
-            p1, p2 = item[1], item[2]
-            x1, y1, x2, y2 = p1.x, p1.y, p2.x, p2.y
-        elif item[0] == "c":
-            p1, p4 = item[1], item[4]
-            x1, y1, x2, y2 = p1.x, p1.y, p4.x, p4.y
-        else:
-            continue
-        seg_len = math.hypot(x2 - x1, y2 - y1)
-        if seg_len < 5:
-            continue
-        dx, dy = x2 - x1, y2 - y1
-        seg_len_sq = dx*dx + dy*dy
-        close_nodes = []
-        for i, (nx, ny) in enumerate(node_pts):
-            d_val = point_to_segment_dist(nx, ny, x1, y1, x2, y2)
-            if d_val <= PROX_DIST:
-                t = ((nx - x1)*dx + (ny - y1)*dy) / seg_len_sq
-                close_nodes.append((t, i))
-        if len(close_nodes) < 2:
-            continue
-        close_nodes.sort()
-        for j in range(len(close_nodes) - 1):
-            ni1 = close_nodes[j][1]
-            ni2 = close_nodes[j+1][1]
+for start in range(0, len(segments), SEG_BATCH):
+    batch = segments[start:start + SEG_BATCH]
+    x1, y1 = batch[:, 0:1], batch[:, 1:2]
+    dx, dy = batch[:, 2:3] - x1, batch[:, 3:4] - y1
+    seg_len_sq = dx*dx + dy*dy
+    # (segments, nodes): unclamped t orders the chain, clamped t gives the distance
+    t = ((node_x - x1)*dx + (node_y - y1)*dy) / seg_len_sq
+    t_clamped = np.clip(t, 0, 1)
+    dist = np.hypot(node_x - (x1 + t_clamped*dx), node_y - (y1 + t_clamped*dy))
+    close = dist <= PROX_DIST
+    for row in np.flatnonzero(close.sum(axis=1) >= 2):
+        idx = np.flatnonzero(close[row])
+        chain = idx[np.lexsort((idx, t[row, idx]))]
+        for ni1, ni2 in zip(chain[:-1], chain[1:]):
             key = tuple(sorted([node_codes[ni1], node_codes[ni2]]))
             if key not in edge_set:
                 edge_set.add(key)
@@ -204,4 +192,3 @@ output_path = r"C:\JJUN_DEV\TopIt-Traffic-DB\pdf_extracted_edges.json"
 with open(output_path, "w", encoding="utf-8") as f:
     json.dump(edges, f, ensure_ascii=False, indent=2)
 print(f"\n*** Saved {len(edges)} edges to: {output_path} ***")
-doc.close()
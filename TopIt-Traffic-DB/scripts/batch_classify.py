@@ -0,0 +1,304 @@
+"""
+다중 지자체 일괄 분류 - 도시 목록 매니페스트의 소스 트리를 한 프로세스에서 classify 한다.
+
+사용법:
+    python scripts/batch_classify.py cities.json [--jobs N] [--workers N] [--scan-workers N]
+                                     [--full] [--resume] [--sqlite]
+
+cities.json (경로는 이 파일 위치 기준 상대경로 가능):
+    {
+      "output_root": "신호DB",
+      "cities": [
+        {"code": "boryeong", "name": "보령시",
+         "dat_dir": "참조할dat/제어기DB", "xlsx_dir": "주기표엑셀",
+         "pdf_nodes": "pdf_extracted_nodes.json", "routes": "routes.json"},
+        {"code": "seosan", "name": "서산시",
+         "dat_dir": "서산/dat", "xlsx_dir": "서산/주기표", "output_dir": "서산시_신호DB"}
+      ]
+    }
+
+    pdf_nodes / routes (선택): 그 도시의 요도 PDF 노드 / 노선 파일. 교차로 식별 인덱스
+    (identity_index.json)의 pdf / routes 소스가 되며, 없으면 그 도시에서는 두 소스를 제외한다.
+
+출력:
+    {output_root}/
+    ├── {code}/                 ← 도시별 classify 출력 (output_dir 지정 시 그 경로)
+    │   ├── master.json         ← city, city_code 기록
+    │   ├── classify.log        ← 해당 도시 classify 출력
+    │   └── ...
+    └── federated_index.json    ← 전체 도시 통합 인덱스
+
+ID 네임스페이스:
+    도시 폴더 안의 ID는 기존과 같은 BC-xxx (웹앱/매니페스트 호환),
+    통합 인덱스에서는 "{code}:BC-xxx" 로 전역 고유하다.
+
+한 프로세스에서 실행하므로 모듈 임포트/정규화 캐시가 도시 간에 재사용되고,
+모든 도시의 복사/쓰기 작업은 --workers 크기의 스레드 풀 하나를, DAT/엑셀 파싱은 --scan-workers 크기의
+프로세스 풀 하나를 공유한다. 파싱 풀은 도시 스레드들이 함께 쓰므로 fork 대신 spawn 으로 띄운다
+(여러 스레드가 도는 프로세스를 fork 하면 잠금 상태가 복제되어 교착될 수 있음).
+도시는 --jobs 개씩 동시에 처리하며, 각 도시는 자체 매니페스트로 증분 실행된다.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from classify import build_parser, run, _setup_console, DEFAULT_SCAN_WORKERS
+from manifest import MANIFEST_NAME
+from matcher import normalize_name
+from parallel_io import shared_executor, atomic_write_json, DEFAULT_IO_WORKERS
+
+
+FEDERATED_INDEX_NAME = 'federated_index.json'
+FEDERATED_INDEX_VERSION = 1
+LOG_NAME = 'classify.log'
+
+CITY_CODE_RE = re.compile(r'^[A-Za-z0-9_-]+$')
+
+
+def load_city_manifest(path) -> tuple[Path, list[dict]]:
+    """cities.json 을 읽어 (output_root, 도시 목록) 을 반환한다. 경로는 절대경로로 변환한다.
+
+    Raises:
+        ValueError: 필수 항목 누락, 코드 형식 오류, 코드 중복
+    """
+    path = Path(path)
+    base = path.resolve().parent
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+
+    output_root = base / data.get('output_root', '신호DB')
+    cities = []
+    seen = set()
+    for i, c in enumerate(data.get('cities', [])):
+        for key in ('code', 'name', 'dat_dir'):
+            if not c.get(key):
+                raise ValueError(f'cities[{i}]: {key} 누락')
+        code = c['code']
+        if not CITY_CODE_RE.match(code):
+            raise ValueError(f'cities[{i}]: 코드는 영문/숫자/_/- 만 사용 ({code})')
+        if code in seen:
+            raise ValueError(f'cities[{i}]: 코드 중복 ({code})')
+        seen.add(code)
+        cities.append({
+            'code': code,
+            'name': c['name'],
+            'dat_dir': base / c['dat_dir'],
+            'xlsx_dir': base / c['xlsx_dir'] if c.get('xlsx_dir') else None,
+            'output_dir': base / c['output_dir'] if c.get('output_dir') else output_root / code,
+            'pdf_nodes': base / c['pdf_nodes'] if c.get('pdf_nodes') else None,
+            'routes': base / c['routes'] if c.get('routes') else None,
+        })
+    if not cities:
+        raise ValueError('cities 가 비어 있음')
+    return output_root, cities
+
+
+class _ThreadLocalStdout:
+    """스레드별로 출력 대상을 바꾸는 sys.stdout 대리 객체 (도시별 classify.log)."""
+
+    def __init__(self, default):
+        self._default = default
+        self._local = threading.local()
+
+    def redirect(self, stream):
+        self._local.stream = stream
+
+    def _target(self):
+        return getattr(self._local, 'stream', None) or self._default
+
+    def write(self, text):
+        return self._target().write(text)
+
+    def flush(self):
+        self._target().flush()
+
+    def isatty(self):
+        return False
+
+
+def classify_city(city: dict, options: list[str], stdout: _ThreadLocalStdout,
+                  scan_pool: Optional[Executor] = None) -> dict:
+    """도시 1곳 classify. 출력은 {output_dir}/classify.log 로 보낸다. 파싱은 scan_pool 에서 실행한다."""
+    argv = [
+        '--dat-dir', str(city['dat_dir']),
+        '--output-dir', str(city['output_dir']),
+        '--city', city['name'],
+        '--city-code', city['code'],
+        *options,
+    ]
+    if city['xlsx_dir'] is not None:
+        argv += ['--xlsx-dir', str(city['xlsx_dir'])]
+    else:
+        argv += ['--dat-only']
+    for key in ('pdf_nodes', 'routes'):
+        if city[key] is not None:
+            argv += [f'--{key.replace("_", "-")}', str(city[key])]
+    args = build_parser().parse_args(argv)
+
+    city['output_dir'].mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+    with open(city['output_dir'] / LOG_NAME, 'w', encoding='utf-8') as log:
+        stdout.redirect(log)
+        try:
+            result = run(args, scan_pool)
+        except Exception:
+            log.write(traceback.format_exc())
+            raise
+        finally:
+            stdout.redirect(None)
+    return {'result': result, 'elapsed': time.perf_counter() - started}
+
+
+def build_federated_index(output_root: Path, cities: list[dict]) -> dict:
+    """도시별 master.json / _manifest.json 을 모아 통합 인덱스를 만든다."""
+    city_rows = []
+    intersections = []
+    by_name = {}
+    for city in cities:
+        out = city['output_dir']
+        try:
+            with open(out / 'master.json', 'r', encoding='utf-8') as f:
+                master = json.load(f)
+        except (OSError, ValueError):
+            continue
+        dirs = {}
+        try:
+            with open(out / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+                dirs = {n: e['dir'] for n, e in json.load(f).get('intersections', {}).items()}
+        except (OSError, ValueError):
+            pass
+
+        city_rows.append({
+            'code': city['code'],
+            'name': city['name'],
+            'output_dir': _relative(out, output_root),
+            'total': master.get('total', 0),
+            'created': master.get('created'),
+        })
+        for entry in master.get('intersections', []):
+            uid = f'{city["code"]}:{entry["id"]}'
+            folder = dirs.get(entry['name'])
+            intersections.append({
+                'uid': uid,
+                'city': city['code'],
+                'id': entry['id'],
+                'name': entry['name'],
+                'dir': _relative(out / folder, output_root) if folder else None,
+                'manufacturer': entry.get('manufacturer'),
+                'has_dat': entry.get('has_dat'),
+                'has_cycle_table': entry.get('has_cycle_table'),
+                'phases': entry.get('phases'),
+                'cycle': entry.get('cycle'),
+            })
+            by_name.setdefault(normalize_name(entry['name']), []).append(uid)
+
+    return {
+        'version': FEDERATED_INDEX_VERSION,
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'cities': city_rows,
+        'total': len(intersections),
+        'intersections': intersections,
+        'by_name': by_name,
+    }
+
+
+def _relative(path: Path, root: Path) -> str:
+    try:
+        return Path(path).resolve().relative_to(Path(root).resolve()).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='다중 지자체 일괄 분류 (공유 스레드 풀 + 통합 인덱스)')
+    parser.add_argument('cities', help='도시 목록 매니페스트 (cities.json)')
+    parser.add_argument('--jobs', type=int, default=2, help='동시에 처리할 도시 수 (기본 2)')
+    parser.add_argument('--workers', type=int, default=DEFAULT_IO_WORKERS,
+                        help=f'전체 도시가 공유하는 I/O 스레드 수 (기본 {DEFAULT_IO_WORKERS})')
+    parser.add_argument('--scan-workers', type=int, default=DEFAULT_SCAN_WORKERS,
+                        help=f'전체 도시가 공유하는 DAT/엑셀 파싱 프로세스 수 (기본 CPU 수 {DEFAULT_SCAN_WORKERS})')
+    parser.add_argument('--full', action='store_true', help='모든 도시 전체 재처리')
+    parser.add_argument('--resume', action='store_true', help='중단된 도시는 체크포인트에서 재개')
+    parser.add_argument('--sqlite', action='store_true', help='도시별 SQLite DB 도 출력')
+    args = parser.parse_args()
+    _setup_console()
+
+    try:
+        output_root, cities = load_city_manifest(args.cities)
+    except (OSError, ValueError) as e:
+        print(f'❌ 도시 목록 오류: {e}')
+        sys.exit(1)
+    output_root.mkdir(parents=True, exist_ok=True)
+
+    options = ['--workers', str(args.workers)]
+    for flag in ('full', 'resume', 'sqlite'):
+        if getattr(args, flag):
+            options.append(f'--{flag}')
+
+    print('=' * 60)
+    print(f'  다중 지자체 일괄 분류: {len(cities)}개 도시 '
+          f'(동시 {args.jobs}, I/O 스레드 {args.workers}, 파싱 프로세스 {args.scan_workers})')
+    print(f'  출력 루트: {output_root}')
+    print('=' * 60)
+
+    console = sys.stdout
+    stdout = _ThreadLocalStdout(console)
+    sys.stdout = stdout
+    lock = threading.Lock()
+    failed = []
+    started = time.perf_counter()
+
+    def job(city):
+        try:
+            outcome = classify_city(city, options, stdout, scan_pool)
+        except Exception as e:
+            with lock:
+                failed.append(city['code'])
+                console.write(f'  ❌ {city["code"]:12s} {city["name"]}: {e} '
+                              f'(로그: {city["output_dir"] / LOG_NAME})\n')
+            return
+        result = outcome['result']
+        with lock:
+            if result is None:
+                failed.append(city['code'])
+                console.write(f'  ❌ {city["code"]:12s} {city["name"]}: DAT 디렉토리 없음\n')
+            else:
+                console.write(f'  ✅ {city["code"]:12s} {city["name"]}: {outcome["elapsed"]:.1f}s, '
+                              f'변경 입력 {result["changed"]}개, 교차로 {len(result["rewritten"])}개 갱신\n')
+            console.flush()
+
+    try:
+        with shared_executor(args.workers), \
+                ProcessPoolExecutor(max_workers=max(1, args.scan_workers),
+                                    mp_context=multiprocessing.get_context('spawn')) as scan_pool:
+            with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as cities_pool:
+                list(cities_pool.map(job, cities))
+    finally:
+        sys.stdout = console
+
+    index = build_federated_index(output_root, cities)
+    index_path = output_root / FEDERATED_INDEX_NAME
+    atomic_write_json(index_path, index)
+
+    print(f'\n  통합 인덱스: {index_path} ({len(index["cities"])}개 도시, 교차로 {index["total"]}개)')
+    print(f'  전체 소요: {time.perf_counter() - started:.1f}s')
+    if failed:
+        print(f'  ❌ 실패: {", ".join(failed)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+모듈 임포트 시간 측정 - `python -X importtime` 결과를 모듈별로 요약한다.
+
+각 모듈을 새 인터프리터에서 임포트하여(캐시 영향 없음) 누적 시간과
+가장 오래 걸린 하위 임포트를 보여준다. CLI 시작 지연이 늘었는지 확인할 때 사용한다.
+
+사용법:
+    python scripts/bench_import.py                      # 기본 모듈 전체
+    python scripts/bench_import.py classify dat_parser  # 지정 모듈만
+    python scripts/bench_import.py --max-ms 100 dat_parser   # 초과 시 종료코드 1
+
+참고 (엑셀 백엔드 지연 로드 후):
+    dat_parser / matcher 는 수 ms, classify 는 openpyxl·xlrd·numpy 없이 로드되어야 한다.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+
+SCRIPTS_DIR = os.path.dirname(os.path.abspath(__file__))
+
+DEFAULT_MODULES = [
+    'dat_parser',
+    'xlsx_parser',
+    'matcher',
+    'match_audit',
+    'classify',
+]
+
+# 이 모듈들이 임포트 시점에 로드되면 경고 (실제 사용 시점에 지연 로드해야 함)
+HEAVY_MODULES = ('openpyxl', 'xlrd', 'numpy')
+
+TOP_N = 5
+
+
+def measure(module: str, repeat: int = 3) -> dict:
+    """module 임포트를 repeat회 측정하여 누적 시간이 가장 짧은 실행 결과를 반환한다.
+
+    Returns:
+        {'module', 'total_us', 'entries': [(누적us, 자체us, 모듈명)], 'heavy': [모듈명]}
+    """
+    best = None
+    for _ in range(repeat):
+        proc = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+            cwd=SCRIPTS_DIR, capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            raise RuntimeError(f'{module} 임포트 실패:\n{proc.stderr.strip()[-500:]}')
+        entries = _parse_importtime(proc.stderr)
+        total = next((cum for cum, _, name in entries if name == module), 0)
+        if best is None or total < best['total_us']:
+            best = {'module': module, 'total_us': total, 'entries': entries}
+
+    loaded = {name.split('.')[0] for _, _, name in best['entries']}
+    best['heavy'] = [m for m in HEAVY_MODULES if m in loaded and m != module]
+    return best
+
+
+def _parse_importtime(stderr: str) -> list[tuple[int, int, str]]:
+    """'import time: self [us] | cumulative | imported package' 줄을 파싱한다."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        parts = line[len('import time:'):].split('|')
+        if len(parts) != 3:
+            continue
+        self_us, cum_us, name = parts
+        try:
+            entries.append((int(cum_us), int(self_us), name.strip()))
+        except ValueError:
+            continue  # 헤더 줄
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description='모듈 임포트 시간 측정 (-X importtime)')
+    parser.add_argument('modules', nargs='*', default=DEFAULT_MODULES, help='측정할 모듈')
+    parser.add_argument('--repeat', type=int, default=3, help='반복 횟수 (최솟값 사용)')
+    parser.add_argument('--max-ms', type=float, help='모듈 누적 시간 상한 (초과 시 종료코드 1)')
+    args = parser.parse_args()
+
+    over = []
+    for module in args.modules:
+        result = measure(module, args.repeat)
+        total_ms = result['total_us'] / 1000
+        print(f'{module:14s} {total_ms:8.1f}ms')
+
+        top = sorted(
+            (e for e in result['entries'] if e[2] != module),
+            key=lambda e: -e[0],
+        )[:TOP_N]
+        for cum, _, name in top:
+            print(f'    {cum / 1000:8.1f}ms  {name.strip()}')
+        if result['heavy']:
+            print(f'    ⚠ 임포트 시점에 로드됨: {", ".join(result["heavy"])}')
+
+        if args.max_ms is not None and total_ms > args.max_ms:
+            over.append(module)
+
+    if over:
+        print(f'\n❌ {args.max_ms:.0f}ms 초과: {", ".join(over)}')
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
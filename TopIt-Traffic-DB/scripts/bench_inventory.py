@@ -0,0 +1,174 @@
+"""
+소스 트리 순회 비용 측정 - inventory.build_inventory() 와 이전 rglob 방식을 비교한다.
+
+네트워크 공유 폴더에서는 디렉토리 목록 1회, 파일 stat 1회가 각각 서버 왕복이다.
+os.scandir / os.stat 호출마다 --rtt 만큼 지연을 넣어 왕복 비용을 재현하고, 호출 수와 소요 시간을 보여준다.
+
+  original : 분류 전 스캔(*.dat, *.xlsx, *.xls) + 원본 복사(같은 3패턴) → rglob 6회
+  rglob    : 인벤토리 도입 직전 (rglob 3회 + 매니페스트용 파일별 os.stat)
+  scandir  : inventory.build_inventory() (폴더당 scandir 1회, 크기/시각은 DirEntry.stat,
+             목록/stat 왕복은 스레드 풀에서 겹침)
+
+DirEntry.stat() 은 Windows(SMB 포함)에서는 목록 응답에 포함되어 왕복이 없고,
+POSIX(NFS/CIFS 마운트)에서는 파일마다 stat 호출이다. --posix 로 후자를 가정한다.
+
+사용법:
+    python scripts/bench_inventory.py                 # 지연 없음 (로컬 디스크)
+    python scripts/bench_inventory.py --rtt 2         # 왕복 2ms (Windows 공유 폴더)
+    python scripts/bench_inventory.py --rtt 2 --posix # 왕복 2ms, DirEntry.stat 도 왕복
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from inventory import build_inventory
+from xlsx_parser import is_skipped_excel
+
+
+class _Entry:
+    """DirEntry 대리 객체 (stat 호출 계수/지연용)."""
+
+    def __init__(self, entry, counter):
+        self._entry = entry
+        self._counter = counter
+        self.name = entry.name
+        self.path = entry.path
+
+    def is_dir(self, **kwargs):
+        return self._entry.is_dir(**kwargs)
+
+    def is_file(self, **kwargs):
+        return self._entry.is_file(**kwargs)
+
+    def stat(self, **kwargs):
+        self._counter.round_trip('stat' if self._counter.posix else None)
+        return self._entry.stat(**kwargs)
+
+
+class _ScandirIterator:
+    def __init__(self, path, counter):
+        self._it = counter.real_scandir(path)
+        self._counter = counter
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+    def __iter__(self):
+        return (_Entry(e, self._counter) for e in self._it)
+
+
+class CallCounter:
+    """os.scandir / os.stat 를 가로채 호출 수를 세고 호출마다 rtt초 지연한다."""
+
+    def __init__(self, rtt: float, posix: bool):
+        self.rtt = rtt
+        self.posix = posix
+        self.counts = {'scandir': 0, 'stat': 0}
+        self._lock = threading.Lock()  # build_inventory 는 여러 스레드에서 호출한다
+        self.real_scandir = os.scandir
+        self.real_stat = os.stat
+
+    def round_trip(self, kind):
+        if kind is None:
+            return
+        with self._lock:
+            self.counts[kind] += 1
+        if self.rtt:
+            time.sleep(self.rtt)
+
+    @contextmanager
+    def patched(self):
+        def scandir(path='.'):
+            self.round_trip('scandir')
+            return _ScandirIterator(path, self)
+
+        def stat(path, *args, **kwargs):
+            self.round_trip('stat')
+            return self.real_stat(path, *args, **kwargs)
+
+        os.scandir, os.stat = scandir, stat
+        try:
+            yield
+        finally:
+            os.scandir, os.stat = self.real_scandir, self.real_stat
+
+
+def walk_original(dat_dir: Path, xlsx_dir: Path):
+    for _ in range(2):  # 스캔 단계 + copy_originals
+        list(dat_dir.rglob('*.dat'))
+        for pattern in ('*.xlsx', '*.xls'):
+            [p for p in xlsx_dir.rglob(pattern) if not p.name.startswith('~$')]
+
+
+def walk_rglob(dat_dir: Path, xlsx_dir: Path):
+    files = sorted(dat_dir.rglob('*.dat'))
+    for pattern in ('*.xlsx', '*.xls'):
+        files += [p for p in sorted(xlsx_dir.rglob(pattern)) if not is_skipped_excel(p.name)]
+    for path in files:
+        os.stat(path)
+
+
+def walk_scandir(dat_dir: Path, xlsx_dir: Path):
+    build_inventory(dat_dir, xlsx_dir)
+
+
+WALKS = [
+    ('original', walk_original),
+    ('rglob', walk_rglob),
+    ('scandir', walk_scandir),
+]
+
+
+def measure(walk, dat_dir: Path, xlsx_dir: Path, rtt: float, posix: bool, repeat: int) -> dict:
+    """walk를 repeat회 실행하여 가장 빠른 시간과 호출 수를 반환한다."""
+    best = None
+    for _ in range(repeat):
+        counter = CallCounter(rtt, posix)
+        with counter.patched():
+            started = time.perf_counter()
+            walk(dat_dir, xlsx_dir)
+            elapsed = time.perf_counter() - started
+        if best is None or elapsed < best['seconds']:
+            best = {'seconds': elapsed, **counter.counts}
+    return best
+
+
+def main():
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+    parser = argparse.ArgumentParser(description='소스 트리 순회 비용 비교 (rglob vs scandir 인벤토리)')
+    parser.add_argument('--dat-dir', default=str(project_root / '참조할dat' / '제어기DB'))
+    parser.add_argument('--xlsx-dir', default=str(project_root / '주기표엑셀'))
+    parser.add_argument('--rtt', type=float, default=0.0, help='호출당 지연 (ms)')
+    parser.add_argument('--posix', action='store_true', help='DirEntry.stat 도 왕복으로 계산')
+    parser.add_argument('--repeat', type=int, default=None, help='반복 횟수 (기본: 지연 없으면 20, 있으면 3)')
+    args = parser.parse_args()
+
+    repeat = args.repeat or (3 if args.rtt else 20)
+    dat_dir, xlsx_dir = Path(args.dat_dir), Path(args.xlsx_dir)
+    print(f'순회 비용 (왕복 {args.rtt:g}ms, DirEntry.stat {"왕복" if args.posix else "무료"}, {repeat}회 중 최소)')
+    # 한글은 두 칸 폭이므로 글자 수만큼 폭을 줄여 맞춘다
+    print(f'  {"방식":8s} {"목록":>4s} {"stat":>6s} {"시간(ms)":>8s} {"배율":>4s}')
+
+    results = [(name, measure(walk, dat_dir, xlsx_dir, args.rtt / 1000, args.posix, repeat))
+               for name, walk in WALKS]
+    current = results[-1][1]['seconds']
+    for name, r in results:
+        print(f'  {name:10s} {r["scandir"]:6d} {r["stat"]:6d} {r["seconds"] * 1000:10.2f} '
+              f'{r["seconds"] / current:5.1f}x')
+
+
+if __name__ == '__main__':
+    main()
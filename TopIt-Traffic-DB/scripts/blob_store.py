@@ -0,0 +1,187 @@
+"""
+원본 보존 저장소 - sha256 내용 주소 기반 blob 저장 + 하드링크 참조.
+
+구조:
+    _원본/
+    ├── blobs/{sha[:2]}/{sha}{확장자}   ← 원본 내용 1벌만 저장
+    ├── dat_원본/{소스 상대경로}         ← blob 하드링크 (폴더 구조 유지, 이름 충돌 없음)
+    ├── 주기표_원본/{소스 상대경로}      ← blob 하드링크
+    └── catalog.json                    ← 소스 경로 → sha256/크기 목록
+
+하드링크는 _원본 안에서만 쓴다. 하드링크가 불가능한 파일시스템(다른 볼륨, FAT 등)에서는
+복사로 대체한다.
+
+교차로/미분류 폴더의 {이름}.dat / {이름}_주기표.xls 는 웹 서버가 제자리에서 덮어쓰므로
+blob과 inode를 공유하면 안 된다 (원본과 같은 통합 주기표를 쓰는 다른 교차로까지 바뀜).
+이 파일들은 copy_blob()으로 독립된 사본을 만든다 (가능하면 reflink, 아니면 복사).
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import uuid
+from pathlib import Path
+
+from manifest import file_sha256
+from parallel_io import atomic_write_json
+
+# Linux FICLONE ioctl (btrfs/XFS 등에서 내용 공유 + 쓰기 시 분리되는 reflink)
+_FICLONE = 0x40049409
+
+# 이번 실행에서 해시를 확인한 blob 경로 (같은 blob을 여러 번 링크해도 한 번만 읽음)
+_verified = set()
+_verified_lock = threading.Lock()
+
+
+def blob_path(blobs_dir: Path, sha256: str, ext: str = '') -> Path:
+    """sha256에 해당하는 blob 경로."""
+    return Path(blobs_dir) / sha256[:2] / f'{sha256}{ext.lower()}'
+
+
+def store_blob(src, blobs_dir: Path, sha256: str) -> tuple[Path, bool]:
+    """원본을 blob 저장소에 넣는다. 이미 있으면 그대로 둔다.
+
+    Returns:
+        (blob 경로, 새로 저장했는지 여부)
+    """
+    src = Path(src)
+    blob = blob_path(blobs_dir, sha256, src.suffix)
+    if blob.exists() and _blob_intact(blob, sha256):
+        return blob, False
+
+    # 같은 내용을 여러 스레드가 동시에 저장해도 안전하도록 고유 임시파일 → rename
+    blob.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=blob.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        shutil.copy2(src, tmp)
+        os.replace(tmp, blob)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return blob, True
+
+
+def _blob_intact(blob: Path, sha256: str) -> bool:
+    """blob 내용이 이름의 sha256과 일치하는지 확인한다 (실행당 한 번)."""
+    key = str(blob)
+    with _verified_lock:
+        if key in _verified:
+            return True
+    if file_sha256(blob) != sha256:
+        return False
+    with _verified_lock:
+        _verified.add(key)
+    return True
+
+
+def _blob_sha256(blob: Path) -> str:
+    """blob 파일 이름에서 sha256을 꺼낸다."""
+    return Path(blob).name.split('.', 1)[0]
+
+
+def link_blob(blob: Path, dst: Path) -> str:
+    """dst가 blob을 가리키게 한다 (_원본 안에서만 사용). 기존 dst는 임시 링크 → rename으로
+    원자적으로 교체한다.
+
+    이미 같은 inode라도 blob 해시를 다시 확인한다. 손상된 blob이면 ValueError
+    (store_blob()이 먼저 blob을 다시 저장하므로 정상 경로에서는 새 inode로 다시 링크된다).
+
+    Returns:
+        'exists' (이미 같은 파일) / 'linked' (하드링크) / 'copied' (링크 불가 → 복사)
+    """
+    dst = Path(dst)
+    if dst.exists():
+        try:
+            same = os.path.samefile(blob, dst)
+        except OSError:
+            same = False
+        if same:
+            if not _blob_intact(blob, _blob_sha256(blob)):
+                raise ValueError(f'blob 내용이 해시와 다릅니다: {blob}')
+            return 'exists'
+    else:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+
+    def place(tmp):
+        try:
+            os.link(blob, tmp)
+            return 'linked'
+        except OSError:
+            shutil.copy2(blob, tmp)
+            return 'copied'
+
+    return _replace_via_tmp(dst, place)
+
+
+def copy_blob(blob: Path, dst: Path) -> str:
+    """dst에 blob과 inode를 공유하지 않는 사본을 만든다 (교차로/미분류 폴더용).
+
+    dst가 이미 같은 내용의 독립 파일이면 그대로 둔다. 예전 실행이 만든 하드링크는
+    사본으로 바꿔 연결을 끊는다.
+
+    Returns:
+        'exists' (이미 같은 내용의 사본) / 'reflinked' (copy-on-write) / 'copied' (복사)
+    """
+    dst = Path(dst)
+    if dst.exists():
+        try:
+            same = os.path.samefile(blob, dst)
+        except OSError:
+            same = False
+        if not same and os.path.getsize(dst) == os.path.getsize(blob) \
+                and file_sha256(dst) == _blob_sha256(blob):
+            return 'exists'
+    else:
+        dst.parent.mkdir(parents=True, exist_ok=True)
+
+    def place(tmp):
+        if _reflink(blob, tmp):
+            shutil.copystat(blob, tmp)
+            return 'reflinked'
+        shutil.copy2(blob, tmp)
+        return 'copied'
+
+    return _replace_via_tmp(dst, place)
+
+
+def _reflink(src: Path, dst: Path) -> bool:
+    """가능하면 copy-on-write 복제로 dst를 만든다. 실패하면 dst를 남기지 않고 False."""
+    if not sys.platform.startswith('linux'):
+        return False
+    import fcntl
+    try:
+        with open(src, 'rb') as fs, open(dst, 'wb') as fd:
+            fcntl.ioctl(fd.fileno(), _FICLONE, fs.fileno())
+        return True
+    except OSError:
+        try:
+            os.unlink(dst)
+        except OSError:
+            pass
+        return False
+
+
+def _replace_via_tmp(dst: Path, place) -> str:
+    """place(임시 경로)로 같은 폴더 임시파일을 만든 뒤 dst로 rename한다."""
+    tmp = dst.with_name(f'.{dst.name}.{uuid.uuid4().hex}.tmp')
+    try:
+        mode = place(tmp)
+        os.replace(tmp, dst)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+    return mode
+
+
+def write_catalog(originals_dir: Path, catalog: dict):
+    """소스 경로 → blob 목록을 catalog.json으로 저장한다."""
+    atomic_write_json(Path(originals_dir) / 'catalog.json', catalog)
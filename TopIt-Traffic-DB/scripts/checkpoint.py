@@ -0,0 +1,229 @@
+"""
+분류 실행 체크포인트 - classify.py 가 중간에 중단되어도 --resume 으로 이어서 실행한다.
+
+{output_dir}/_checkpoint.json (JSON, 원자적 교체, STEP 완료 시에만 다시 씀):
+  {
+    'version': 3,
+    'created': 'YYYY-MM-DD HH:MM:SS',
+    'sources': {'dat_dir', 'xlsx_dir'},
+    'stage': 마지막으로 완료한 STEP 번호 (0 = 아직 없음),
+    'inputs': manifest.collect_inputs() 결과 (파일별 sha256),
+  }
+
+{output_dir}/_checkpoint.jsonl (한 줄에 항목 1개, 덧붙이기만 함):
+  {"section": "parsed", "key": 경로, "value": 파싱 결과}              ← STEP 1/2 (파일 단위)
+  {"section": "results", "value": {'dat_results', 'cycle_results', 'matches', 'borderline'}}  ← STEP 3 (1회)
+  {"section": "written", "key": 교차로명, "value": {'id', 'dir', 'fingerprint'}}  ← STEP 5 (교차로 단위)
+
+항목은 기록할 때 한 번만 직렬화하고 CHECKPOINT_EVERY 개씩 모아 덧붙이므로, 쓰는 양은 항목 수에 비례한다.
+중단 시 마지막 줄이 잘렸으면 그 줄만 버린다.
+
+매칭 결과는 DAT/시트 항목을 참조로 공유하므로 (matcher.build_match_index가 항목 동일성을 사용)
+matches 의 dat_files/selected_dat/cycle_files/selected_cycle 은 항목 목록의 인덱스로 저장하고,
+읽을 때 같은 객체 참조로 되돌린다. 출력 폴더는 공유 폴더인 경우가 많으므로 pickle은 쓰지 않는다.
+정상 종료 시 매니페스트가 저장된 뒤 체크포인트는 삭제된다.
+
+재개 규칙:
+  - 파싱 결과는 체크포인트 당시 sha256이 지금과 같은 파일만 재사용
+  - STEP 3/4 결과는 입력 전체가 체크포인트 당시와 같을 때만 재사용
+  - STEP 5 에서 이미 쓴 교차로 폴더는 지문이 같으면 건너뜀 (매니페스트와 같은 규칙)
+"""
+
+import json
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from parallel_io import atomic_write_text
+
+
+CHECKPOINT_NAME = '_checkpoint.json'
+CHECKPOINT_LOG_NAME = '_checkpoint.jsonl'
+CHECKPOINT_VERSION = 3
+
+# 항목(파일/교차로) 몇 개마다 진행 상황을 덧붙일지
+CHECKPOINT_EVERY = 20
+
+
+def load_checkpoint(output_dir: Path, sources: dict) -> Optional[dict]:
+    """이전 중단 실행의 체크포인트를 읽는다. 없거나 손상/버전·소스 불일치면 None.
+
+    Returns:
+        헤더 + {'parsed': {...}, 'results': (dat_results, cycle_results, matches, borderline) | None,
+                'written': {...}}
+    """
+    output_dir = Path(output_dir)
+    try:
+        with open(output_dir / CHECKPOINT_NAME, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(state, dict) or state.get('version') != CHECKPOINT_VERSION:
+        return None
+    if state.get('sources') != sources:
+        return None
+
+    state.update(parsed={}, results=None, written={})
+    try:
+        with open(output_dir / CHECKPOINT_LOG_NAME, 'rb') as f:
+            for line in f:
+                try:
+                    item = json.loads(line.decode('utf-8'))
+                except ValueError:
+                    break  # 중단 시 잘린 마지막 줄 (UnicodeDecodeError 포함)
+                if item['section'] == 'results':
+                    state['results'] = item['value']
+                else:
+                    state[item['section']][item['key']] = item['value']
+        state['results'] = _decode_results(state['results'])
+    except OSError:
+        pass
+    except (KeyError, IndexError, TypeError):
+        return None
+    return state
+
+
+class Checkpoint:
+    """STEP 완료/항목 단위 진행 상황을 기록한다. record()는 스레드 안전.
+
+    첫 기록 전까지는 파일을 건드리지 않으므로, --resume 으로 읽은 이전 체크포인트는
+    이번 실행이 실제로 진행될 때 교체된다.
+    """
+
+    def __init__(self, output_dir: Path, sources: dict, inputs: dict):
+        self.path = Path(output_dir) / CHECKPOINT_NAME
+        self.log_path = Path(output_dir) / CHECKPOINT_LOG_NAME
+        self.header = {
+            'version': CHECKPOINT_VERSION,
+            'sources': sources,
+            'stage': 0,
+            'inputs': inputs,
+        }
+        self._lock = threading.Lock()
+        self._lines = []
+        self._log = None
+
+    def complete(self, stage: int, results: Optional[tuple] = None):
+        """STEP 완료를 기록한다. results는 (dat_results, cycle_results, matches, borderline) (STEP 3)."""
+        line = None
+        if results is not None:
+            line = _dumps({'section': 'results', 'value': _encode_results(results)})
+        with self._lock:
+            if line is not None:
+                self._lines.append(line)
+            self._write_lines()
+            self.header['stage'] = stage
+            self._write_header()
+
+    def record(self, section: str, key: str, value):
+        """항목 1개 완료 ('parsed': 파일, 'written': 교차로). CHECKPOINT_EVERY 개마다 덧붙인다."""
+        line = _dumps({'section': section, 'key': key, 'value': value})
+        with self._lock:
+            self._lines.append(line)
+            if len(self._lines) >= CHECKPOINT_EVERY:
+                self._write_lines()
+
+    def flush(self):
+        with self._lock:
+            self._write_lines()
+
+    def clear(self):
+        """정상 종료 후 체크포인트 삭제."""
+        with self._lock:
+            if self._log is not None:
+                self._log.close()
+                self._log = None
+        for path in (self.path, self.log_path):
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+
+    def _write_lines(self):
+        if not self._lines:
+            return
+        self._open_log()
+        self._log.write(''.join(self._lines))
+        self._log.flush()
+        self._lines = []
+
+    def _write_header(self):
+        self._open_log()
+        self.header['created'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        atomic_write_text(self.path, json.dumps(self.header, ensure_ascii=False))
+
+    def _open_log(self):
+        """이번 실행의 첫 기록: 이전 실행의 항목 로그를 비우고 새로 시작한다."""
+        if self._log is None:
+            self._log = open(self.log_path, 'w', encoding='utf-8')
+
+
+def _dumps(item: dict) -> str:
+    return json.dumps(item, ensure_ascii=False, default=str) + '\n'
+
+
+def _encode_results(results: Optional[tuple]) -> Optional[dict]:
+    """STEP 3 결과 → JSON 구조 (매칭이 참조하는 항목은 인덱스로)."""
+    if results is None:
+        return None
+    dat_results, cycle_results, matches, borderline = results
+    dat_ix = {id(d): i for i, d in enumerate(dat_results)}
+    cycle_ix = {id(c): i for i, c in enumerate(cycle_results)}
+    return {
+        'dat_results': dat_results,
+        'cycle_results': cycle_results,
+        'matches': [
+            dict(m,
+                 dat_files=[dat_ix[id(d)] for d in m['dat_files']],
+                 selected_dat=_ref(dat_ix, m['selected_dat']),
+                 cycle_files=[cycle_ix[id(c)] for c in m['cycle_files']],
+                 selected_cycle=_ref(cycle_ix, m['selected_cycle']))
+            for m in matches
+        ],
+        'borderline': borderline,
+    }
+
+
+def _decode_results(data: Optional[dict]) -> Optional[tuple]:
+    """_encode_results() 의 역변환. 인덱스를 항목 객체 참조로 되돌린다."""
+    if data is None:
+        return None
+    dat_results = data['dat_results']
+    cycle_results = data['cycle_results']
+    matches = [
+        dict(m,
+             dat_files=[dat_results[i] for i in m['dat_files']],
+             selected_dat=None if m['selected_dat'] is None else dat_results[m['selected_dat']],
+             cycle_files=[cycle_results[i] for i in m['cycle_files']],
+             selected_cycle=None if m['selected_cycle'] is None else cycle_results[m['selected_cycle']])
+        for m in data['matches']
+    ]
+    borderline = [tuple(b) for b in data['borderline']]
+    return dat_results, cycle_results, matches, borderline
+
+
+def _ref(index: dict, entry: Optional[dict]) -> Optional[int]:
+    return None if entry is None else index[id(entry)]
+
+
+def resumable_parsed(resumed: Optional[dict], inputs: dict) -> dict:
+    """체크포인트 파싱 결과 중 입력 파일 내용이 그대로인 것만 반환한다."""
+    if not resumed:
+        return {}
+    old_inputs = resumed.get('inputs', {})
+    return {
+        path: parsed
+        for path, parsed in resumed.get('parsed', {}).items()
+        if path in inputs and old_inputs.get(path, {}).get('sha256') == inputs[path]['sha256']
+    }
+
+
+def same_inputs(resumed: Optional[dict], inputs: dict) -> bool:
+    """체크포인트 당시와 입력 파일 구성/내용이 모두 같은지."""
+    if not resumed:
+        return False
+    old_inputs = resumed.get('inputs', {})
+    return (old_inputs.keys() == inputs.keys()
+            and all(old_inputs[k]['sha256'] == v['sha256'] for k, v in inputs.items()))
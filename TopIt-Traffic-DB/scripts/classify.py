@@ -2,24 +2,46 @@
 보령시 교통신호제어기 통합 분류 스크립트
 
 사용법:
-    python scripts/classify.py [--dat-dir DIR] [--xlsx-dir DIR] [--output-dir DIR]
+    python scripts/classify.py [--dat-dir DIR] [--xlsx-dir DIR] [--output-dir DIR] [--full]
+                               [--pdf-nodes JSON] [--routes JSON]
+                               [--workers N] [--scan-workers N] [--profile] [--sqlite]
+                               [--dat-only | --xlsx-only] [--resume]
+
+재실행 시 _manifest.json과 비교하여 변경/신규 원본만 다시 파싱하고,
+내용이 바뀐 교차로 폴더만 다시 쓴다. 변경이 없으면 즉시 종료한다.
+실행 중에는 STEP/항목 단위로 _checkpoint.json(.jsonl) 을 남기며, 중단된 실행은 --resume 으로
+완료된 단계/파일/교차로를 건너뛰고 이어서 실행한다.
+--dat-only / --xlsx-only 는 한쪽 소스만 스캔한다 (--dat-only는 엑셀 라이브러리를 로드하지 않음).
+기존 출력이 양쪽 소스로 만들어졌으면 스캔하지 않는 쪽은 이전 실행의 입력/파싱 결과를 그대로 쓴다
+(교차로 목록, 주기표, BC ID 유지).
 
 기본값:
     --dat-dir   : 참조할dat/제어기DB/
     --xlsx-dir  : 주기표엑셀/
     --output-dir: 보령시_신호DB/
+    --pdf-nodes / --routes: pdf_extracted_nodes.json / routes.json
+                  (--dat-dir, --xlsx-dir 를 지정하지 않은 보령시 기본 실행일 때만, 아니면 해당 소스 제외)
 
 실행 결과:
     보령시_신호DB/
-    ├── _원본/dat_원본/         ← 원본 DAT 복사
-    ├── _원본/주기표_원본/      ← 원본 엑셀 복사
+    ├── _원본/blobs/            ← sha256 주소 원본 저장소 (내용당 1벌)
+    ├── _원본/dat_원본/         ← 원본 DAT (소스 폴더 구조, blob 하드링크)
+    ├── _원본/주기표_원본/      ← 원본 엑셀 (소스 폴더 구조, blob 하드링크)
+    ├── _원본/catalog.json      ← 원본 경로 → sha256 목록
     ├── _미분류/dat_미분류/     ← 분류 실패 DAT
     ├── _미분류/주기표_미분류/  ← 분류 실패 엑셀
-    ├── 교차로/{이름}/          ← 교차로별 정리 폴더
+    ├── 교차로/{이름}/          ← 교차로별 정리 폴더 (원본은 blob 사본, 링크 아님)
     │   ├── {이름}.dat
     │   ├── {이름}_주기표.xlsx
     │   └── info.json
     ├── master.json
+    ├── match_index.json        ← 증분 매칭 인덱스 (matcher.match_one)
+    ├── identity_index.json     ← 소스별 교차로 키(PDF 번호/요도 노드/DAT/주기표) → BC ID (identity_index)
+    ├── _manifest.json          ← 입력 해시/파싱 결과/출력 기록 (증분 재실행)
+    ├── _checkpoint.json        ← 실행 중 단계별 진행 상황 (정상 종료 시 삭제, --resume)
+    ├── _checkpoint.jsonl       ← 실행 중 파일/교차로 단위 진행 기록 (정상 종료 시 삭제)
+    ├── signal_db.sqlite        ← --sqlite: 인덱스 조회용 DB (supabase-schema.sql 구조)
+    ├── signal_db.snap          ← mmap 조회용 바이너리 스냅샷 (snapshot.Snapshot, BC ID로 O(1) 조회)
     └── 분류보고서.md
 """
 
@@ -27,53 +49,174 @@ import argparse
 import io
 import json
 import os
-import re
-import shutil
 import sys
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
-
-# Windows CP949 콘솔 유니코드 출력 문제 해결
-sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
-sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
+from typing import Optional
 
 # 같은 디렉토리의 모듈 임포트
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from dat_parser import scan_dat_directory, parse_dat
-from xlsx_parser import scan_excel_directory
-from matcher import match_dat_to_cycles
+from dat_parser import scan_dat_file
+from xlsx_parser import scan_excel_file
+from inventory import build_inventory, add_entries, paths
+from matcher import match_dat_to_cycles, build_match_index, save_match_index
+from match_audit import borderline_pairs, BORDERLINE_LOW, BORDERLINE_HIGH
+from manifest import (load_manifest, save_manifest, collect_inputs, carried_inputs,
+                      outputs_intact, fingerprint, file_sha256, safe_dirname)
+from checkpoint import Checkpoint, load_checkpoint, resumable_parsed, same_inputs
+from blob_store import store_blob, link_blob, copy_blob, write_catalog
+from profiler import StageProfiler, peak_rss_bytes
+from sqlite_store import write_sqlite, SQLITE_NAME
+from snapshot import write_snapshot, SNAPSHOT_NAME
+from identity_index import update_identity_index, IDENTITY_INDEX_NAME
+from parallel_io import (run_io_tasks, atomic_write_json, atomic_write_text,
+                         ProgressCounter, DEFAULT_IO_WORKERS)
+
+
+DEFAULT_CITY = '보령시'
+
+# DAT/엑셀 파싱 프로세스 수 (CPU 작업이므로 코어 수만큼)
+DEFAULT_SCAN_WORKERS = os.cpu_count() or 1
 
 
 def main():
     args = parse_args()
+    _setup_console()
+    run(args)
 
-    # 프로젝트 루트 (scripts/ 의 상위)
-    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
 
-    dat_dir = Path(args.dat_dir) if args.dat_dir else project_root / '참조할dat' / '제어기DB'
-    xlsx_dir = Path(args.xlsx_dir) if args.xlsx_dir else project_root / '주기표엑셀'
-    output_dir = Path(args.output_dir) if args.output_dir else project_root / '보령시_신호DB'
+def run(args, scan_pool: Optional[Executor] = None) -> Optional[dict]:
+    """분류 파이프라인 1회 실행. watch.py 데몬도 이 함수를 반복 호출한다.
+
+    Args:
+        scan_pool: DAT/엑셀 파싱에 쓸 프로세스 풀 (batch_classify 가 도시 간에 공유, 닫지 않음).
+            없으면 --scan-workers 크기로 이번 실행 동안만 만든다.
+
+    Returns:
+        {'changed': 변경 입력 수, 'rewritten': 다시 쓴 교차로명 목록, 'master_updated': bool}
+        (DAT 디렉토리가 없으면 None)
+    """
+    dat_dir, xlsx_dir, output_dir = source_dirs(args)
 
     print('=' * 60)
-    print('  보령시 교통신호제어기 통합 분류 시스템')
+    print(f'  {args.city} 교통신호제어기 통합 분류 시스템')
     print('=' * 60)
-    print(f'  DAT 소스:    {dat_dir}')
-    print(f'  주기표 소스: {xlsx_dir}')
+    print(f'  DAT 소스:    {dat_dir if not args.xlsx_only else "(건너뜀: --xlsx-only)"}')
+    print(f'  주기표 소스: {xlsx_dir if not args.dat_only else "(건너뜀: --dat-only)"}')
     print(f'  출력 폴더:   {output_dir}')
     print('=' * 60)
 
+    prof = StageProfiler(enabled=args.profile)
+
     # ── STEP 0: 출력 디렉토리 준비 ──
     print('\n[STEP 0] 출력 디렉토리 준비...')
+    prof.start('STEP 0 준비/변경 확인')
     dirs = setup_output_dirs(output_dir)
 
-    # ── STEP 1: DAT 파일 스캔 ──
-    print('\n[STEP 1] DAT 파일 스캔 중...')
-    if not dat_dir.exists():
-        print(f'  ❌ DAT 디렉토리를 찾을 수 없음: {dat_dir}')
-        return
-    dat_results = scan_dat_directory(str(dat_dir))
-    print(f'  총 {len(dat_results)}개 DAT 파일 발견')
+    sources = {
+        'dat_dir': None if args.xlsx_only else str(dat_dir),
+        'xlsx_dir': None if args.dat_only else str(xlsx_dir),
+    }
+    previous = None if args.full else load_manifest(output_dir)
+    carried = {}
+    if previous and previous.get('sources') != sources:
+        # 한쪽만 스캔하면 반대쪽은 이전 실행의 입력/파싱 결과를 이어받아 교차로와 BC ID를 유지한다
+        carried = carried_inputs(previous, sources)
+        if carried is None:
+            print('  소스 경로가 이전 실행과 다름 → 전체 재처리')
+            previous, carried = None, {}
+        else:
+            sources = previous['sources']
+            dat_dir, xlsx_dir = Path(sources['dat_dir']), Path(sources['xlsx_dir'])
+            print(f'  스캔하지 않는 쪽은 이전 실행의 입력 {len(carried)}개 유지')
+
+    if not args.xlsx_only and not dat_dir.exists():
+        print(f'\n  ❌ DAT 디렉토리를 찾을 수 없음: {dat_dir}')
+        return None
+    # 소스 트리는 여기서 한 번만 순회하고, 이후 단계는 모두 이 인벤토리를 사용한다
+    inventory = build_inventory(None if args.xlsx_only else dat_dir,
+                                None if args.dat_only else xlsx_dir)
+    add_entries(inventory, [{'path': Path(key), 'size': sig['size'], 'mtime_ns': sig['mtime_ns'],
+                             'kind': sig['kind']} for key, sig in carried.items()])
+    dat_files = paths(inventory, 'dat')
+    xlsx_files = paths(inventory, 'xlsx')
+    # 원본 보존은 스킵 규칙과 무관하게 모든 엑셀 소스를 대상으로 한다
+    excel_sources = sorted(xlsx_files + paths(inventory, 'excel'),
+                           key=lambda p: (not p.name.lower().endswith('.xlsx'), p))
+
+    inputs, changed = collect_inputs(inventory, previous)
+    prof.finish(items=len(inputs), changed=len(changed))
+    if previous:
+        print(f'  이전 실행: {previous.get("created")} / 변경된 입력: {len(changed)}개')
+        missing = missing_outputs(output_dir, args)
+        if not changed and outputs_intact(output_dir, previous) and not missing:
+            print('\n  변경된 입력 없음 → 기존 결과 유지 (전체 재실행: --full)')
+            # 요도 PDF 노드/노선 파일은 DAT·주기표와 따로 바뀌므로 식별 인덱스는 여기서도 갱신한다
+            refresh_identity_index(output_dir, args)
+            if args.profile:
+                prof.print_summary()
+                _write_trace(prof, output_dir)
+            return {'changed': 0, 'rewritten': [], 'master_updated': False}
+        if not changed and missing:
+            print(f'  요청한 출력 없음: {", ".join(missing)} → 다시 생성')
+
+    resumed = load_checkpoint(output_dir, sources) if args.resume else None
+    if resumed:
+        print(f'  체크포인트 재개: STEP {resumed["stage"]} 완료 시점 ({resumed.get("created")}), '
+              f'파싱 {len(resumed["parsed"])}개 / 교차로 폴더 {len(resumed["written"])}개 기록됨')
+    elif args.resume:
+        print('  재개할 체크포인트 없음 → 처음부터 실행')
+    resume_all = same_inputs(resumed, inputs)
+    ckpt = Checkpoint(output_dir, sources, inputs)
+
+    # 재사용 가능한 파싱 결과: 이전 실행에서 바뀌지 않은 파일 + 중단된 실행에서 이미 파싱한 파일
+    cached = {k: v for k, v in (previous or {}).get('parsed', {}).items() if k not in changed}
+    cached.update(resumable_parsed(resumed, inputs))
+    parsed = {}
+
+    # ── STEP 1/2: DAT · 주기표 엑셀 스캔 (서로 독립이므로 프로세스 풀에서 동시 실행) ──
+    print('\n[STEP 1/2] DAT · 주기표 엑셀 동시 스캔 중...')
+    prof.start('STEP 1/2 DAT·엑셀 스캔')
+    progress = ProgressCounter({'DAT': len(dat_files), '엑셀': len(xlsx_files)})
+
+    scan_started = time.perf_counter()
+    scanned = {'DAT': {}, '엑셀': {}}
+    elapsed = {'DAT': 0.0, '엑셀': 0.0}
+    pending = []
+    for label, files in (('DAT', dat_files), ('엑셀', xlsx_files)):
+        for path in files:
+            key = str(path)
+            if key in cached:
+                scanned[label][key] = cached[key]
+                ckpt.record('parsed', key, cached[key])
+                progress.advance(label)
+            else:
+                pending.append((label, path))
+    # 큰 파일부터 넣어 마지막에 긴 작업 하나만 남는 것을 피한다
+    pending.sort(key=lambda t: -inputs[str(t[1])]['size'])
+
+    for (label, path), (result, t0, t1, pid, cpu, rss) in scan_files(pending, args.scan_workers, scan_pool):
+        key = str(path)
+        scanned[label][key] = result
+        prof.item(key, t0, ended=t1, tid=pid, size=inputs[key]['size'])
+        prof.worker(pid, cpu, rss)
+        ckpt.record('parsed', key, result)
+        progress.advance(label)
+        elapsed[label] = time.perf_counter() - scan_started
+    progress.finish()
+    dat_parsed, xlsx_parsed = scanned['DAT'], scanned['엑셀']
+    print(f'  스캔 {time.perf_counter() - scan_started:.2f}s '
+          f'(DAT {elapsed["DAT"]:.2f}s / 엑셀 {elapsed["엑셀"]:.2f}s 동시 진행)')
+    parsed.update(dat_parsed)
+    parsed.update(xlsx_parsed)
+
+    print('\n[STEP 1] DAT 파일')
+    dat_results = [dat_parsed[str(f)] for f in dat_files]
+    reused = sum(1 for f in dat_files if str(f) in cached)
+    print(f'  총 {len(dat_results)}개 DAT 파일 발견 (재사용: {reused}개)')
 
     # 제조사별 통계
     mfr_counts = {}
@@ -83,21 +226,35 @@ def main():
     for mfr, count in sorted(mfr_counts.items()):
         print(f'    - {mfr}: {count}개')
 
-    # ── STEP 2: 주기표 엑셀 스캔 ──
-    print('\n[STEP 2] 주기표 엑셀 스캔 중...')
-    if not xlsx_dir.exists():
+    print('\n[STEP 2] 주기표 엑셀')
+    cycle_results = [c for f in xlsx_files for c in xlsx_parsed[str(f)]]
+    if args.dat_only and not xlsx_files:
+        print('  --dat-only → 건너뜀')
+    elif not args.dat_only and not xlsx_dir.exists():
         print(f'  ⚠ 주기표 디렉토리를 찾을 수 없음: {xlsx_dir}')
-        cycle_results = []
     else:
-        cycle_results = scan_excel_directory(str(xlsx_dir))
         total_sheets = len(cycle_results)
         named_sheets = sum(1 for c in cycle_results if c['intersection_name'])
         error_sheets = sum(1 for c in cycle_results if c.get('error'))
-        print(f'  총 {total_sheets}개 시트 발견 (교차로명 추출: {named_sheets}, 오류: {error_sheets})')
+        reused = sum(1 for f in xlsx_files if str(f) in cached)
+        print(f'  총 {total_sheets}개 시트 발견 (교차로명 추출: {named_sheets}, 오류: {error_sheets}, '
+              f'파일 재사용: {reused}개)')
+    ckpt.complete(2)
+    prof.finish(items=len(dat_files) + len(xlsx_files), dat=len(dat_results), sheets=len(cycle_results))
 
     # ── STEP 3: 매칭 ──
     print('\n[STEP 3] DAT ↔ 주기표 매칭 중...')
-    matches = match_dat_to_cycles(dat_results, cycle_results)
+    prof.start('STEP 3 매칭')
+    if resume_all and resumed['stage'] >= 3:
+        # 매칭 결과가 DAT/시트 항목을 참조하므로 항목 목록도 체크포인트 것으로 교체
+        dat_results, cycle_results, matches, borderline = resumed['results']
+        print('  체크포인트의 매칭 결과 사용')
+    else:
+        matches = match_dat_to_cycles(dat_results, cycle_results)
+        borderline = borderline_pairs(
+            [d.get('intersection_name') for d in dat_results],
+            [c.get('intersection_name') for c in cycle_results],
+        )
     print(f'  총 {len(matches)}개 교차로 식별')
 
     match_stats = {'high': 0, 'medium': 0, 'low': 0}
@@ -120,17 +277,46 @@ def main():
     print(f'    - 둘 다 있음: {has_both}')
     print(f'    - 매칭 신뢰도: high={match_stats["high"]}, medium={match_stats["medium"]}, low={match_stats["low"]}')
 
+    print(f'    - 경계 유사도 쌍 ({BORDERLINE_LOW:.2f}~{BORDERLINE_HIGH:.2f}): {len(borderline)}개')
+    ckpt.complete(3, results=(dat_results, cycle_results, matches, borderline))
+    prof.finish(items=len(matches), borderline=len(borderline))
+
     # ── STEP 4: 원본 복사 ──
-    print('\n[STEP 4] 원본 파일 보존 복사...')
-    copy_originals(dat_dir, xlsx_dir, dirs)
+    print('\n[STEP 4] 원본 파일 보존 (blob 저장소 + 하드링크)...')
+    prof.start('STEP 4 원본 보존')
+    if resume_all and resumed['stage'] >= 4:
+        print('  체크포인트: 이미 완료됨 → 건너뜀')
+    else:
+        store_originals([
+            (dat_dir, dat_files, dirs['originals_dat']),
+            (xlsx_dir, excel_sources, dirs['originals_cycle']),
+        ], dirs, inputs, args.workers)
+    ckpt.complete(4)
+    prof.finish(items=len(dat_files) + len(excel_sources))
 
     # ── STEP 5: 교차로별 폴더 생성 ──
     print('\n[STEP 5] 교차로별 폴더 생성 중...')
+    prof.start('STEP 5 교차로 폴더')
     intersection_infos = []
     unclassified_dats = []
     unclassified_cycles = []
 
-    id_counter = 1
+    # 이전 실행의 교차로 ID 유지, 신규 교차로는 기존 최대 번호 다음부터 부여
+    # (ID는 이전 매니페스트와 매칭 순서로만 정하므로 중단 후 재개해도 중단 전과 같다)
+    prev_intersections = dict(previous.get('intersections', {})) if previous else {}
+    next_id = 1 + max((int(v['id'].split('-')[1]) for v in prev_intersections.values()), default=0)
+    # 중단된 실행에서 이미 쓴 폴더도 지문이 같으면 건너뜀
+    written_before = dict(prev_intersections)
+    if resumed:
+        written_before.update(resumed['written'])
+    written_intersections = {}
+
+    # 쓸 폴더를 먼저 정하고(메인 스레드), 복사/쓰기는 스레드 풀에서 실행
+    slots = []          # matches 순서대로 [bc_id, name, match, info(없으면 작업 대기)]
+    jobs = []           # 스레드 풀 작업: (slot, intersection_dir)
+    serial_jobs = []    # 같은 폴더를 쓰는 후순위 작업 (순서 보장 위해 나중에 직렬 실행)
+    job_dirs = set()
+
     for m in matches:
         name = m['intersection_name']
         if not name:
@@ -142,77 +328,151 @@ def main():
             continue
 
         # 교차로 ID 부여
-        bc_id = f'BC-{id_counter:03d}'
-        id_counter += 1
-
-        # 폴더 생성
-        intersection_dir = dirs['intersections'] / _safe_dirname(name)
-        intersection_dir.mkdir(parents=True, exist_ok=True)
-
-        # DAT 복사
-        dat_copied = False
-        if m['selected_dat']:
-            src = m['selected_dat']['path']
-            dst = intersection_dir / f'{_safe_dirname(name)}.dat'
-            try:
-                shutil.copy2(src, dst)
-                dat_copied = True
-            except Exception as e:
-                print(f'  ⚠ DAT 복사 실패 ({name}): {e}')
-
-        # 주기표 복사
-        cycle_copied = False
-        if m['selected_cycle'] and m['selected_cycle'].get('source_file'):
-            src = m['selected_cycle']['source_file']
-            ext = os.path.splitext(src)[1]
-            dst = intersection_dir / f'{_safe_dirname(name)}_주기표{ext}'
-            try:
-                shutil.copy2(src, dst)
-                cycle_copied = True
-            except Exception as e:
-                print(f'  ⚠ 주기표 복사 실패 ({name}): {e}')
-
-        # info.json 생성
-        info = build_info_json(bc_id, name, m, dat_copied, cycle_copied)
-        info_path = intersection_dir / 'info.json'
-        with open(info_path, 'w', encoding='utf-8') as f:
-            json.dump(info, f, ensure_ascii=False, indent=2)
-
-        intersection_infos.append(info)
+        if name in prev_intersections:
+            bc_id = prev_intersections[name]['id']
+        else:
+            bc_id = f'BC-{next_id:03d}'
+            next_id += 1
+
+        intersection_dir = dirs['intersections'] / safe_dirname(name)
+        slot = [bc_id, name, m, None]
+        slots.append(slot)
+
+        # 입력/선택 결과가 이전과 같으면 폴더를 다시 쓰지 않음
+        info = build_info_json(bc_id, name, m, m['selected_dat'] is not None,
+                               bool(m['selected_cycle'] and m['selected_cycle'].get('source_file')))
+        prev_entry = written_before.get(name)
+        if (prev_entry and prev_entry['fingerprint'] == _intersection_fingerprint(info, m, inputs)
+                and (intersection_dir / 'info.json').exists()):
+            slot[3] = info
+            written_intersections[name] = prev_entry
+            if resumed and name in resumed['written']:
+                # 이번 실행도 중단되면 다음 재개에서 다시 쓰지 않도록 새 로그에 다시 기록
+                ckpt.record('written', name, prev_entry)
+            continue
+
+        if intersection_dir in job_dirs:
+            serial_jobs.append((slot, intersection_dir))
+        else:
+            job_dirs.add(intersection_dir)
+            jobs.append((slot, intersection_dir))
+
+    def run_job(job):
+        slot, intersection_dir = job
+        bc_id, name, m, _ = slot
+        t0 = prof.now()
+        info, job_warnings = write_intersection_folder(intersection_dir, bc_id, name, m, dirs, inputs)
+        entry = {
+            'id': bc_id,
+            'dir': str(intersection_dir.relative_to(output_dir)),
+            'fingerprint': _intersection_fingerprint(info, m, inputs),
+        }
+        ckpt.record('written', name, entry)
+        prof.item(name, t0, id=bc_id)
+        return info, job_warnings, entry
+
+    results, errors = run_io_tasks(run_job, jobs, args.workers)
+    serial_results, serial_errors = run_io_tasks(run_job, serial_jobs, 1)
+    errors.extend(serial_errors)
+
+    warnings = []
+    rewritten_names = []
+    for (slot, intersection_dir), result in zip(jobs + serial_jobs, results + serial_results):
+        if result is None:
+            continue
+        bc_id, name, m, _ = slot
+        info, job_warnings, entry = result
+        slot[3] = info
+        rewritten_names.append(name)
+        warnings.extend(job_warnings)
+        written_intersections[name] = entry
+        dat_copied = info['dat'] is not None and info['dat'].get('filename') is not None
+        cycle_copied = info['cycle_table'] is not None and info['cycle_table'].get('filename') is not None
         print(f'  ✅ {bc_id} {name:25s} DAT:{"✅" if dat_copied else "❌"} 주기표:{"✅" if cycle_copied else "❌"} ({m["match_confidence"]})')
 
-    # 미분류 DAT 복사
-    for d in unclassified_dats:
-        try:
-            shutil.copy2(d['path'], dirs['unclassified_dat'] / d['filename'])
-        except Exception:
-            pass
-
-    # 미분류 주기표 복사
-    for c in unclassified_cycles:
-        if c.get('source_file'):
-            try:
-                shutil.copy2(c['source_file'], dirs['unclassified_cycle'] / c['source_filename'])
-            except Exception:
-                pass
+    intersection_infos = [slot[3] for slot in slots if slot[3] is not None]
+    rewritten = len(jobs) + len(serial_jobs) - len(errors)
+    print(f'  교차로 폴더 {rewritten}개 갱신 / {len(intersection_infos) - rewritten}개 변경 없음')
+    for w in warnings:
+        print(f'  ⚠ {w}')
+    _report_errors('교차로 폴더 생성', errors, lambda job: job[0][1])
+
+    stale = sorted(set(prev_intersections) - set(written_intersections))
+    for name in stale:
+        print(f'  ⚠ 더 이상 식별되지 않는 교차로 (폴더 유지): {prev_intersections[name]["id"]} {name}')
+
+    # 미분류 원본 사본 (같은 이름 충돌 판정이 필요하므로 직렬 처리)
+    unclassified = [
+        (dirs['unclassified_dat'], d['filename'], d['path']) for d in unclassified_dats
+    ] + [
+        (dirs['unclassified_cycle'], c['source_filename'], c['source_file'])
+        for c in unclassified_cycles if c.get('source_file')
+    ]
+    _, errors = run_io_tasks(
+        lambda u: _place_original(u[2], _unclassified_dst(u[0], u[1], u[2], inputs), dirs, inputs),
+        unclassified, 1)
+    _report_errors('미분류 원본 복사', errors, lambda u: u[1])
+    ckpt.complete(5)
+    prof.finish(items=len(slots), rewritten=rewritten, unclassified=len(unclassified))
 
     # ── STEP 6: master.json 생성 ──
     print('\n[STEP 6] master.json 생성...')
-    master = build_master_json(intersection_infos)
+    prof.start('STEP 6 master.json')
+    master = build_master_json(intersection_infos, args.city, args.city_code)
     master_path = output_dir / 'master.json'
-    with open(master_path, 'w', encoding='utf-8') as f:
-        json.dump(master, f, ensure_ascii=False, indent=2)
-    print(f'  ✅ {master_path}')
+    master_fp = fingerprint({k: v for k, v in master.items() if k != 'created'})
+    master_updated = not (previous and previous.get('master') == master_fp and master_path.exists())
+    if not master_updated:
+        print(f'  변경 없음: {master_path}')
+    else:
+        atomic_write_json(master_path, master)
+        print(f'  ✅ {master_path}')
+
+    snapshot_path = output_dir / SNAPSHOT_NAME
+    snapshot_dirs = {name: e['dir'] for name, e in written_intersections.items()}
+    if write_snapshot(snapshot_path, intersection_infos, snapshot_dirs):
+        print(f'  ✅ {snapshot_path}')
+    else:
+        print(f'  변경 없음: {snapshot_path}')
+
+    if args.sqlite:
+        sqlite_path = output_dir / SQLITE_NAME
+        counts = write_sqlite(sqlite_path, intersection_infos, _load_route_diagram(dirs['yodo']))
+        print(f'  ✅ {sqlite_path} (교차로 {counts["intersections"]}, 타이밍 계획 {counts["timing_plans"]}행)')
+
+    index = build_match_index(dat_results, cycle_results, matches)
+    index_path = output_dir / 'match_index.json'
+    save_match_index(index, str(index_path))
+    print(f'  ✅ {index_path}')
+
+    refresh_identity_index(output_dir, args,
+                           canonical=[(info['id'], info['name']) for info in intersection_infos],
+                           match_index=index)
 
     # ── STEP 7: 분류보고서 생성 ──
+    prof.finish(items=len(intersection_infos))
     print('\n[STEP 7] 분류보고서 생성...')
+    prof.start('STEP 7 보고서/매니페스트')
     report = build_report(dat_results, cycle_results, matches, intersection_infos,
-                          unclassified_dats, unclassified_cycles)
+                          unclassified_dats, unclassified_cycles, borderline, args.city)
     report_path = output_dir / '분류보고서.md'
-    with open(report_path, 'w', encoding='utf-8') as f:
-        f.write(report)
+    atomic_write_text(report_path, report)
     print(f'  ✅ {report_path}')
 
+    save_manifest(output_dir, {
+        'sources': sources,
+        'inputs': inputs,
+        'parsed': parsed,
+        'intersections': written_intersections,
+        'master': master_fp,
+    })
+    ckpt.clear()
+    prof.finish()
+
+    if args.profile:
+        prof.print_summary()
+        _write_trace(prof, output_dir)
+
     # ── 완료 ──
     print('\n' + '=' * 60)
     print(f'  분류 완료!')
@@ -221,19 +481,161 @@ def main():
     print(f'  분류보고서: {report_path}')
     print('=' * 60)
 
+    return {
+        'changed': len(changed),
+        'rewritten': rewritten_names,
+        'master_updated': master_updated,
+    }
+
+
+def scan_files(tasks: list[tuple[str, Path]], workers: int, pool: Optional[Executor] = None):
+    """(종류, 경로) 작업을 파싱하여 완료 순서대로 (작업, _scan_one 결과)를 내놓는다.
+
+    파싱은 순수 파이썬 CPU 작업이라 스레드로는 GIL 때문에 겹치지 않으므로 프로세스 풀을 쓴다.
+    pool 을 주면 그 풀에 넣는다 (workers 무시). 없으면 작업자가 1개 이하이거나 작업이 1개뿐일 때
+    프로세스를 띄우지 않고 현재 프로세스에서 실행한다.
+    """
+    if pool is not None:
+        yield from _scan_in(pool, tasks)
+        return
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        for task in tasks:
+            yield task, _scan_one(task)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from _scan_in(pool, tasks)
+
+
+def _scan_in(pool: Executor, tasks: list[tuple[str, Path]]):
+    futures = {pool.submit(_scan_one, task): task for task in tasks}
+    for future in as_completed(futures):
+        yield futures[future], future.result()
+
+
+def _scan_one(task: tuple[str, Path]) -> tuple:
+    """프로세스 풀 작업: 파일 1개 파싱 → (결과 dict/list, 시작, 종료, pid, CPU 초, 작업자 최대 RSS).
+
+    CPU 시간과 RSS 는 부모의 --profile 이 작업자 몫을 단계에 더할 수 있도록 작업자 쪽에서 잰다.
+    """
+    label, path = task
+    scanner = scan_dat_file if label == 'DAT' else scan_excel_file
+    cpu_started = time.process_time()
+    started = time.perf_counter()
+    result = scanner(path)
+    ended = time.perf_counter()
+    return result, started, ended, os.getpid(), time.process_time() - cpu_started, peak_rss_bytes()
+
+
+def refresh_identity_index(output_dir: Path, args, canonical=None, match_index=None) -> dict:
+    """identity_index.json 을 이 실행의 요도 소스(diagram_sources)로 갱신하고 결과를 출력한다.
+
+    Returns:
+        update_identity_index() 변경 내역 (바뀐 소스만)
+    """
+    pdf_nodes, routes = diagram_sources(args)
+    _, changes = update_identity_index(output_dir, pdf_nodes, routes,
+                                       canonical=canonical, match_index=match_index)
+    identity_path = output_dir / IDENTITY_INDEX_NAME
+    if changes:
+        print(f'  ✅ {identity_path} (갱신: {", ".join(changes)})')
+    else:
+        print(f'  변경 없음: {identity_path}')
+    return changes
+
+
+def missing_outputs(output_dir: Path, args) -> list[str]:
+    """STEP 6에서 만드는 출력 중 없는 파일명 (--sqlite 요청 시 SQLite DB 포함)."""
+    names = [SNAPSHOT_NAME, 'match_index.json', IDENTITY_INDEX_NAME]
+    if args.sqlite:
+        names.append(SQLITE_NAME)
+    return [name for name in names if not (output_dir / name).exists()]
+
+
+def _write_trace(prof: StageProfiler, output_dir: Path):
+    trace_path = output_dir / 'classify_trace.json'
+    prof.write_trace(trace_path)
+    print(f'  ✅ 트레이스: {trace_path} (chrome://tracing 또는 ui.perfetto.dev 에서 열기)')
+
+
+def source_dirs(args) -> tuple[Path, Path, Path]:
+    """(DAT 소스, 주기표 소스, 출력 폴더). 지정하지 않으면 프로젝트 루트 기준 기본값."""
+    # 프로젝트 루트 (scripts/ 의 상위)
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+    dat_dir = Path(args.dat_dir) if args.dat_dir else project_root / '참조할dat' / '제어기DB'
+    xlsx_dir = Path(args.xlsx_dir) if args.xlsx_dir else project_root / '주기표엑셀'
+    output_dir = Path(args.output_dir) if args.output_dir else project_root / '보령시_신호DB'
+    return dat_dir, xlsx_dir, output_dir
+
+
+def diagram_sources(args) -> tuple[Optional[Path], Optional[Path]]:
+    """(요도 PDF 노드 JSON, routes.json) — 도시별 교차로 키 소스 (identity_index).
+
+    지정하지 않으면 소스 폴더도 기본값(보령시)일 때만 프로젝트 루트의 파일을 쓰고,
+    다른 도시 소스를 분류할 때는 None (해당 소스 제외).
+    """
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+    default_city = not args.dat_dir and not args.xlsx_dir
+    pdf_nodes = Path(args.pdf_nodes) if args.pdf_nodes else (
+        project_root / 'pdf_extracted_nodes.json' if default_city else None)
+    routes = Path(args.routes) if args.routes else (
+        project_root / 'routes.json' if default_city else None)
+    return pdf_nodes, routes
 
-def parse_args():
-    parser = argparse.ArgumentParser(description='보령시 교통신호제어기 통합 분류 시스템')
+
+def parse_args(argv=None):
+    return build_parser().parse_args(argv)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """classify 명령행 옵션 (watch.py가 같은 옵션에 데몬 옵션을 덧붙여 사용)."""
+    parser = argparse.ArgumentParser(description=f'교통신호제어기 통합 분류 시스템 (기본 도시: {DEFAULT_CITY})')
     parser.add_argument('--dat-dir', help='DAT 파일 소스 디렉토리')
     parser.add_argument('--xlsx-dir', help='주기표 엑셀 소스 디렉토리')
     parser.add_argument('--output-dir', help='출력 디렉토리')
-    return parser.parse_args()
+    parser.add_argument('--pdf-nodes',
+                        help='이 도시의 요도 PDF 노드 JSON (identity_index pdf 소스, '
+                             '기본: 소스 폴더 미지정 시에만 pdf_extracted_nodes.json)')
+    parser.add_argument('--routes',
+                        help='이 도시의 routes.json (identity_index routes 소스, '
+                             '기본: 소스 폴더 미지정 시에만 프로젝트 루트 routes.json)')
+    parser.add_argument('--full', action='store_true',
+                        help='이전 실행 매니페스트를 무시하고 전체 재처리')
+    parser.add_argument('--profile', action='store_true',
+                        help='단계별 시간/CPU/메모리 계측 및 classify_trace.json 출력')
+    parser.add_argument('--sqlite', action='store_true',
+                        help=f'{SQLITE_NAME} (supabase-schema.sql 구조의 SQLite DB) 도 출력')
+    parser.add_argument('--workers', type=int, default=DEFAULT_IO_WORKERS,
+                        help=f'복사/쓰기 단계 스레드 수 (기본 {DEFAULT_IO_WORKERS}, 1이면 직렬)')
+    parser.add_argument('--scan-workers', type=int, default=DEFAULT_SCAN_WORKERS,
+                        help=f'DAT/엑셀 파싱 프로세스 수 (기본 CPU 수 {DEFAULT_SCAN_WORKERS}, 1이면 현재 프로세스)')
+    parser.add_argument('--city', default=DEFAULT_CITY,
+                        help=f'master.json / 분류보고서에 기록할 지자체명 (기본 {DEFAULT_CITY})')
+    parser.add_argument('--city-code',
+                        help='지자체 코드 (batch_classify.py 통합 인덱스의 ID 네임스페이스)')
+    parser.add_argument('--resume', action='store_true',
+                        help='중단된 실행의 체크포인트(_checkpoint.json)에서 이어서 실행')
+    only = parser.add_mutually_exclusive_group()
+    only.add_argument('--dat-only', action='store_true',
+                      help='DAT만 스캔/분류 (주기표 엑셀 건너뜀)')
+    only.add_argument('--xlsx-only', action='store_true',
+                      help='주기표 엑셀만 스캔/분류 (DAT 건너뜀)')
+    return parser
+
+
+def _setup_console():
+    """Windows CP949 콘솔 유니코드 출력 문제 해결 (임포트 시점이 아닌 실행 시점에 적용)."""
+    sys.stdout = io.TextIOWrapper(sys.stdout.buffer, encoding='utf-8', errors='replace')
+    sys.stderr = io.TextIOWrapper(sys.stderr.buffer, encoding='utf-8', errors='replace')
 
 
 def setup_output_dirs(output_dir: Path) -> dict:
     """출력 디렉토리 구조를 생성한다."""
     dirs = {
         'root': output_dir,
+        'originals': output_dir / '_원본',
+        'blobs': output_dir / '_원본' / 'blobs',
         'originals_dat': output_dir / '_원본' / 'dat_원본',
         'originals_cycle': output_dir / '_원본' / '주기표_원본',
         'unclassified_dat': output_dir / '_미분류' / 'dat_미분류',
@@ -246,34 +648,149 @@ def setup_output_dirs(output_dir: Path) -> dict:
     return dirs
 
 
-def copy_originals(dat_dir: Path, xlsx_dir: Path, dirs: dict):
-    """원본 파일을 보존 복사한다."""
-    # DAT 원본 복사
-    dat_count = 0
-    for dat_file in dat_dir.rglob('*.dat'):
-        dst = dirs['originals_dat'] / dat_file.name
-        if not dst.exists():
-            try:
-                shutil.copy2(dat_file, dst)
-                dat_count += 1
-            except Exception:
-                pass
-    print(f'  DAT 원본 {dat_count}개 복사 → {dirs["originals_dat"]}')
-
-    # 주기표 원본 복사
-    xlsx_count = 0
-    for pattern in ['*.xlsx', '*.xls']:
-        for xlsx_file in xlsx_dir.rglob(pattern):
-            if xlsx_file.name.startswith('~$'):
+def store_originals(sources: list[tuple[Path, list[Path], Path]], dirs: dict, inputs: dict,
+                    workers: int = DEFAULT_IO_WORKERS):
+    """원본 파일을 sha256 blob으로 보존하고, 소스 폴더 구조 그대로 하드링크를 만든다.
+
+    Args:
+        sources: [(소스 루트, 파일 목록, 링크를 만들 _원본 하위 폴더)]
+        inputs: manifest.collect_inputs() 결과 (파일별 sha256)
+        workers: 복사/링크 스레드 수
+    """
+    tasks = [
+        (src, view_dir, src.relative_to(source_root))
+        for source_root, files, view_dir in sources
+        for src in files
+    ]
+    results, errors = run_io_tasks(
+        lambda t: _place_original(t[0], t[1] / t[2], dirs, inputs, link=True), tasks, workers)
+
+    catalog = {}
+    for _, _, view_dir in sources:
+        stored = 0
+        linked = 0
+        for (src, task_view, rel), mode in zip(tasks, results):
+            if task_view != view_dir or mode is None:
                 continue
-            dst = dirs['originals_cycle'] / xlsx_file.name
-            if not dst.exists():
-                try:
-                    shutil.copy2(xlsx_file, dst)
-                    xlsx_count += 1
-                except Exception:
-                    pass
-    print(f'  주기표 원본 {xlsx_count}개 복사 → {dirs["originals_cycle"]}')
+            stored += 1
+            if mode != 'exists':
+                linked += 1
+            sig = inputs[str(src)]
+            catalog[f'{view_dir.name}/{rel.as_posix()}'] = {
+                'sha256': sig['sha256'],
+                'size': sig['size'],
+            }
+        print(f'  {view_dir.name}: {stored}개 보존 (신규 링크 {linked}) → {view_dir}')
+    _report_errors('원본 보존', errors, lambda t: t[0])
+
+    unique = {c['sha256']: c['size'] for c in catalog.values()}
+    total_bytes = sum(c['size'] for c in catalog.values())
+    print(f'  blob {len(unique)}개 ({sum(unique.values()):,}B / 원본 합계 {total_bytes:,}B)')
+    write_catalog(dirs['originals'], catalog)
+
+
+def _load_route_diagram(yodo_dir: Path) -> Optional[dict]:
+    """요도/routes.json (graph 형식) 이 있으면 읽는다."""
+    path = yodo_dir / 'routes.json'
+    if not path.exists():
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _report_errors(stage: str, errors: list, describe):
+    """스레드 풀 작업 오류를 모아서 출력한다."""
+    if not errors:
+        return
+    print(f'  ⚠ {stage} 실패 {len(errors)}건:')
+    for item, e in errors[:20]:
+        print(f'    - {describe(item)}: {e}')
+    if len(errors) > 20:
+        print(f'    ... 외 {len(errors) - 20}건')
+
+
+def _place_original(src, dst: Path, dirs: dict, inputs: dict, link: bool = False) -> str:
+    """원본을 blob 저장소에 넣고 dst에 둔다.
+
+    link=True는 _원본 안의 보존 뷰 전용 (하드링크, 불가 시 복사). 그 밖의 폴더는 웹 서버가
+    파일을 제자리에서 덮어쓰므로 blob과 inode를 공유하지 않는 사본을 만든다.
+    """
+    sig = inputs.get(str(src))
+    sha = sig['sha256'] if sig else file_sha256(src)
+    blob, _ = store_blob(src, dirs['blobs'], sha)
+    if link:
+        return link_blob(blob, dst)
+    return copy_blob(blob, dst)
+
+
+def _unclassified_dst(directory: Path, filename: str, src, inputs: dict) -> Path:
+    """미분류 폴더 내 대상 경로. 같은 이름의 다른 원본이 있으면 해시 접미사를 붙인다."""
+    dst = directory / filename
+    if dst.exists() and not os.path.samefile(dst, src):
+        sig = inputs.get(str(src))
+        if sig and file_sha256(dst) != sig['sha256']:
+            stem, ext = os.path.splitext(filename)
+            dst = directory / f'{stem}_{sig["sha256"][:8]}{ext}'
+    return dst
+
+
+def write_intersection_folder(intersection_dir: Path, bc_id: str, name: str,
+                              match: dict, dirs: dict, inputs: dict) -> tuple[dict, list[str]]:
+    """교차로 폴더에 DAT/주기표 원본 사본을 두고 info.json을 원자적으로 기록한다.
+
+    스레드 풀에서 호출되므로 출력하지 않는다.
+
+    Returns:
+        (info.json 내용, 복사 실패 경고 메시지 목록)
+    """
+    intersection_dir.mkdir(parents=True, exist_ok=True)
+    warnings = []
+
+    # DAT 복사
+    dat_copied = False
+    if match['selected_dat']:
+        src = match['selected_dat']['path']
+        dst = intersection_dir / f'{safe_dirname(name)}.dat'
+        try:
+            _place_original(src, dst, dirs, inputs)
+            dat_copied = True
+        except Exception as e:
+            warnings.append(f'DAT 복사 실패 ({name}): {e}')
+
+    # 주기표 복사
+    cycle_copied = False
+    if match['selected_cycle'] and match['selected_cycle'].get('source_file'):
+        src = match['selected_cycle']['source_file']
+        ext = os.path.splitext(src)[1]
+        dst = intersection_dir / f'{safe_dirname(name)}_주기표{ext}'
+        try:
+            _place_original(src, dst, dirs, inputs)
+            cycle_copied = True
+        except Exception as e:
+            warnings.append(f'주기표 복사 실패 ({name}): {e}')
+
+    # info.json 생성
+    info = build_info_json(bc_id, name, match, dat_copied, cycle_copied)
+    atomic_write_json(intersection_dir / 'info.json', info)
+
+    return info, warnings
+
+
+def _intersection_fingerprint(info: dict, match: dict, inputs: dict) -> str:
+    """교차로 폴더 내용 지문: info(이력 제외) + 복사 대상 원본 파일 해시."""
+    sources = []
+    if match.get('selected_dat'):
+        sources.append(inputs.get(match['selected_dat']['path'], {}).get('sha256'))
+    cycle = match.get('selected_cycle') or {}
+    if cycle.get('source_file'):
+        sources.append(inputs.get(cycle['source_file'], {}).get('sha256'))
+    return fingerprint({
+        'info': {k: v for k, v in info.items() if k != 'history'},
+        'sources': sources,
+    })
 
 
 def build_info_json(bc_id: str, name: str, match: dict,
@@ -293,7 +810,7 @@ def build_info_json(bc_id: str, name: str, match: dict,
     # DAT 정보
     if selected_dat:
         dat_info = {
-            'filename': f'{_safe_dirname(name)}.dat' if dat_copied else None,
+            'filename': f'{safe_dirname(name)}.dat' if dat_copied else None,
             'original_filename': selected_dat.get('filename', ''),
             'size': selected_dat.get('size', 0),
             'manufacturer_detected': selected_dat.get('manufacturer', 'unknown'),
@@ -328,7 +845,7 @@ def build_info_json(bc_id: str, name: str, match: dict,
         cycle = match['selected_cycle']
         ext = os.path.splitext(cycle.get('source_file', '.xlsx'))[1]
         info['cycle_table'] = {
-            'filename': f'{_safe_dirname(name)}_주기표{ext}' if cycle_copied else None,
+            'filename': f'{safe_dirname(name)}_주기표{ext}' if cycle_copied else None,
             'source_file': cycle.get('source_filename', ''),
             'sheet_name': cycle.get('sheet_name', ''),
         }
@@ -362,7 +879,8 @@ def build_info_json(bc_id: str, name: str, match: dict,
     return info
 
 
-def build_master_json(infos: list[dict]) -> dict:
+def build_master_json(infos: list[dict], city: str = DEFAULT_CITY,
+                      city_code: Optional[str] = None) -> dict:
     """전체 교차로 마스터 목록을 생성한다."""
     intersections = []
     for info in infos:
@@ -384,19 +902,21 @@ def build_master_json(infos: list[dict]) -> dict:
     return {
         'version': '1.0',
         'created': datetime.now().strftime('%Y-%m-%d'),
-        'city': '보령시',
+        'city': city,
+        **({'city_code': city_code} if city_code else {}),
         'total': len(intersections),
         'intersections': intersections,
     }
 
 
 def build_report(dat_results, cycle_results, matches, infos,
-                 unclassified_dats, unclassified_cycles) -> str:
+                 unclassified_dats, unclassified_cycles, borderline=None,
+                 city: str = DEFAULT_CITY) -> str:
     """분류보고서 마크다운을 생성한다."""
     now = datetime.now().strftime('%Y-%m-%d %H:%M')
 
     lines = [
-        f'# 보령시 교통신호제어기 분류보고서',
+        f'# {city} 교통신호제어기 분류보고서',
         f'',
         f'생성일시: {now}',
         f'',
@@ -487,7 +1007,7 @@ def build_report(dat_results, cycle_results, matches, infos,
 
     # 수동 확인 필요 목록
     manual_check = [m for m in matches if m['match_confidence'] == 'low' and m['selected_dat']]
-    if manual_check:
+    if manual_check or borderline:
         lines.extend([
             f'## 수동 확인 필요',
             f'',
@@ -496,15 +1016,18 @@ def build_report(dat_results, cycle_results, matches, infos,
             lines.append(f'  - {m["intersection_name"]}: {m["match_details"]}')
         lines.append('')
 
-    return '\n'.join(lines)
-
+    if borderline:
+        lines.extend([
+            f'### 경계 유사도 쌍 ({BORDERLINE_LOW:.2f} ~ {BORDERLINE_HIGH:.2f})',
+            f'',
+            f'| 유사도 | DAT 교차로명 | 주기표 교차로명 |',
+            f'|--------|--------------|-----------------|',
+        ])
+        for dat_name, cycle_name, score in borderline:
+            lines.append(f'| {score:.2f} | {dat_name} | {cycle_name} |')
+        lines.append('')
 
-def _safe_dirname(name: str) -> str:
-    """파일시스템에 안전한 디렉토리명으로 변환한다."""
-    # 파일시스템에서 사용 불가한 문자 제거
-    safe = re.sub(r'[<>:"/\\|?*]', '', name)
-    safe = safe.strip('. ')
-    return safe if safe else 'unnamed'
+    return '\n'.join(lines)
 
 
 def _guess_intersection_type(name: str) -> str:
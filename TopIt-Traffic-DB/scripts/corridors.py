@@ -0,0 +1,312 @@
+"""
+제어기 간 연동 구간(corridor) - 간선 그래프 전체 쌍 최단 경로를 미리 계산해 두고 조회한다.
+
+사용법:
+    python scripts/corridors.py 001 095                 ← 두 제어기 사이 경로 (요도 번호)
+    python scripts/corridors.py 001 095 --k 3           ← 짧은 순 경로 3개 (k-shortest, Yen)
+    python scripts/corridors.py --scale 2.5 --json 보령시_신호DB/요도/corridors.json
+                                                        ← 미터 환산 + 웹앱용 JSON 내보내기
+    python scripts/corridors.py --routes 보령시_신호DB/요도/routes.json BC-001 BC-038
+
+그래프는 signal_graph 로 읽는다 (기본: pdf_extracted_nodes/edges.json, 가중치 distance_pts).
+--scale (m/pt) 또는 --calibrate A B 미터 (두 노드 직선거리로 환산 비율 계산) 를 주면 거리를 미터로 쓴다.
+
+전체 쌍 결과는 노드 수 n 에 대해
+    dist  float32[n, n]   최단 거리 (도달 불가 inf)
+    pred  int16/32[n, n]  pred[s, t] = s 에서 t 로 가는 최단 경로에서 t 직전 노드 (-1 = 없음)
+두 행렬이며, 그래프 지문을 키로 {그래프 원본 폴더}/.graph_cache/ 에 .npz 로 저장된다.
+경로 조회는 pred 를 따라가는 표 읽기 (경로 길이만큼) 이고, 그래프가 바뀌면 다시 계산한다.
+
+--json 출력 (웹앱에서 같은 방식으로 경로 복원):
+    {"version", "unit", "scale", "ids", "names",
+     "dist": [[거리 또는 null, ...], ...], "pred": [[노드 번호 또는 -1, ...], ...]}
+"""
+
+import argparse
+import hashlib
+import heapq
+import io
+import json
+import math
+import os
+import sys
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from parallel_io import atomic_write_bytes, atomic_write_json
+from signal_graph import SignalGraph, load_pdf_graph, load_route_graph, CACHE_DIR_NAME
+
+
+CORRIDOR_VERSION = 1
+
+
+class CorridorTable:
+    """전체 쌍 최단 거리/직전 노드 행렬."""
+
+    def __init__(self, ids: list[str], names: list[str], dist: np.ndarray, pred: np.ndarray,
+                 scale: float = 1.0, unit: str = 'pt'):
+        self.ids = list(ids)
+        self.names = list(names)
+        self.dist = dist
+        self.pred = pred
+        self.scale = scale
+        self.unit = unit
+        self._index = {node_id: i for i, node_id in enumerate(self.ids)}
+
+    def distance(self, source, target) -> float:
+        return float(self.dist[self._index[source], self._index[target]])
+
+    def path(self, source, target) -> Optional[list[str]]:
+        """source → target 최단 경로 노드 ID 목록 (양 끝 포함). 도달 불가면 None."""
+        s, t = self._index[source], self._index[target]
+        if s == t:
+            return [source]
+        if self.pred[s, t] < 0:
+            return None
+        nodes = [t]
+        while t != s:
+            t = int(self.pred[s, t])
+            nodes.append(t)
+        return [self.ids[i] for i in reversed(nodes)]
+
+    def to_json(self) -> dict:
+        return {
+            'version': CORRIDOR_VERSION,
+            'unit': self.unit,
+            'scale': self.scale,
+            'ids': self.ids,
+            'names': self.names,
+            'dist': [[round(d, 1) if math.isfinite(d) else None for d in row]
+                     for row in self.dist.tolist()],
+            'pred': self.pred.tolist(),
+        }
+
+
+def dijkstra(graph: SignalGraph, source: int, banned_nodes=(), banned_edges=(),
+             target: Optional[int] = None) -> tuple[list[float], list[int]]:
+    """CSR 그래프 단일 출발 최단 경로 (노드 번호 기준). 거리가 같으면 먼저 확정된 경로를 유지한다.
+
+    Args:
+        banned_nodes: 지나지 않을 노드 번호 집합
+        banned_edges: 쓰지 않을 (i, j) 방향 간선 집합
+        target: 주면 target 확정 시 중단
+
+    Returns:
+        (거리 목록, 직전 노드 목록). 도달 불가는 inf / -1.
+    """
+    indptr, indices, weights = graph.indptr.tolist(), graph.indices.tolist(), graph.weights.tolist()
+    n = len(indptr) - 1
+    dist = [math.inf] * n
+    pred = [-1] * n
+    done = [False] * n
+    dist[source] = 0.0
+    heap = [(0.0, source)]
+    while heap:
+        d, i = heapq.heappop(heap)
+        if done[i]:
+            continue
+        done[i] = True
+        if i == target:
+            break
+        for k in range(indptr[i], indptr[i + 1]):
+            j = indices[k]
+            if done[j] or j in banned_nodes or (i, j) in banned_edges:
+                continue
+            nd = d + weights[k]
+            if nd < dist[j]:
+                dist[j] = nd
+                pred[j] = i
+                heapq.heappush(heap, (nd, j))
+    return dist, pred
+
+
+def build_corridor_table(graph: SignalGraph, scale: float = 1.0, unit: str = 'pt') -> CorridorTable:
+    """모든 노드에서 Dijkstra 를 돌려 전체 쌍 행렬을 만든다 (O(n · m log n))."""
+    n = len(graph)
+    dist = np.full((n, n), np.inf, np.float32)
+    pred = np.full((n, n), -1, np.int16 if n < np.iinfo(np.int16).max else np.int32)
+    for s in range(n):
+        d, p = dijkstra(graph, s)
+        dist[s] = np.array(d, np.float64) * scale
+        pred[s] = p
+    return CorridorTable(graph.ids, graph.names, dist, pred, scale, unit)
+
+
+def k_shortest_paths(graph: SignalGraph, source, target, k: int) -> list[tuple[float, list[str]]]:
+    """source → target 짧은 순 단순 경로 k개 [(거리, 노드 ID 목록), ...] (Yen 알고리즘)."""
+    s, t = graph.index(source), graph.index(target)
+    dist, pred = dijkstra(graph, s, target=t)
+    first = _walk(pred, s, t)
+    if first is None:
+        return []
+    weight = _edge_weights(graph)
+
+    found = [(dist[t], first)]
+    candidates = []
+    seen = {tuple(first)}
+    while len(found) < k:
+        last_path = found[-1][1]
+        for spur_at in range(len(last_path) - 1):
+            root = last_path[:spur_at + 1]
+            spur = root[-1]
+            banned_edges = {(p[spur_at], p[spur_at + 1]) for _, p in found
+                            if len(p) > spur_at + 1 and p[:spur_at + 1] == root}
+            banned_nodes = set(root[:-1])
+            d, p = dijkstra(graph, spur, banned_nodes, banned_edges, target=t)
+            tail = _walk(p, spur, t)
+            if tail is None:
+                continue
+            path = root[:-1] + tail
+            if tuple(path) in seen:
+                continue
+            seen.add(tuple(path))
+            cost = sum(weight[(a, b)] for a, b in zip(root[:-1], root[1:])) + d[t]
+            heapq.heappush(candidates, (cost, path))
+        if not candidates:
+            break
+        found.append(heapq.heappop(candidates))
+    return [(cost, [graph.ids[i] for i in path]) for cost, path in found]
+
+
+def graph_key(graph: SignalGraph, scale: float) -> str:
+    """그래프 구조/가중치 + 환산 비율 지문."""
+    h = hashlib.sha256()
+    h.update(json.dumps([graph.ids, scale], ensure_ascii=False).encode('utf-8'))
+    for arr in (graph.indptr, graph.indices, graph.weights):
+        h.update(np.ascontiguousarray(arr).tobytes())
+    return h.hexdigest()
+
+
+def load_corridor_table(graph: SignalGraph, cache_dir: Path, scale: float = 1.0,
+                        unit: str = 'pt', refresh: bool = False) -> tuple[CorridorTable, bool]:
+    """캐시된 행렬을 읽고, 없거나 그래프가 바뀌었으면 계산해 저장한다. (표, 새로 계산했는지)."""
+    key = graph_key(graph, scale)
+    path = Path(cache_dir) / f'corridors_{key[:16]}.npz'
+    if not refresh:
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                if int(data['version']) == CORRIDOR_VERSION and str(data['key']) == key:
+                    return CorridorTable(data['ids'].tolist(), data['names'].tolist(),
+                                         data['dist'], data['pred'],
+                                         float(data['scale']), str(data['unit'])), False
+        except (OSError, KeyError, ValueError):
+            pass
+
+    table = build_corridor_table(graph, scale, unit)
+    buf = io.BytesIO()
+    np.savez(buf, version=CORRIDOR_VERSION, key=key, ids=np.array(table.ids, dtype=str),
+             names=np.array(table.names, dtype=str), dist=table.dist, pred=table.pred,
+             scale=scale, unit=unit)
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_bytes(path, buf.getvalue())
+    except OSError:
+        pass  # 읽기 전용 위치: 캐시 없이 계속
+    return table, True
+
+
+def _walk(pred: list[int], source: int, target: int) -> Optional[list[int]]:
+    if source == target:
+        return [source]
+    if pred[target] < 0:
+        return None
+    path = [target]
+    while path[-1] != source:
+        path.append(pred[path[-1]])
+    return path[::-1]
+
+
+def _edge_weights(graph: SignalGraph) -> dict:
+    weights = {}
+    indptr, indices, w = graph.indptr.tolist(), graph.indices.tolist(), graph.weights.tolist()
+    for i in range(len(indptr) - 1):
+        for k in range(indptr[i], indptr[i + 1]):
+            weights[(i, indices[k])] = w[k]
+    return weights
+
+
+def _calibrated_scale(graph: SignalGraph, a, b, meters: float) -> float:
+    """두 노드 좌표 직선거리(pt)와 실제 거리(m)로 m/pt 비율을 구한다."""
+    pa, pb = graph.xy[graph.index(a)], graph.xy[graph.index(b)]
+    pts = math.hypot(*(pa - pb).tolist())
+    if not pts or math.isnan(pts):
+        raise ValueError(f'{a}, {b} 좌표로 환산 비율을 구할 수 없음')
+    return meters / pts
+
+
+def main():
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+    parser = argparse.ArgumentParser(description='제어기 간 연동 구간 (전체 쌍 최단 경로)')
+    parser.add_argument('source', nargs='?', help='출발 노드 ID')
+    parser.add_argument('target', nargs='?', help='도착 노드 ID')
+    parser.add_argument('--k', type=int, default=1, help='짧은 순 경로 개수 (기본 1)')
+    parser.add_argument('--nodes', default=str(project_root / 'pdf_extracted_nodes.json'),
+                        help='PDF 노드 JSON (기본: pdf_extracted_nodes.json)')
+    parser.add_argument('--edges', default=str(project_root / 'pdf_extracted_edges.json'),
+                        help='PDF 간선 JSON (기본: pdf_extracted_edges.json)')
+    parser.add_argument('--routes', help='routes.json (graph/노선 형식) 을 대신 읽음')
+    scale = parser.add_mutually_exclusive_group()
+    scale.add_argument('--scale', type=float, help='거리 환산 비율 m/pt (주면 미터 단위)')
+    scale.add_argument('--calibrate', nargs=3, metavar=('A', 'B', 'METERS'),
+                       help='두 노드 사이 실제 거리(m)로 환산 비율 계산')
+    parser.add_argument('--json', help='전체 쌍 행렬을 웹앱용 JSON 으로 내보내기')
+    parser.add_argument('--refresh', action='store_true', help='캐시를 무시하고 다시 계산')
+    args = parser.parse_args()
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    if args.routes:
+        graph = load_route_graph(args.routes)
+        cache_dir = Path(args.routes).parent / CACHE_DIR_NAME
+    else:
+        graph = load_pdf_graph(args.nodes, args.edges)
+        cache_dir = Path(args.edges).parent / CACHE_DIR_NAME
+
+    for node_id in (args.source, args.target):
+        if node_id is not None and node_id not in graph:
+            print(f'❌ 없음: {node_id}')
+            sys.exit(1)
+
+    factor, unit = 1.0, 'pt'
+    if args.scale:
+        factor, unit = args.scale, 'm'
+    elif args.calibrate:
+        a, b, meters = args.calibrate
+        try:
+            factor, unit = _calibrated_scale(graph, a, b, float(meters)), 'm'
+        except (KeyError, ValueError) as e:
+            print(f'❌ 환산 비율 오류: {e}')
+            sys.exit(1)
+        print(f'환산 비율: {factor:.3f} m/pt ({a}–{b} = {meters} m)')
+
+    table, built = load_corridor_table(graph, cache_dir, factor, unit, args.refresh)
+    reachable = int(np.isfinite(table.dist).sum()) - len(table.ids)
+    print(f'노드 {len(table.ids)}개, 연결된 쌍 {reachable}개 ({"계산" if built else "캐시"})')
+
+    if args.json:
+        atomic_write_json(args.json, table.to_json(), indent=None)
+        print(f'  ✅ {args.json}')
+
+    if args.source is None or args.target is None:
+        return
+    if args.k <= 1:
+        path = table.path(args.source, args.target)
+        results = [] if path is None else [(table.distance(args.source, args.target), path)]
+    else:
+        results = [(cost * factor, path)
+                   for cost, path in k_shortest_paths(graph, args.source, args.target, args.k)]
+    if not results:
+        print(f'  {args.source} → {args.target}: 연결 경로 없음')
+        sys.exit(1)
+    for rank, (cost, path) in enumerate(results, 1):
+        names = ' → '.join(f'[{p}] {table.names[table._index[p]]}' for p in path)
+        print(f'  {rank}. {cost:.1f} {unit}, 제어기 {len(path)}개: {names}')
+
+
+if __name__ == '__main__':
+    main()
@@ -343,26 +343,33 @@ def _extract_name_from_filename(result: dict):
     result['intersection_name'] = cleaned if cleaned else None
 
 
+def list_dat_files(directory: str) -> list[Path]:
+    """디렉토리 내 모든 .dat 파일 경로를 정렬하여 반환한다 (inventory 순회 사용)."""
+    from inventory import build_inventory, paths
+    return paths(build_inventory(dat_dir=directory), 'dat')
+
+
+def scan_dat_file(dat_file) -> dict:
+    """DAT 파일 1개를 파싱한다. 파싱 오류는 error 항목으로 반환한다."""
+    dat_file = Path(dat_file)
+    try:
+        return parse_dat(str(dat_file))
+    except Exception as e:
+        return {
+            'path': str(dat_file),
+            'filename': dat_file.name,
+            'size': dat_file.stat().st_size if dat_file.exists() else 0,
+            'manufacturer': 'error',
+            'format': 'error',
+            'intersection_name': None,
+            'confidence': 'none',
+            'raw_errors': [str(e)],
+        }
+
+
 def scan_dat_directory(directory: str) -> list[dict]:
     """디렉토리 내 모든 .dat 파일을 스캔하여 파싱 결과 리스트를 반환한다."""
-    results = []
-    dir_path = Path(directory)
-    for dat_file in sorted(dir_path.rglob('*.dat')):
-        try:
-            parsed = parse_dat(str(dat_file))
-            results.append(parsed)
-        except Exception as e:
-            results.append({
-                'path': str(dat_file),
-                'filename': dat_file.name,
-                'size': dat_file.stat().st_size if dat_file.exists() else 0,
-                'manufacturer': 'error',
-                'format': 'error',
-                'intersection_name': None,
-                'confidence': 'none',
-                'raw_errors': [str(e)],
-            })
-    return results
+    return [scan_dat_file(dat_file) for dat_file in list_dat_files(directory)]
 
 
 if __name__ == '__main__':
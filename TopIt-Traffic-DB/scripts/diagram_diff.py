@@ -0,0 +1,318 @@
+"""
+요도 개정판 비교 - 두 요도 그래프(노드/간선)의 차이를 찾는다.
+
+사용법:
+    python scripts/diagram_diff.py OLD NEW [--old-edges FILE] [--new-edges FILE]
+                                   [--identity FILE | --no-identity] [--max-move 40] [--move-tol 2]
+                                   [--no-align] [--json FILE]
+
+    OLD / NEW 는 다음 중 하나:
+      pdf_extracted_nodes.json 형식 (간선: 같은 폴더의 이름 'nodes' → 'edges' 파일, 또는 --old/new-edges)
+      routes.json (graph 형식 / 노선 형식)
+
+    예) 요도 PDF 새 개정판을 node_extractor.py / edge_extractor.py 로 추출한 뒤
+        python scripts/diagram_diff.py 이전/pdf_extracted_nodes.json pdf_extracted_nodes.json
+
+노드 대응 (앞 단계에서 짝지은 노드는 다음 단계에서 제외):
+  1. 번호: 같은 ID 이고 이름이 유사하거나(matcher 임계값 이상) 위치가 --max-move 이내
+  2. 식별: 정규화 이름, 이어서 identity_index 로 푼 정식 ID 가 양쪽에서 각각 1개뿐인 노드끼리
+  3. 위치: 남은 노드끼리 정렬 후 좌표가 서로 최근접이고 --max-move 이내 (spatial_index 격자)
+  1~2 단계 대응으로 이전 → 새 좌표 아핀 변환을 최소제곱으로 맞춘 뒤 (--no-align: 변환 없음)
+  이동 거리를 잰다. 판 배치/축척이 바뀐 개정판도 같은 좌표계로 비교된다.
+
+보고 항목:
+    추가/삭제 제어기, 이동 (정렬 후 --move-tol pt 초과), 이름 변경, 번호 변경, 추가/삭제 연결
+    (연결은 대응된 노드 기준으로 비교하므로 번호가 바뀐 노드의 간선은 변경으로 보지 않는다)
+
+모든 단계가 dict/격자 조회라 노드 n, 간선 m 에 대해 O(n + m) 이다.
+"""
+
+import argparse
+import math
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from matcher import name_similarity, normalize_name
+from parallel_io import atomic_write_json
+from signal_graph import SignalGraph, load_pdf_graph, load_route_graph
+from spatial_index import PointGrid
+
+
+DEFAULT_MAX_MOVE = 40.0
+DEFAULT_MOVE_TOL = 2.0
+NAME_THRESHOLD = 0.7
+# 아핀 정렬에 필요한 최소 대응 수
+MIN_ALIGN_PAIRS = 3
+
+UNKNOWN_NAMES = {'(미확인)', ''}
+
+
+def load_diagram(path, edges_path=None, cache: bool = True) -> SignalGraph:
+    """노드 JSON(PDF 추출) 또는 routes.json → SignalGraph."""
+    path = Path(path)
+    with open(path, 'r', encoding='utf-8') as f:
+        head = f.read(64).lstrip('\ufeff \t\r\n')
+    if head.startswith('{'):
+        return load_route_graph(path, cache)
+    if edges_path is None:
+        edges_path = path.with_name(path.name.replace('nodes', 'edges'))
+        if edges_path == path:
+            raise ValueError(f'간선 파일을 알 수 없음: {path} (--edges 지정)')
+    return load_pdf_graph(path, edges_path, cache)
+
+
+def match_nodes(old: SignalGraph, new: SignalGraph, identity: Optional[dict] = None,
+                max_move: float = DEFAULT_MAX_MOVE, move_tol: float = DEFAULT_MOVE_TOL,
+                align: bool = True) -> dict:
+    """두 그래프 노드 대응. 정렬은 잔차가 move_tol 이하인(움직이지 않은) 대응으로 다시 맞춘다.
+
+    Returns:
+        {'pairs': {이전 노드 번호: (새 노드 번호, 방법)}, 'transform': 3x2 아핀 행렬 또는 None}
+    """
+    pairs = {}
+    taken = set()
+
+    def pair(i, j, method):
+        pairs[i] = (j, method)
+        taken.add(j)
+
+    # 1. 같은 ID
+    for i, node_id in enumerate(old.ids):
+        if node_id in new:
+            j = new.index(node_id)
+            if (_same_name(old.names[i], new.names[j])
+                    or _distance(old.xy[i], new.xy[j]) <= max_move):
+                pair(i, j, 'id')
+
+    # 2. 정규화 이름, 이어서 정식 ID 가 양쪽에서 유일
+    for resolver in (None, identity) if identity is not None else (None,):
+        old_keys = _identity_keys(old, resolver, [i for i in range(len(old)) if i not in pairs])
+        new_keys = _identity_keys(new, resolver, [j for j in range(len(new)) if j not in taken])
+        for key, olds in old_keys.items():
+            news = new_keys.get(key)
+            if len(olds) == 1 and news is not None and len(news) == 1:
+                pair(olds[0], news[0], 'identity')
+
+    transform = _fit_affine(old, new, pairs, move_tol) if align else None
+
+    # 3. 위치: 정렬한 좌표끼리 서로 최근접
+    rest_old = [i for i in range(len(old)) if i not in pairs and _finite(old.xy[i])]
+    rest_new = [j for j in range(len(new)) if j not in taken and _finite(new.xy[j])]
+    if rest_old and rest_new:
+        moved = _apply(transform, old.xy[rest_old])
+        new_grid = PointGrid(new.xy[rest_new].tolist())
+        old_grid = PointGrid(moved.tolist())
+        for k, (x, y) in enumerate(moved.tolist()):
+            m, _ = new_grid.nearest(x, y, max_move)
+            if m is None:
+                continue
+            back, _ = old_grid.nearest(*new.xy[rest_new[m]].tolist(), max_move)
+            if back == k:
+                pair(rest_old[k], rest_new[m], 'position')
+
+    return {'pairs': pairs, 'transform': transform}
+
+
+def diff_diagrams(old: SignalGraph, new: SignalGraph, identity: Optional[dict] = None,
+                  max_move: float = DEFAULT_MAX_MOVE, move_tol: float = DEFAULT_MOVE_TOL,
+                  align: bool = True) -> dict:
+    """두 요도 그래프의 차이.
+
+    Returns:
+        {
+            'old' / 'new': {'nodes', 'edges'},
+            'matched': int, 'methods': {방법: 개수}, 'transform': [[a, b], [c, d], [tx, ty]] | None,
+            'added_nodes' / 'removed_nodes': [{'id', 'name', 'x', 'y'}],
+            'moved_nodes': [{'old_id', 'new_id', 'name', 'dx', 'dy', 'distance'}],
+            'renamed_nodes': [{'old_id', 'new_id', 'old_name', 'new_name'}],
+            'renumbered_nodes': [{'old_id', 'new_id', 'name'}],
+            'added_edges': [[새 ID, 새 ID]], 'removed_edges': [[이전 ID, 이전 ID]],
+        }
+    """
+    matching = match_nodes(old, new, identity, max_move, move_tol, align)
+    pairs, transform = matching['pairs'], matching['transform']
+    matched_new = {j for j, _ in pairs.values()}
+
+    moved, renamed, renumbered = [], [], []
+    aligned = _apply(transform, old.xy)
+    for i, (j, _) in sorted(pairs.items()):
+        if _finite(old.xy[i]) and _finite(new.xy[j]):
+            dx, dy = (new.xy[j] - aligned[i]).tolist()
+            dist = math.hypot(dx, dy)
+            if dist > move_tol:
+                moved.append({'old_id': old.ids[i], 'new_id': new.ids[j], 'name': new.names[j],
+                              'dx': round(dx, 1) + 0.0, 'dy': round(dy, 1) + 0.0, 'distance': round(dist, 1)})
+        if normalize_name(old.names[i]) != normalize_name(new.names[j]):
+            renamed.append({'old_id': old.ids[i], 'new_id': new.ids[j],
+                            'old_name': old.names[i], 'new_name': new.names[j]})
+        if old.ids[i] != new.ids[j]:
+            renumbered.append({'old_id': old.ids[i], 'new_id': new.ids[j], 'name': new.names[j]})
+
+    new_edges = {(a, b) for a, b, _ in new.edges()}
+    kept = set()
+    removed_edges = []
+    for a, b, _ in old.edges():
+        pa, pb = pairs.get(old.index(a)), pairs.get(old.index(b))
+        if pa is not None and pb is not None:
+            na, nb = new.ids[pa[0]], new.ids[pb[0]]
+            key = (na, nb) if (na, nb) in new_edges else (nb, na)
+            if key in new_edges:
+                kept.add(key)
+                continue
+        removed_edges.append([a, b])
+
+    return {
+        'old': {'nodes': len(old), 'edges': old.edge_count},
+        'new': {'nodes': len(new), 'edges': new.edge_count},
+        'matched': len(pairs),
+        'methods': dict(Counter(method for _, method in pairs.values())),
+        'transform': None if transform is None else np.round(transform, 6).tolist(),
+        'added_nodes': [_node(new, j) for j in range(len(new)) if j not in matched_new],
+        'removed_nodes': [_node(old, i) for i in range(len(old)) if i not in pairs],
+        'moved_nodes': moved,
+        'renamed_nodes': renamed,
+        'renumbered_nodes': renumbered,
+        'added_edges': [list(e) for e in sorted(new_edges - kept)],
+        'removed_edges': removed_edges,
+    }
+
+
+def _identity_keys(graph: SignalGraph, identity: Optional[dict], rows: list[int]) -> dict:
+    """노드 → 정규화 이름 (identity 를 주면 identity_index 로 푼 정식 ID). {키: [노드 번호, ...]}"""
+    if identity is not None:
+        from identity_index import resolve_name
+    keys = {}
+    for i in rows:
+        name = graph.names[i]
+        if name in UNKNOWN_NAMES:
+            continue
+        key = resolve_name(identity, name)[0] if identity is not None else normalize_name(name)
+        if key:
+            keys.setdefault(key, []).append(i)
+    return keys
+
+
+def _fit_affine(old: SignalGraph, new: SignalGraph, pairs: dict, tol: float):
+    """대응 좌표로 이전 → 새 아핀 변환 (3x2) 을 맞춘다. 잔차가 tol 을 넘는(이동한) 대응을 빼고 다시 맞춘다."""
+    rows = [(i, j) for i, (j, _) in pairs.items() if _finite(old.xy[i]) and _finite(new.xy[j])]
+    if len(rows) < MIN_ALIGN_PAIRS:
+        return None
+    src = np.array([old.xy[i] for i, _ in rows])
+    dst = np.array([new.xy[j] for _, j in rows])
+    a = np.hstack([src, np.ones((len(src), 1))])
+    transform = None
+    keep = np.ones(len(rows), bool)
+    for _ in range(2):
+        if keep.sum() < MIN_ALIGN_PAIRS or np.linalg.matrix_rank(a[keep]) < 3:
+            break
+        transform = np.linalg.lstsq(a[keep], dst[keep], rcond=None)[0]
+        residual = np.hypot(*(a @ transform - dst).T)
+        keep = residual <= tol
+    return transform
+
+
+def _apply(transform, xy: np.ndarray) -> np.ndarray:
+    if transform is None:
+        return np.asarray(xy, dtype=np.float64)
+    return np.hstack([xy, np.ones((len(xy), 1))]) @ transform
+
+
+def _same_name(a: str, b: str) -> bool:
+    return a in UNKNOWN_NAMES or b in UNKNOWN_NAMES or name_similarity(a, b) >= NAME_THRESHOLD
+
+
+def _distance(p, q) -> float:
+    d = math.hypot(*(p - q).tolist())
+    return math.inf if math.isnan(d) else d
+
+
+def _finite(p) -> bool:
+    return bool(np.isfinite(p).all())
+
+
+def _node(graph: SignalGraph, i: int) -> dict:
+    x, y = graph.xy[i].tolist()
+    return {'id': graph.ids[i], 'name': graph.names[i],
+            'x': None if math.isnan(x) else x, 'y': None if math.isnan(y) else y}
+
+
+def print_diff(diff: dict):
+    print(f'  이전: 노드 {diff["old"]["nodes"]}개, 간선 {diff["old"]["edges"]}개')
+    print(f'  새판: 노드 {diff["new"]["nodes"]}개, 간선 {diff["new"]["edges"]}개')
+    methods = ', '.join(f'{m} {c}' for m, c in diff['methods'].items())
+    print(f'  대응 {diff["matched"]}개 ({methods or "없음"})'
+          + (', 좌표 아핀 정렬' if diff['transform'] is not None else ''))
+
+    sections = (
+        ('추가 제어기', diff['added_nodes'], lambda n: f'[{n["id"]}] {n["name"]}'),
+        ('삭제 제어기', diff['removed_nodes'], lambda n: f'[{n["id"]}] {n["name"]}'),
+        ('이동', diff['moved_nodes'],
+         lambda n: f'[{n["old_id"]}→{n["new_id"]}] {n["name"]}: {n["distance"]}pt ({n["dx"]:+}, {n["dy"]:+})'),
+        ('이름 변경', diff['renamed_nodes'],
+         lambda n: f'[{n["old_id"]}→{n["new_id"]}] {n["old_name"]} → {n["new_name"]}'),
+        ('번호 변경', diff['renumbered_nodes'], lambda n: f'{n["old_id"]} → {n["new_id"]} {n["name"]}'),
+        ('추가 연결', diff['added_edges'], lambda e: f'{e[0]} — {e[1]}'),
+        ('삭제 연결', diff['removed_edges'], lambda e: f'{e[0]} — {e[1]}'),
+    )
+    for title, items, fmt in sections:
+        print(f'\n  {title}: {len(items)}개')
+        for item in items:
+            print(f'    {fmt(item)}')
+
+
+def main():
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+    parser = argparse.ArgumentParser(description='요도 개정판 비교 (노드/간선 그래프 diff)')
+    parser.add_argument('old', help='이전 요도 (노드 JSON 또는 routes.json)')
+    parser.add_argument('new', help='새 요도 (노드 JSON 또는 routes.json)')
+    parser.add_argument('--old-edges', help='이전 간선 JSON (기본: 노드 파일 이름의 nodes → edges)')
+    parser.add_argument('--new-edges', help='새 간선 JSON (기본: 노드 파일 이름의 nodes → edges)')
+    parser.add_argument('--identity', default=str(project_root / '보령시_신호DB' / 'identity_index.json'),
+                        help='identity_index.json (기본: 보령시_신호DB/identity_index.json, 없으면 이름만 사용)')
+    parser.add_argument('--no-identity', action='store_true', help='식별 인덱스 없이 이름으로만 대응')
+    parser.add_argument('--max-move', type=float, default=DEFAULT_MAX_MOVE,
+                        help=f'위치 대응 최대 거리 pt (기본 {DEFAULT_MAX_MOVE})')
+    parser.add_argument('--move-tol', type=float, default=DEFAULT_MOVE_TOL,
+                        help=f'이동으로 볼 최소 거리 pt (기본 {DEFAULT_MOVE_TOL})')
+    parser.add_argument('--no-align', action='store_true', help='좌표 정렬 없이 비교')
+    parser.add_argument('--json', help='비교 결과 JSON 저장')
+    args = parser.parse_args()
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    for path in (args.old, args.new):
+        if not os.path.isfile(path):
+            print(f'❌ 파일 없음: {path}')
+            sys.exit(1)
+
+    identity = None
+    if not args.no_identity:
+        from identity_index import load_identity_index
+        identity = load_identity_index(args.identity)
+
+    try:
+        old = load_diagram(args.old, args.old_edges)
+        new = load_diagram(args.new, args.new_edges)
+    except (OSError, ValueError) as e:
+        print(f'❌ 요도 읽기 실패: {e}')
+        sys.exit(1)
+
+    diff = diff_diagrams(old, new, identity, args.max_move, args.move_tol, not args.no_align)
+    print(f'{args.old} → {args.new}' + (' (식별 인덱스 사용)' if identity else ''))
+    print_diff(diff)
+
+    if args.json:
+        atomic_write_json(args.json, diff)
+        print(f'\n  ✅ {args.json}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,254 @@
+"""
+요도 간선 추출 - 요도 PDF 도형에서 교차로 노드 간 연결(간선)을 찾는다.
+
+사용법:
+    python scripts/edge_extractor.py [PDF ...] [--nodes FILE] [--output FILE]
+                                     [--pages 0,2 | --pages all] [--strategies ABC]
+                                     [--max-dist 40] [--prox-dist 15] [--workers N] [--split]
+
+기본값 (프로젝트 루트 기준):
+    PDF      : 프로젝트 루트의 *.pdf (요도)
+    --nodes  : pdf_extracted_nodes.json
+    --output : pdf_extracted_edges.json
+
+전략 (extract_edges_v2.py 와 같은 규칙):
+    A  경로 단위: 경로의 첫 점 ↔ 끝 점, 경유점을 따라 바뀌는 최근접 노드를 차례로 연결
+    B  선분 단위: 직선/곡선 항목의 양 끝점 최근접 노드 연결
+    C  체인 투영: 길이 5pt 이상 선분에서 PROX_DIST 안의 노드를 선분 방향(t)순으로 연결
+    최근접 노드는 MAX_DIST 이내만 인정한다.
+
+도형은 pdf_geometry 캐시에서 읽고, 모든 전략을 항목 배열 한 번 순회로 처리한다
+(선분 끝점 최근접 노드 조회는 A/B 가 공유, C 는 NumPy 일괄 투영).
+PDF/페이지가 여러 개면 --workers 개 프로세스로 나눠 처리하고, 간선은 합쳐서 하나의 파일로 쓴다
+(--split: 페이지별 {출력 이름}_{PDF 이름}_p{페이지}.json 도 함께 기록).
+
+출력 스키마 (기존 pdf_extracted_edges.json 과 동일, 코드쌍 정렬):
+    [{"from_code", "from_name", "to_code", "to_name", "distance_pts"}, ...]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from parallel_io import atomic_write_json
+from pdf_geometry import load_geometry, page_count
+from spatial_index import load_nodes, node_grid
+
+
+STRATEGIES = 'ABC'
+DEFAULT_MAX_DIST = 40.0
+DEFAULT_PROX_DIST = 15.0
+
+# 체인 투영(C) 대상 최소 선분 길이 (pt)
+MIN_CHAIN_LENGTH = 5.0
+# 경로 경유점 중복 판정 거리 (pt)
+WAYPOINT_EPS = 0.1
+# 체인 투영 한 번에 처리할 선분 수 (선분 × 노드 배열 크기 제한)
+SEG_BATCH = 4096
+
+
+def extract_page_edges(geometry, nodes: list[dict], strategies: str = STRATEGIES,
+                       max_dist: float = DEFAULT_MAX_DIST,
+                       prox_dist: float = DEFAULT_PROX_DIST) -> dict[str, set]:
+    """한 페이지 도형에서 전략별 간선 {전략: {(코드, 코드), ...}} 을 찾는다 (코드쌍은 정렬)."""
+    codes = [n['code'] for n in nodes]
+    found = {s: set() for s in strategies}
+    lc = geometry.select('l', 'c')
+    chords = geometry.chords(lc)
+    path_ids = geometry.path[lc].tolist()
+
+    def add(strategy, i, j):
+        if i is not None and j is not None and i != j:
+            a, b = codes[i], codes[j]
+            found[strategy].add((a, b) if a < b else (b, a))
+
+    if 'A' in found or 'B' in found:
+        grid = node_grid(nodes)
+        near = [grid.nearest(x, y, max_dist)[0]
+                for x1, y1, x2, y2 in chords.tolist() for x, y in ((x1, y1), (x2, y2))]
+        path_state = None  # [첫 노드, 마지막 유지점 x, y, 마지막 유지점 노드, 직전 경유 노드]
+
+        for k, (x1, y1, x2, y2) in enumerate(chords.tolist()):
+            if 'B' in found:
+                add('B', near[2 * k], near[2 * k + 1])
+            if 'A' not in found:
+                continue
+            if k == 0 or path_ids[k] != path_ids[k - 1]:
+                if path_state is not None:
+                    add('A', path_state[0], path_state[3])
+                path_state = None
+            for x, y, ni in ((x1, y1, near[2 * k]), (x2, y2, near[2 * k + 1])):
+                if path_state is None:
+                    path_state = [ni, x, y, ni, None]
+                elif abs(x - path_state[1]) > WAYPOINT_EPS or abs(y - path_state[2]) > WAYPOINT_EPS:
+                    path_state[1:4] = [x, y, ni]
+                else:
+                    continue
+                prev = path_state[4]
+                if ni is not None and ni != prev:
+                    if prev is not None:
+                        add('A', prev, ni)
+                    path_state[4] = ni
+        if 'A' in found and path_state is not None:
+            add('A', path_state[0], path_state[3])
+
+    if 'C' in found:
+        for i, j in chain_pairs(chords, nodes, prox_dist):
+            add('C', i, j)
+    return found
+
+
+def chain_pairs(chords: np.ndarray, nodes: list[dict], prox_dist: float):
+    """체인 투영: 선분마다 prox_dist 안의 노드를 t 순으로 이은 (노드 번호, 노드 번호) 쌍."""
+    seg = chords[np.hypot(chords[:, 2] - chords[:, 0], chords[:, 3] - chords[:, 1]) >= MIN_CHAIN_LENGTH]
+    node_x = np.array([n['node_cx'] for n in nodes], dtype=np.float64)
+    node_y = np.array([n['node_cy'] for n in nodes], dtype=np.float64)
+    for start in range(0, len(seg), SEG_BATCH):
+        batch = seg[start:start + SEG_BATCH]
+        x1, y1 = batch[:, 0:1], batch[:, 1:2]
+        dx, dy = batch[:, 2:3] - x1, batch[:, 3:4] - y1
+        seg_len_sq = dx * dx + dy * dy
+        # (선분, 노드): 클램프 전 t 는 체인 순서, 클램프한 t 는 거리 계산에 쓴다
+        t = ((node_x - x1) * dx + (node_y - y1) * dy) / seg_len_sq
+        t_clamped = np.clip(t, 0, 1)
+        dist = np.hypot(node_x - (x1 + t_clamped * dx), node_y - (y1 + t_clamped * dy))
+        close = dist <= prox_dist
+        for row in np.flatnonzero(close.sum(axis=1) >= 2):
+            idx = np.flatnonzero(close[row])
+            chain = idx[np.lexsort((idx, t[row, idx]))].tolist()
+            yield from zip(chain[:-1], chain[1:])
+
+
+def build_edge_list(pairs, nodes: list[dict]) -> list[dict]:
+    """코드쌍 집합 → pdf_extracted_edges.json 항목 목록 (코드쌍 정렬)."""
+    code_to_node = {n['code']: n for n in nodes}
+    edges = []
+    for a, b in sorted(pairs):
+        na, nb = code_to_node[a], code_to_node[b]
+        dist = math.hypot(na['node_cx'] - nb['node_cx'], na['node_cy'] - nb['node_cy'])
+        edges.append({
+            'from_code': a,
+            'from_name': na['name'],
+            'to_code': b,
+            'to_name': nb['name'],
+            'distance_pts': round(dist, 1),
+        })
+    return edges
+
+
+def extract_job(job: tuple) -> dict:
+    """(PDF, 페이지, 노드, 옵션) 1건 처리. 프로세스 풀에서 호출된다."""
+    pdf, page, nodes, strategies, max_dist, prox_dist = job
+    started = time.perf_counter()
+    geometry = load_geometry(pdf, page)
+    found = extract_page_edges(geometry, nodes, strategies, max_dist, prox_dist)
+    return {
+        'pdf': str(pdf),
+        'page': page,
+        'items': geometry.item_count,
+        'found': found,
+        'elapsed': time.perf_counter() - started,
+    }
+
+
+def run_jobs(jobs: list[tuple], workers: int) -> list[dict]:
+    """작업이 1개거나 workers <= 1 이면 현재 프로세스에서 실행한다."""
+    if workers <= 1 or len(jobs) <= 1:
+        return [extract_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+        return list(pool.map(extract_job, jobs))
+
+
+def parse_pages(spec: str, pdf) -> list[int]:
+    """'0' / '0,2' / 'all' → 페이지 번호 목록. 숫자가 아니거나 PDF에 없는 페이지면 ValueError."""
+    count = page_count(pdf)
+    if spec == 'all':
+        return list(range(count))
+    try:
+        pages = [int(p) for p in spec.split(',') if p.strip()]
+    except ValueError:
+        raise ValueError(f"--pages 는 '0,2' 형식의 페이지 번호 또는 'all': {spec}") from None
+    out_of_range = [p for p in pages if not 0 <= p < count]
+    if out_of_range:
+        raise ValueError(f'{Path(pdf).name}: 페이지 {", ".join(map(str, out_of_range))} 없음 '
+                         f'(0~{count - 1}, 총 {count}쪽)')
+    return pages
+
+
+def main():
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+    parser = argparse.ArgumentParser(description='요도 PDF 간선 추출 (전략 A/B/C 단일 순회)')
+    parser.add_argument('pdfs', nargs='*', help='요도 PDF (기본: 프로젝트 루트의 *.pdf)')
+    parser.add_argument('--nodes', default=str(project_root / 'pdf_extracted_nodes.json'),
+                        help='노드 목록 JSON (기본: pdf_extracted_nodes.json)')
+    parser.add_argument('--output', default=str(project_root / 'pdf_extracted_edges.json'),
+                        help='출력 JSON (기본: pdf_extracted_edges.json)')
+    parser.add_argument('--pages', default='0', help="페이지 번호 '0,2' 또는 'all' (기본 0)")
+    parser.add_argument('--strategies', default=STRATEGIES, help=f'사용할 전략 (기본 {STRATEGIES})')
+    parser.add_argument('--max-dist', type=float, default=DEFAULT_MAX_DIST,
+                        help=f'최근접 노드 인정 거리 pt (기본 {DEFAULT_MAX_DIST})')
+    parser.add_argument('--prox-dist', type=float, default=DEFAULT_PROX_DIST,
+                        help=f'체인 투영 노드 거리 pt (기본 {DEFAULT_PROX_DIST})')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help='페이지 처리 프로세스 수 (기본 CPU 수)')
+    parser.add_argument('--split', action='store_true', help='페이지별 간선 파일도 기록')
+    args = parser.parse_args()
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    strategies = ''.join(s for s in STRATEGIES if s in args.strategies.upper())
+    if not strategies:
+        parser.error(f'--strategies 는 {STRATEGIES} 중 하나 이상')
+    pdfs = [Path(p) for p in args.pdfs] or sorted(project_root.glob('*.pdf'))
+    missing = [p for p in pdfs if not p.is_file()]
+    if not pdfs or missing:
+        print(f'❌ PDF 없음: {", ".join(map(str, missing)) or project_root / "*.pdf"}')
+        sys.exit(1)
+
+    try:
+        pages = {pdf: parse_pages(args.pages, pdf) for pdf in pdfs}
+    except ValueError as e:
+        print(f'❌ {e}')
+        sys.exit(1)
+
+    nodes = load_nodes(args.nodes)
+    jobs = [(pdf, page, nodes, strategies, args.max_dist, args.prox_dist)
+            for pdf in pdfs for page in pages[pdf]]
+    print(f'노드 {len(nodes)}개, PDF {len(pdfs)}개 / 페이지 {len(jobs)}개, 전략 {strategies} '
+          f'(MAX_DIST={args.max_dist}, PROX_DIST={args.prox_dist})')
+
+    started = time.perf_counter()
+    results = run_jobs(jobs, args.workers)
+
+    output = Path(args.output)
+    merged = set()
+    for r in results:
+        page_pairs = set().union(*r['found'].values())
+        merged |= page_pairs
+        per_strategy = ', '.join(f'{s} {len(r["found"][s])}' for s in strategies)
+        print(f'  {Path(r["pdf"]).name} p{r["page"]}: 항목 {r["items"]}개 → 간선 {len(page_pairs)}개 '
+              f'({per_strategy}) {r["elapsed"]:.2f}s')
+        if args.split:
+            split_path = output.with_name(f'{output.stem}_{Path(r["pdf"]).stem}_p{r["page"]}{output.suffix}')
+            atomic_write_json(split_path, build_edge_list(page_pairs, nodes))
+
+    edges = build_edge_list(merged, nodes)
+    atomic_write_json(output, edges)
+
+    connected = {code for pair in merged for code in pair}
+    print(f'\n  간선 {len(edges)}개, 연결 노드 {len(connected)}/{len(nodes)}개 '
+          f'({time.perf_counter() - started:.2f}s)')
+    print(f'  ✅ {output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,474 @@
+"""
+교차로 식별 인덱스 - 소스마다 다른 교차로 키를 하나의 정식 교차로 ID(BC-xxx)로 연결한다.
+
+사용법:
+    python scripts/identity_index.py                        ← 인덱스 갱신 (바뀐 소스만) + 요약
+    python scripts/identity_index.py --rebuild              ← 처음부터 다시 구성
+    python scripts/identity_index.py --resolve pdf 001      ← 소스 키 → 정식 ID
+    python scripts/identity_index.py --name 대천중          ← 교차로명 → 정식 ID (유사 매칭)
+    python scripts/identity_index.py --unresolved           ← 연결 못 한 키 목록
+    python scripts/identity_index.py --output-dir 서산시_신호DB --pdf-nodes 서산/pdf_extracted_nodes.json
+
+    pdf / routes 소스는 도시마다 파일이 다르므로 경로를 지정한 경우에만 반영한다
+    (--output-dir 기본값, 즉 보령시_신호DB 일 때만 프로젝트 루트의 파일이 기본값).
+    지정하지 않은 소스가 이전 인덱스에 남아 있으면 삭제한다.
+
+    from identity_index import load_identity_index, resolve
+    bc_id = resolve(index, 'pdf', '024')                    ← dict 조회 1회
+
+소스와 키:
+    canonical  classify 교차로 (_manifest.json intersections, 없으면 master.json) ID → 이름
+    pdf        요도 PDF 노드 번호 (pdf_extracted_nodes.json 'code', 예: '001')
+    yodo       요도/routes.json graph 노드 id (db_id 를 ID 힌트로 사용)
+    routes     routes.json 노선 제어기 ID (BC-xxx, 힌트 = 자기 자신)
+    dat        DAT 파일 경로 (match_index.json DAT 그룹)
+    cycle      주기표 '파일 경로#시트명' (match_index.json 주기표 그룹, 연결된 DAT 그룹명 우선)
+
+연결 규칙 (matcher 유사도 엔진 사용):
+  1. ID 힌트: 번호가 같은 정식 ID 가 있고 이름 점수가 임계값 이상이면 채택
+  2. 이름: 정규화 이름 정확 일치 → n-gram/별칭 후보 중 name_similarity 최고점 (임계값 이상)
+  3. 핵심 이름: 사거리/삼거리/교차로 등 접미사를 뗀 이름이 정식 교차로 1곳과만 같으면 CORE_SCORE
+  최고점 후보가 둘 이상(동명 교차로)이면 연결하지 않는다.
+
+증분 갱신:
+  소스별 입력 지문이 같으면 건너뛰고, 바뀐 소스는 이름/힌트가 바뀐 키만 다시 연결한다.
+  정식 교차로 목록이 바뀌면 정확 일치가 아니었던 키, 대상이 사라지거나 이름이 바뀐 키,
+  정규화 이름의 정식 ID 목록이나 ID 힌트 대상이 바뀐 키를 다시 연결한다 (결과는 --rebuild 와 같다).
+
+{output_dir}/identity_index.json:
+    {"version", "threshold",
+     "canonical": {ID: 이름}, "numbers": {번호: ID},
+     "names": {"norms": {정규화 이름: [ID, ...]}, "ngrams": {...}, "cores": {핵심 이름: [ID, ...]}},
+     "sources": {소스: {"fingerprint", "entries": {키: [이름, 힌트]}, "keys": {키: ID|null},
+                        "scores": {키: 점수 (1.0 미만만)}}}}
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from manifest import MANIFEST_NAME, fingerprint
+from matcher import name_similarity, normalize_name, _candidate_norms, _ngrams
+from parallel_io import atomic_write_json
+from sqlite_store import bc_number
+
+
+IDENTITY_INDEX_NAME = 'identity_index.json'
+IDENTITY_INDEX_VERSION = 1
+
+SOURCES = ('pdf', 'yodo', 'routes', 'dat', 'cycle')
+
+# matcher.match_one 기본 임계값과 동일
+DEFAULT_THRESHOLD = 0.7
+# 핵심 이름(접미사 제외)만 같을 때의 점수
+CORE_SCORE = 0.85
+
+ROAD_SUFFIX_RE = re.compile(r'(사거리|삼거리|오거리|[3-5]거리|교차로|로터리|입구|앞)$')
+UNKNOWN_NAMES = {'(미확인)', ''}
+
+
+def new_index(threshold: float = DEFAULT_THRESHOLD) -> dict:
+    return {
+        'version': IDENTITY_INDEX_VERSION,
+        'threshold': threshold,
+        'canonical': {},
+        'numbers': {},
+        'names': {'norms': {}, 'ngrams': {}, 'cores': {}},
+        'canonical_fingerprint': None,
+        'sources': {},
+    }
+
+
+def load_identity_index(path) -> Optional[dict]:
+    """저장된 인덱스. 없거나 버전이 다르면 None."""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if index.get('version') != IDENTITY_INDEX_VERSION:
+        return None
+    return index
+
+
+def save_identity_index(path, index: dict):
+    atomic_write_json(path, index, indent=None)
+
+
+def resolve(index: dict, source: str, key) -> Optional[str]:
+    """소스 키 → 정식 ID (연결 안 됨/없음 None)."""
+    return index['sources'].get(source, {}).get('keys', {}).get(str(key))
+
+
+def keys_for(index: dict, canonical_id: str) -> dict[str, list[str]]:
+    """정식 ID 에 연결된 소스별 키 {소스: [키, ...]}."""
+    found = {}
+    for source, data in index['sources'].items():
+        keys = [k for k, v in data['keys'].items() if v == canonical_id]
+        if keys:
+            found[source] = keys
+    return found
+
+
+def unresolved(index: dict) -> dict[str, list[tuple[str, str]]]:
+    """연결하지 못한 키 {소스: [(키, 이름), ...]}."""
+    return {
+        source: [(k, data['entries'][k][0]) for k, v in data['keys'].items() if v is None]
+        for source, data in index['sources'].items()
+        if any(v is None for v in data['keys'].values())
+    }
+
+
+def resolve_name(index: dict, name: str, hint=None) -> tuple[Optional[str], float]:
+    """교차로명(+ID 힌트) → (정식 ID, 점수). 임계값 미만이거나 동점 후보가 여럿이면 (None, 최고점)."""
+    threshold = index['threshold']
+    canonical = index['canonical']
+
+    hinted = _hint_target(hint, canonical, index['numbers'])
+    if hinted is not None:
+        score = _score(index, name, canonical[hinted]) if name not in UNKNOWN_NAMES else 1.0
+        if score >= threshold:
+            return hinted, score
+
+    norm = normalize_name(name) if name else ''
+    if not norm:
+        return None, 0.0
+    names = index['names']
+    exact = names['norms'].get(norm)
+    if exact:
+        return (exact[0], 1.0) if len(exact) == 1 else (None, 1.0)
+
+    best_ids, best = set(), 0.0
+    candidates = [cid for n in _candidate_norms(norm, names) for cid in names['norms'][n]]
+    candidates += names['cores'].get(_core(norm), ())
+    for cid in candidates:
+        score = _score(index, name, canonical[cid])
+        if score > best:
+            best_ids, best = {cid}, score
+        elif score == best:
+            best_ids.add(cid)
+    if best >= threshold and len(best_ids) == 1:
+        return best_ids.pop(), best
+    return None, best
+
+
+def set_canonical(index: dict, items) -> bool:
+    """정식 교차로 [(ID, 이름), ...] 를 설정한다. 바뀌었으면 영향받는 소스 키를 다시 연결하고 True."""
+    items = sorted((str(cid), name) for cid, name in items)
+    fp = fingerprint(items)
+    if index.get('canonical_fingerprint') == fp:
+        return False
+
+    previous = index['canonical']
+    previous_numbers = index['numbers']
+    previous_norms = index['names']['norms']
+    canonical = dict(items)
+    norms, ngrams, cores = {}, {}, {}
+    for cid, name in items:
+        norm = normalize_name(name) if name else ''
+        if not norm:
+            continue
+        if norm not in norms:
+            for gram in _ngrams(norm):
+                ngrams.setdefault(gram, []).append(norm)
+        norms.setdefault(norm, []).append(cid)
+        core = _core(norm)
+        if core:
+            cores.setdefault(core, []).append(cid)
+    index['canonical'] = canonical
+    index['numbers'] = {str(bc_number(cid)): cid for cid, _ in items}
+    index['names'] = {
+        'norms': norms,
+        'ngrams': ngrams,
+        'cores': {c: ids for c, ids in cores.items() if len(set(ids)) == 1},
+    }
+    index['canonical_fingerprint'] = fp
+
+    # 정확 일치로 연결된 키는 결과를 정하는 입력이 모두 그대로일 때만 유지한다:
+    # 대상 이름, 같은 정규화 이름의 정식 ID 목록 (동명 교차로가 생기면 모호해짐), ID 힌트 대상과 그 이름
+    for data in index['sources'].values():
+        for key, (name, hint) in data['entries'].items():
+            cid = data['keys'].get(key)
+            norm = normalize_name(name) if name else ''
+            if (cid is not None and key not in data['scores']
+                    and canonical.get(cid) == previous.get(cid)
+                    and norm in norms and norms[norm] == previous_norms.get(norm)
+                    and _hint_unchanged(hint, canonical, index['numbers'], previous, previous_numbers)):
+                continue
+            _link(index, data, key, name, hint)
+    return True
+
+
+def _hint_target(hint, canonical: dict, numbers: dict) -> Optional[str]:
+    """resolve_name 과 같은 규칙으로 ID 힌트가 가리키는 정식 ID."""
+    if hint in (None, ''):
+        return None
+    return str(hint) if str(hint) in canonical else numbers.get(str(bc_number(hint)))
+
+
+def _hint_unchanged(hint, canonical: dict, numbers: dict, previous: dict, previous_numbers: dict) -> bool:
+    """ID 힌트 대상과 그 이름이 정식 목록 변경 전후로 같은지."""
+    before = _hint_target(hint, previous, previous_numbers)
+    after = _hint_target(hint, canonical, numbers)
+    return before == after and (after is None or previous.get(after) == canonical.get(after))
+
+
+def update_source(index: dict, source: str, entries: list[dict]) -> Optional[dict]:
+    """소스 항목 [{'key', 'name', 'hint'}] 로 연결을 갱신한다. 입력이 그대로면 None.
+
+    Returns:
+        {'added', 'changed', 'removed', 'resolved', 'unresolved'} 개수
+    """
+    new_entries = {str(e['key']): [e.get('name') or '', e.get('hint')] for e in entries}
+    fp = fingerprint(new_entries)
+    data = index['sources'].get(source)
+    if data is not None and data['fingerprint'] == fp:
+        return None
+    if data is None:
+        data = index['sources'][source] = {'fingerprint': None, 'entries': {}, 'keys': {}, 'scores': {}}
+
+    old_entries = data['entries']
+    stats = {'added': 0, 'changed': 0, 'removed': 0}
+    for key in [k for k in old_entries if k not in new_entries]:
+        del old_entries[key]
+        data['keys'].pop(key, None)
+        data['scores'].pop(key, None)
+        stats['removed'] += 1
+    for key, entry in new_entries.items():
+        if old_entries.get(key) == entry:
+            continue
+        stats['changed' if key in old_entries else 'added'] += 1
+        old_entries[key] = entry
+        _link(index, data, key, *entry)
+    data['fingerprint'] = fp
+
+    linked = sum(1 for v in data['keys'].values() if v is not None)
+    stats['resolved'] = linked
+    stats['unresolved'] = len(data['keys']) - linked
+    return stats
+
+
+def _link(index: dict, data: dict, key: str, name: str, hint):
+    cid, score = resolve_name(index, name, hint)
+    data['keys'][key] = cid
+    if cid is not None and score < 1.0:
+        data['scores'][key] = round(score, 3)
+    else:
+        data['scores'].pop(key, None)
+
+
+def _score(index: dict, name: str, canonical_name: str) -> float:
+    """name_similarity 에 접미사 보정을 더한 점수.
+
+    둘 다 접미사가 붙었는데 핵심 이름이 다르면 핵심 이름끼리 점수를 넘지 않고 ('남포삼거리' ≠ '흑포삼거리'),
+    임계값 미만이어도 핵심 이름이 같고 그 핵심 이름의 정식 교차로가 1곳이면 CORE_SCORE.
+    """
+    score = name_similarity(name, canonical_name)
+    norm, canonical_norm = normalize_name(name), normalize_name(canonical_name)
+    core, canonical_core = _core(norm), _core(canonical_norm)
+    if core != norm and canonical_core != canonical_norm and core != canonical_core:
+        score = min(score, name_similarity(core, canonical_core))
+    elif score < index['threshold'] and core and core == canonical_core and core in index['names']['cores']:
+        score = CORE_SCORE
+    return score
+
+
+def _core(norm: str) -> str:
+    core = ROAD_SUFFIX_RE.sub('', norm)
+    return core if len(core) >= 2 else ''
+
+
+# ── 소스별 항목 ──
+
+def canonical_items(output_dir) -> list[tuple[str, str]]:
+    """classify 결과의 (ID, 이름). _manifest.json 우선, 없으면 master.json."""
+    output_dir = Path(output_dir)
+    for path, extract in (
+        (output_dir / MANIFEST_NAME,
+         lambda d: [(e['id'], name) for name, e in d.get('intersections', {}).items()]),
+        (output_dir / 'master.json',
+         lambda d: [(e['id'], e['name']) for e in d.get('intersections', ())]),
+    ):
+        data = _read_json(path)
+        if data:
+            items = extract(data)
+            if items:
+                return items
+    return []
+
+
+def pdf_entries(nodes_path) -> Optional[list[dict]]:
+    nodes = _read_json(nodes_path)
+    if nodes is None:
+        return None
+    return [{'key': n['code'], 'name': n.get('name')} for n in nodes]
+
+
+def yodo_entries(routes_path) -> Optional[list[dict]]:
+    """요도/routes.json graph 노드 (db_id 힌트)."""
+    data = _read_json(routes_path)
+    if not data or data.get('format') != 'graph':
+        return None
+    return [{'key': n['id'], 'name': n.get('name'), 'hint': n.get('db_id')} for n in data['nodes']]
+
+
+def route_entries(routes_path) -> Optional[list[dict]]:
+    """routes.json 노선 목록의 제어기 ID (자기 자신이 힌트)."""
+    data = _read_json(routes_path)
+    if not data or 'routes' not in data:
+        return None
+    entries = {}
+    for route in data['routes']:
+        for cid, name in zip(route.get('controllers', ()), route.get('intersection_names', ())):
+            entries.setdefault(cid, {'key': cid, 'name': name, 'hint': cid})
+    return list(entries.values())
+
+
+def match_entries(match_index: Optional[dict]) -> tuple[Optional[list], Optional[list]]:
+    """match_index (build_match_index/load_match_index) → (DAT 항목, 주기표 항목)."""
+    if not match_index:
+        return None, None
+    dat = [{'key': e['path'], 'name': group}
+           for group, items in match_index['dat']['groups'].items()
+           for e in items if e.get('path')]
+    dat_of_cycle = {}
+    for dat_name, cycle_name in match_index['links'].items():
+        dat_of_cycle.setdefault(cycle_name, dat_name)
+    cycle = [{'key': f'{e["source_file"]}#{e.get("sheet_name") or ""}',
+              'name': dat_of_cycle.get(group, group)}
+             for group, items in match_index['cycle']['groups'].items()
+             for e in items if e.get('source_file')]
+    return dat, cycle
+
+
+def update_identity_index(output_dir, pdf_nodes=None, routes=None, canonical=None,
+                          match_index=None, rebuild: bool = False) -> tuple[dict, dict]:
+    """{output_dir}/identity_index.json 을 바뀐 소스만 반영해 갱신·저장한다.
+
+    Args:
+        pdf_nodes: 이 도시의 pdf_extracted_nodes.json (None이면 pdf 소스 제외)
+        routes: 이 도시의 routes.json (None이면 routes 소스 제외)
+        canonical: [(ID, 이름)] (classify 실행 중이면 메모리 값, 기본: canonical_items())
+        match_index: 매칭 인덱스 (기본: {output_dir}/match_index.json)
+
+    Returns:
+        (인덱스, {소스: update_source 통계} (바뀐 것만, 정식 목록 변경은 'canonical': {},
+         제외되어 삭제된 소스는 {'dropped': 키 수}))
+    """
+    output_dir = Path(output_dir)
+    path = output_dir / IDENTITY_INDEX_NAME
+    index = None if rebuild else load_identity_index(path)
+    if index is None:
+        index = new_index()
+
+    changes = {}
+    if set_canonical(index, canonical if canonical is not None else canonical_items(output_dir)):
+        changes['canonical'] = {'count': len(index['canonical'])}
+
+    if match_index is None:
+        match_index = _read_json(output_dir / 'match_index.json')
+    dat, cycle = match_entries(match_index)
+    sources = {
+        'pdf': pdf_entries(pdf_nodes) if pdf_nodes else None,
+        'yodo': yodo_entries(output_dir / '요도' / 'routes.json'),
+        'routes': route_entries(routes) if routes else None,
+        'dat': dat,
+        'cycle': cycle,
+    }
+    for source in SOURCES:
+        if source in ('pdf', 'routes') and sources[source] is None:
+            # 지정하지 않은(또는 읽을 수 없는) 도시별 파일의 이전 연결은 남기지 않는다
+            dropped = index['sources'].pop(source, None)
+            if dropped is not None:
+                changes[source] = {'dropped': len(dropped['keys'])}
+            continue
+        if sources[source] is None:
+            continue
+        stats = update_source(index, source, sources[source])
+        if stats is not None:
+            changes[source] = stats
+
+    if changes or not path.exists():
+        save_identity_index(path, index)
+    return index, changes
+
+
+def _read_json(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def main():
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+    parser = argparse.ArgumentParser(description='교차로 식별 인덱스 (소스 키 → 정식 ID)')
+    parser.add_argument('--output-dir', default=None,
+                        help='classify 출력 폴더 (기본: 보령시_신호DB/)')
+    parser.add_argument('--pdf-nodes', default=None,
+                        help='이 도시의 PDF 노드 JSON (기본 출력 폴더일 때만 pdf_extracted_nodes.json)')
+    parser.add_argument('--routes', default=None,
+                        help='이 도시의 routes.json (기본 출력 폴더일 때만 프로젝트 루트 routes.json)')
+    parser.add_argument('--rebuild', action='store_true', help='저장된 인덱스를 무시하고 다시 구성')
+    parser.add_argument('--resolve', nargs=2, metavar=('SOURCE', 'KEY'), help='소스 키 조회')
+    parser.add_argument('--name', help='교차로명으로 조회')
+    parser.add_argument('--unresolved', action='store_true', help='연결 못 한 키 출력')
+    args = parser.parse_args()
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    if args.output_dir is None:
+        args.output_dir = str(project_root / '보령시_신호DB')
+        args.pdf_nodes = args.pdf_nodes or str(project_root / 'pdf_extracted_nodes.json')
+        args.routes = args.routes or str(project_root / 'routes.json')
+    index, changes = update_identity_index(args.output_dir, args.pdf_nodes, args.routes,
+                                           rebuild=args.rebuild)
+    if not index['canonical']:
+        print(f'❌ 정식 교차로 목록 없음: {args.output_dir} (classify.py 먼저 실행)')
+        sys.exit(1)
+
+    print(f'정식 교차로 {len(index["canonical"])}개'
+          f'{" (갱신)" if "canonical" in changes else ""}')
+    for source, data in index['sources'].items():
+        linked = sum(1 for v in data['keys'].values() if v is not None)
+        fuzzy = len(data['scores'])
+        stats = changes.get(source)
+        note = (f' ← 추가 {stats["added"]}, 변경 {stats["changed"]}, 삭제 {stats["removed"]}'
+                if stats else '')
+        print(f'  {source:7s} 키 {len(data["keys"]):4d}개, 연결 {linked}개 (유사 {fuzzy}개){note}')
+    for source, stats in changes.items():
+        if 'dropped' in stats:
+            print(f'  {source:7s} 경로 미지정 → 이전 연결 {stats["dropped"]}개 삭제')
+    print(f'  ✅ {Path(args.output_dir) / IDENTITY_INDEX_NAME}')
+
+    if args.resolve:
+        source, key = args.resolve
+        cid = resolve(index, source, key)
+        if cid is None:
+            print(f'\n  {source} {key}: 연결 없음')
+        else:
+            score = index['sources'][source]['scores'].get(key, 1.0)
+            print(f'\n  {source} {key} → {cid} {index["canonical"][cid]} (점수 {score:.2f})')
+            for s, keys in keys_for(index, cid).items():
+                print(f'    {s}: {", ".join(keys)}')
+    if args.name:
+        cid, score = resolve_name(index, args.name)
+        target = f'{cid} {index["canonical"][cid]}' if cid else '연결 없음'
+        print(f'\n  "{args.name}" → {target} (점수 {score:.2f})')
+    if args.unresolved:
+        for source, items in unresolved(index).items():
+            print(f'\n  [{source}] 연결 못 한 키 {len(items)}개')
+            for key, name in items:
+                print(f'    {key}  {name}')
+
+
+if __name__ == '__main__':
+    main()
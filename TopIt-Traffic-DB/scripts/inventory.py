@@ -0,0 +1,183 @@
+"""
+소스 파일 인벤토리 - DAT/주기표 소스 트리를 os.scandir로 한 번만 순회한다.
+
+classify의 모든 단계(목록, 변경 판별, 원본 보존)와 watch.py 폴링이 같은 인벤토리를 쓴다.
+  - 디렉토리당 scandir 1회, 파일 크기/수정시각은 DirEntry.stat() 결과를 그대로 사용
+    (Windows/SMB에서는 디렉토리 목록 응답에 포함되어 파일별 stat 왕복이 없음)
+  - POSIX(NFS/CIFS 마운트)에서는 DirEntry.stat()이 파일마다 서버 왕복이므로, 하위 폴더 목록과
+    stat을 I/O 스레드 풀(parallel_io.io_executor, 공유 풀이 있으면 그것)에 나눠 왕복 대기를 겹친다
+  - 한 소스 폴더가 다른 소스 폴더 안에 있으면 바깥 폴더만 순회
+  - 스킵 규칙(확장자, xlsx_parser.is_skipped_excel)은 여기서 한 번만 적용
+    스킵된 엑셀(요도/설계/DBSheet 등)은 파싱 대상이 아닐 뿐 원본 보존 대상이므로 'excel'로 분류
+
+항목: {'path': Path, 'size': int, 'mtime_ns': int, 'kind': 'dat'|'xlsx'|'excel'}
+
+정렬 순서는 기존 rglob 기반 목록과 같다:
+  dat          → 경로순
+  xlsx / excel → .xlsx 경로순, 이어서 .xls 경로순
+"""
+
+import os
+from concurrent.futures import FIRST_COMPLETED, wait
+from pathlib import Path
+from typing import Optional
+
+from parallel_io import io_executor
+from xlsx_parser import is_skipped_excel
+
+
+EXCEL_EXTS = ('.xlsx', '.xls')
+
+# 목록/stat 왕복을 겹칠 스레드 수 (지연 대기가 대부분이라 CPU 수보다 많이 둔다)
+WALK_WORKERS = 32
+
+# 스레드 작업 하나가 stat할 파일 수 (로컬 디스크에서 작업 제출 비용이 stat보다 커지지 않게)
+STAT_BATCH = 4
+
+# Windows는 DirEntry.stat()이 목록 응답에 들어 있어 왕복이 없으므로 순회 중에 바로 읽는다
+_STAT_IN_LISTING = os.name == 'nt'
+
+
+def build_inventory(dat_dir=None, xlsx_dir=None,
+                    workers: int = WALK_WORKERS) -> dict[str, list[dict]]:
+    """소스 트리를 순회하여 {'dat': [항목], 'xlsx': [항목], 'excel': [항목]} 을 반환한다.
+
+    Args:
+        dat_dir / xlsx_dir: 소스 폴더 (None이거나 없으면 해당 종류는 빈 목록)
+            'xlsx'(주기표 파싱 대상)와 'excel'(그 외 엑셀 원본)은 모두 xlsx_dir 아래에서 찾는다.
+        workers: 목록/stat 스레드 수 (parallel_io.shared_executor() 안에서는 공유 풀 사용)
+    """
+    # 호출자가 넘긴 경로 형태(상대/절대)를 유지하여 rglob 결과와 같은 경로를 만든다
+    roots = {}
+    if dat_dir is not None and os.path.isdir(dat_dir):
+        roots['dat'] = os.path.normpath(dat_dir)
+    if xlsx_dir is not None and os.path.isdir(xlsx_dir):
+        roots['xlsx'] = roots['excel'] = os.path.normpath(xlsx_dir)
+
+    inventory = {'dat': [], 'xlsx': [], 'excel': []}
+    walk_roots = _outermost(roots.values())
+    if not walk_roots:
+        return inventory
+
+    def wanted(entry, walk_root):
+        kind = classify_file(entry.name)
+        if kind is None or kind not in roots:
+            return None
+        root = roots[kind]
+        if root != walk_root and not _within(entry.path, root):
+            return None
+        return kind
+
+    with io_executor(workers) as pool:
+        # 폴더 목록과 stat 묶음을 모두 말단 작업으로 넣고, 완료되는 대로 하위 작업을 추가한다
+        pending = {pool.submit(_list_dir, root): ('dir', root) for root in walk_roots}
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                task, walk_root = pending.pop(future)
+                if task == 'stat':
+                    for item in future.result():
+                        inventory[item['kind']].append(item)
+                    continue
+                subdirs, files = future.result()
+                for subdir in subdirs:
+                    pending[pool.submit(_list_dir, subdir)] = ('dir', walk_root)
+                files = [(e, wanted(e, walk_root)) for e in files]
+                files = [(e, kind) for e, kind in files if kind]
+                if _STAT_IN_LISTING:
+                    for item in _stat_entries(files):
+                        inventory[item['kind']].append(item)
+                    continue
+                for i in range(0, len(files), STAT_BATCH):
+                    batch = files[i:i + STAT_BATCH]
+                    pending[pool.submit(_stat_entries, batch)] = ('stat', walk_root)
+
+    _sort(inventory)
+    return inventory
+
+
+def _list_dir(path: str) -> tuple[list[str], list[os.DirEntry]]:
+    """폴더 1개 목록 → (하위 폴더 경로, 파일 항목). 심볼릭 링크 폴더는 따라가지 않는다 (rglob과 동일)."""
+    subdirs, files = [], []
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.path)
+                    elif entry.is_file():
+                        files.append(entry)
+                except OSError:
+                    continue  # 순회 중 삭제/권한 오류
+    except OSError:
+        pass
+    return subdirs, files
+
+
+def _stat_entries(files: list[tuple[os.DirEntry, str]]) -> list[dict]:
+    """(항목, 종류) 목록의 크기/수정시각을 읽어 인벤토리 항목으로 만든다."""
+    items = []
+    for entry, kind in files:
+        try:
+            st = entry.stat()
+        except OSError:
+            continue  # 순회 중 삭제됨
+        items.append({
+            'path': Path(entry.path),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'kind': kind,
+        })
+    return items
+
+
+def add_entries(inventory: dict[str, list[dict]], entries: list[dict]):
+    """순회하지 않은 항목(이전 매니페스트에서 이어받은 파일 등)을 더하고 정렬 순서를 맞춘다."""
+    for entry in entries:
+        inventory[entry['kind']].append(entry)
+    _sort(inventory)
+
+
+def _sort(inventory: dict[str, list[dict]]):
+    inventory['dat'].sort(key=lambda e: e['path'])
+    for kind in ('xlsx', 'excel'):
+        inventory[kind].sort(key=lambda e: (_excel_rank(e['path'].name), e['path']))
+
+
+def classify_file(filename: str) -> Optional[str]:
+    """파일명으로 종류를 판별한다 (dat / xlsx: 주기표 / excel: 파싱 제외 엑셀). 대상이 아니면 None.
+
+    확장자 대소문자 처리는 플랫폼 규칙을 따른다 (Windows는 구분 없음, rglob과 동일).
+    """
+    name = os.path.normcase(filename)
+    if name.endswith('.dat'):
+        return 'dat'
+    if name.endswith(EXCEL_EXTS):
+        if filename.startswith('~$'):
+            return None  # 열려 있는 문서의 임시 잠금 파일
+        return 'excel' if is_skipped_excel(filename) else 'xlsx'
+    return None
+
+
+def paths(inventory: dict, kind: str) -> list[Path]:
+    return [e['path'] for e in inventory.get(kind, [])]
+
+
+def _outermost(roots) -> list[str]:
+    """다른 루트에 포함되는 루트를 제외한다 (중복 순회 방지)."""
+    unique = sorted(set(roots), key=len)
+    result = []
+    for root in unique:
+        if not any(_within(root, outer) for outer in result):
+            result.append(root)
+    return result
+
+
+def _within(path: str, root: str) -> bool:
+    path = os.path.normcase(path)
+    root = os.path.normcase(root)
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def _excel_rank(filename: str) -> int:
+    return 0 if os.path.normcase(filename).endswith('.xlsx') else 1
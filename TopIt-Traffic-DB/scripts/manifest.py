@@ -0,0 +1,161 @@
+"""
+분류 실행 매니페스트 - 이전 classify.py 실행의 입력/해시/출력을 기록하여 증분 재실행을 지원한다.
+
+{output_dir}/_manifest.json 구조:
+  {
+    'version': 1,
+    'created': 'YYYY-MM-DD HH:MM:SS',
+    'sources': {'dat_dir': str, 'xlsx_dir': str},
+    'inputs': {경로: {'kind': 'dat'|'xlsx'|'excel', 'size', 'mtime_ns', 'sha256'}},
+    'parsed': {경로: 파싱 결과},        ← dat: dict, xlsx: list[dict] (시트별)
+    'intersections': {교차로명: {'id', 'dir', 'fingerprint'}},
+    'master': fingerprint,
+  }
+
+변경 판별:
+  - 크기 + 수정시각(ns)이 같으면 이전 sha256 재사용 (해시 재계산 생략)
+  - 다르면 sha256 재계산 → 내용이 같으면 변경 아님 (touch만 된 경우)
+"""
+
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+from parallel_io import atomic_write_json
+
+
+MANIFEST_NAME = '_manifest.json'
+MANIFEST_VERSION = 1
+
+HASH_CHUNK = 1 << 20
+
+
+def load_manifest(output_dir: Path) -> Optional[dict]:
+    """이전 실행 매니페스트를 읽는다. 없거나 버전이 다르면 None."""
+    path = Path(output_dir) / MANIFEST_NAME
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if manifest.get('version') != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+def save_manifest(output_dir: Path, manifest: dict):
+    """매니페스트를 저장한다."""
+    manifest['version'] = MANIFEST_VERSION
+    manifest['created'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    atomic_write_json(Path(output_dir) / MANIFEST_NAME, manifest, indent=None)
+
+
+# 소스 폴더 키 → 그 폴더에서 찾는 입력 종류
+SOURCE_KINDS = {'dat_dir': ('dat',), 'xlsx_dir': ('xlsx', 'excel')}
+
+
+def carried_inputs(previous: dict, sources: dict) -> Optional[dict]:
+    """한쪽만 스캔하는 실행(--dat-only/--xlsx-only)이 이전 실행에서 이어받을 반대쪽 입력.
+
+    스캔하는 쪽 폴더가 이전 실행과 같을 때만 이어받는다. 스캔하지 않는 쪽은 이전 실행의
+    파일 목록/시그니처/파싱 결과를 그대로 써서 출력에서 빠지지 않게 한다.
+
+    Returns:
+        {경로: 시그니처} (이전 실행에도 그쪽 입력이 없으면 빈 dict), 이어받을 수 없으면 None
+    """
+    prev_sources = previous.get('sources') or {}
+    skipped = [key for key, root in sources.items() if root is None]
+    if not skipped or any(root != prev_sources.get(key) for key, root in sources.items() if root is not None):
+        return None
+    kinds = {kind for key in skipped for kind in SOURCE_KINDS[key]}
+    return {path: sig for path, sig in previous.get('inputs', {}).items() if sig['kind'] in kinds}
+
+
+def file_sha256(path) -> str:
+    """파일 내용의 sha256 hex digest."""
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        while True:
+            chunk = f.read(HASH_CHUNK)
+            if not chunk:
+                break
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def file_signature(path, kind: str, previous: Optional[dict] = None,
+                   size: Optional[int] = None, mtime_ns: Optional[int] = None) -> dict:
+    """입력 파일 시그니처 (크기/수정시각/해시). 크기·시각이 같으면 이전 해시를 재사용한다.
+
+    size/mtime_ns 를 주면 (inventory 순회 결과) stat을 다시 하지 않는다.
+    """
+    if size is None or mtime_ns is None:
+        st = os.stat(path)
+        size, mtime_ns = st.st_size, st.st_mtime_ns
+    if (previous and previous.get('size') == size
+            and previous.get('mtime_ns') == mtime_ns):
+        sha = previous['sha256']
+    else:
+        sha = file_sha256(path)
+    return {
+        'kind': kind,
+        'size': size,
+        'mtime_ns': mtime_ns,
+        'sha256': sha,
+    }
+
+
+def collect_inputs(inventory: dict[str, list[dict]], previous: Optional[dict]) -> tuple[dict, set]:
+    """현재 입력 파일 시그니처와 이전 실행 대비 변경된 경로 집합을 반환한다.
+
+    Args:
+        inventory: inventory.build_inventory() 결과 {'dat': [항목], 'xlsx': [항목], 'excel': [항목]}
+        previous: 이전 매니페스트 (없으면 모든 파일이 변경으로 취급됨)
+
+    Returns:
+        (inputs, changed) — changed는 추가/수정/삭제된 경로(str) 집합
+    """
+    prev_inputs = previous.get('inputs', {}) if previous else {}
+    inputs = {}
+    changed = set()
+
+    for kind, entries in inventory.items():
+        for entry in entries:
+            key = str(entry['path'])
+            prev = prev_inputs.get(key)
+            sig = file_signature(entry['path'], kind, prev, entry['size'], entry['mtime_ns'])
+            inputs[key] = sig
+            if prev is None or prev.get('sha256') != sig['sha256'] or prev.get('kind') != kind:
+                changed.add(key)
+
+    changed.update(set(prev_inputs) - set(inputs))
+    return inputs, changed
+
+
+def outputs_intact(output_dir: Path, manifest: dict) -> bool:
+    """매니페스트에 기록된 출력(master.json, 교차로별 info.json)이 모두 존재하는지 확인한다."""
+    output_dir = Path(output_dir)
+    if not (output_dir / 'master.json').exists():
+        return False
+    for entry in manifest.get('intersections', {}).values():
+        if not (output_dir / entry['dir'] / 'info.json').exists():
+            return False
+    return True
+
+
+def safe_dirname(name: str) -> str:
+    """교차로명 → 파일시스템에 안전한 폴더명 (매니페스트 'dir' 의 마지막 요소)."""
+    # 파일시스템에서 사용 불가한 문자 제거
+    safe = re.sub(r'[<>:"/\\|?*]', '', name)
+    safe = safe.strip('. ')
+    return safe if safe else 'unnamed'
+
+
+def fingerprint(obj) -> str:
+    """JSON 직렬화 가능한 객체의 내용 지문 (키 정렬)."""
+    data = json.dumps(obj, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode('utf-8')).hexdigest()
@@ -0,0 +1,240 @@
+"""
+매칭 감사 - DAT 교차로명 × 주기표 시트명 전체 유사도 행렬을 일괄 계산한다.
+
+matcher.name_similarity()와 동일한 점수를 내지만, 정규화 이름을 정수 배열로
+인코딩하여 편집거리/포함관계를 모든 쌍에 대해 배열 연산으로 계산한다.
+메모리 사용량은 chunk 단위(행 묶음)로 제한한다.
+
+점수 규칙 (name_similarity와 동일):
+  1. 빈 이름 → 0.0
+  2. 정확 일치 → 1.0
+  3. 포함 관계 → 짧은쪽/긴쪽 × 0.95
+  4. 별칭 → 0.9
+  5. 편집거리 → 1 - 거리/최대길이
+
+numpy 미설치 시 name_similarity 이중 루프로 대체한다.
+"""
+
+from matcher import ALIASES, name_similarity, normalize_name
+
+# numpy는 similarity_matrix() 첫 호출 시 로드한다 (classify 시작 시간 단축)
+np = None
+_np_checked = False
+
+
+def _load_numpy():
+    global np, _np_checked
+    if not _np_checked:
+        _np_checked = True
+        try:
+            import numpy
+            np = numpy
+        except ImportError:
+            np = None
+    return np
+
+
+# 경계 구간: 이 범위의 쌍은 분류보고서 "수동 확인 필요"에 노출
+BORDERLINE_LOW = 0.6
+BORDERLINE_HIGH = 0.85
+
+# chunk 당 DP 셀 수 상한 (행 수 × 열 수 × (최대길이+1))
+MAX_CHUNK_CELLS = 4_000_000
+
+
+def similarity_matrix(names_a: list[str], names_b: list[str],
+                      max_chunk_cells: int = MAX_CHUNK_CELLS):
+    """names_a × names_b 유사도 행렬을 반환한다.
+
+    Returns:
+        numpy 설치 시 float64 ndarray (len(names_a), len(names_b)),
+        미설치 시 list[list[float]]
+    """
+    if _load_numpy() is None:
+        return [[name_similarity(a, b) for b in names_b] for a in names_a]
+
+    norms_a = [normalize_name(n) if n else '' for n in names_a]
+    norms_b = [normalize_name(n) if n else '' for n in names_b]
+    if not norms_a or not norms_b:
+        return np.zeros((len(norms_a), len(norms_b)))
+
+    codes_a, len_a, codes_b, len_b = _encode(norms_a, norms_b)
+    alias_a = _alias_membership(norms_a)
+    alias_b = _alias_membership(norms_b)
+
+    width = codes_b.shape[1] + 1
+    rows = max(1, max_chunk_cells // (len(norms_b) * width))
+
+    result = np.empty((len(norms_a), len(norms_b)))
+    for start in range(0, len(norms_a), rows):
+        stop = min(start + rows, len(norms_a))
+        dist, common = _edit_and_common(codes_a[start:stop], len_a[start:stop],
+                                        codes_b, len_b)
+        result[start:stop] = _score(
+            len_a[start:stop], len_b, dist, common,
+            (alias_a[start:stop] @ alias_b.T) > 0,
+        )
+    return result
+
+
+def borderline_pairs(names_a: list[str], names_b: list[str],
+                     low: float = BORDERLINE_LOW,
+                     high: float = BORDERLINE_HIGH) -> list[tuple[str, str, float]]:
+    """유사도가 [low, high) 구간인 (DAT명, 주기표명, 점수) 목록을 점수 내림차순으로 반환한다.
+
+    수동 확인이 필요 없는 쌍은 뺀다:
+      - 두 이름 모두 상대편에 정확 일치(1.0) 이름이 이미 있는 쌍
+      - 같은 두 이름이 양쪽에 모두 있어 (A, B)·(B, A)로 두 번 나오는 쌍 → 먼저 나온 것 하나만
+    """
+    names_a = list(dict.fromkeys(n for n in names_a if n))
+    names_b = list(dict.fromkeys(n for n in names_b if n))
+    matrix = similarity_matrix(names_a, names_b)
+
+    if np is None:
+        exact_a = {a for a, row in zip(names_a, matrix) if 1.0 in row}
+        exact_b = {b for j, b in enumerate(names_b) if any(row[j] == 1.0 for row in matrix)}
+        pairs = [
+            (a, b, score)
+            for a, row in zip(names_a, matrix)
+            for b, score in zip(names_b, row)
+            if low <= score < high
+        ]
+    else:
+        exact = matrix == 1.0
+        exact_a = {names_a[i] for i in np.nonzero(exact.any(axis=1))[0]}
+        exact_b = {names_b[j] for j in np.nonzero(exact.any(axis=0))[0]}
+        ia, ib = np.nonzero((matrix >= low) & (matrix < high))
+        pairs = [(names_a[i], names_b[j], float(matrix[i, j])) for i, j in zip(ia, ib)]
+
+    pairs.sort(key=lambda p: (-p[2], p[0], p[1]))
+    result = []
+    seen = set()
+    for a, b, score in pairs:
+        if a in exact_a and b in exact_b:
+            continue
+        key = frozenset((a, b))
+        if key in seen:
+            continue
+        seen.add(key)
+        result.append((a, b, score))
+    return result
+
+
+# ── 내부 구현 ──
+
+def _encode(norms_a: list[str], norms_b: list[str]):
+    """문자를 정수 코드로 변환하고 패딩한다. 패딩 값은 양쪽이 달라 절대 일치하지 않는다."""
+    alphabet = {}
+    for n in norms_a + norms_b:
+        for ch in n:
+            alphabet.setdefault(ch, len(alphabet))
+
+    def encode(norms, pad):
+        lengths = np.array([len(n) for n in norms], dtype=np.int64)
+        codes = np.full((len(norms), max(1, int(lengths.max()))), pad, dtype=np.int32)
+        for i, n in enumerate(norms):
+            codes[i, :len(n)] = [alphabet[ch] for ch in n]
+        return codes, lengths
+
+    codes_a, len_a = encode(norms_a, -1)
+    codes_b, len_b = encode(norms_b, -2)
+    return codes_a, len_a, codes_b, len_b
+
+
+def _edit_and_common(codes_a, len_a, codes_b, len_b):
+    """모든 쌍의 레벤슈타인 거리와 최장 공통 부분문자열 길이를 계산한다.
+
+    행(a의 문자) 단위로 DP를 진행하며 각 단계는 (a 수, b 수) 배열 연산이다.
+    거리는 a의 실제 길이에 도달한 행에서 b의 실제 길이 열 값을 취한다.
+    """
+    n_a, max_a = codes_a.shape
+    n_b, max_b = codes_b.shape
+
+    # prev[:, :, j] = D[i-1][j]
+    prev = np.broadcast_to(np.arange(max_b + 1, dtype=np.int32), (n_a, n_b, max_b + 1)).copy()
+    dist = np.where(len_a[:, None] == 0, len_b[None, :], 0).astype(np.int32)
+    run_prev = np.zeros((n_a, n_b, max_b + 1), dtype=np.int32)
+    common = np.zeros((n_a, n_b), dtype=np.int32)
+    col_b = len_b[None, :, None]
+
+    for i in range(max_a):
+        eq = codes_a[:, i][:, None, None] == codes_b[None, :, :]   # (n_a, n_b, max_b)
+
+        # 최장 공통 부분문자열 (대각 연속 일치 길이)
+        run = np.zeros_like(run_prev)
+        run[:, :, 1:] = np.where(eq, run_prev[:, :, :-1] + 1, 0)
+        common = np.maximum(common, run.max(axis=2))
+        run_prev = run
+
+        # 편집거리 한 행
+        curr = np.empty_like(prev)
+        curr[:, :, 0] = i + 1
+        sub = prev[:, :, :-1] + (~eq)
+        dele = prev[:, :, 1:] + 1
+        best = np.minimum(sub, dele)
+        for j in range(max_b):
+            curr[:, :, j + 1] = np.minimum(best[:, :, j], curr[:, :, j] + 1)
+        prev = curr
+
+        done = len_a == i + 1
+        if done.any():
+            dist[done] = np.take_along_axis(
+                curr[done], np.broadcast_to(col_b, (int(done.sum()), n_b, 1)), axis=2
+            )[:, :, 0]
+
+    return dist, common
+
+
+def _alias_membership(norms: list[str]):
+    """(이름 수, 별칭 그룹 수) 0/1 행렬."""
+    groups = [
+        {normalize_name(a) for a in aliases + [canonical]}
+        for canonical, aliases in ALIASES.items()
+    ]
+    member = np.zeros((len(norms), len(groups)), dtype=np.int32)
+    for i, n in enumerate(norms):
+        for g, group in enumerate(groups):
+            if n in group:
+                member[i, g] = 1
+    return member
+
+
+def _score(len_a, len_b, dist, common, alias):
+    la = len_a[:, None].astype(np.float64)
+    lb = len_b[None, :].astype(np.float64)
+    shorter = np.minimum(la, lb)
+    longer = np.maximum(la, lb)
+    empty = (la == 0) | (lb == 0)
+    safe_longer = np.where(longer == 0, 1.0, longer)
+
+    contained = common == shorter
+    exact = contained & (la == lb)
+
+    score = np.maximum(0.0, 1.0 - dist / safe_longer)
+    score = np.where(alias, 0.9, score)
+    score = np.where(contained, shorter / safe_longer * 0.95, score)
+    score = np.where(exact, 1.0, score)
+    return np.where(empty, 0.0, score)
+
+
+if __name__ == '__main__':
+    import sys
+    import time
+
+    from dat_parser import scan_dat_directory
+    from xlsx_parser import scan_excel_directory
+
+    if len(sys.argv) < 3:
+        print('사용법: python match_audit.py <DAT 디렉토리> <주기표 디렉토리>')
+        sys.exit(1)
+
+    dat_names = [d['intersection_name'] for d in scan_dat_directory(sys.argv[1])]
+    cycle_names = [c['intersection_name'] for c in scan_excel_directory(sys.argv[2])]
+
+    start = time.perf_counter()
+    pairs = borderline_pairs(dat_names, cycle_names)
+    elapsed = time.perf_counter() - start
+
+    print(f'경계 유사도 쌍 {len(pairs)}개 ({BORDERLINE_LOW:.2f}~{BORDERLINE_HIGH:.2f}, {elapsed:.2f}s)')
+    for a, b, score in pairs:
+        print(f'  {score:.2f}  "{a}" ↔ "{b}"')
@@ -12,9 +12,16 @@
   - 날짜: 최신 수정일 우선
   - 파일 크기: 14,784B 우선
   - 파일명: 깔끔한 이름 우선
+
+증분 매칭:
+  - build_match_index(): 그룹/정규화 이름/n-gram 인덱스를 구성
+  - save_match_index() / load_match_index(): match_index.json 영속화
+  - match_one(): 신규 DAT/주기표 1건을 전체 재실행 없이 매칭하고 인덱스 갱신
 """
 
+import json
 import re
+from functools import lru_cache
 from typing import Optional
 
 
@@ -38,6 +45,8 @@ ALIASES = {
 }
 
 
+# watch 데몬처럼 오래 도는 프로세스에서도 메모리가 늘지 않도록 상한을 둔다
+@lru_cache(maxsize=4096)
 def normalize_name(name: str) -> str:
     """교차로명을 정규화한다."""
     if not name:
@@ -104,8 +113,7 @@ def name_similarity(name1: str, name2: str) -> float:
         return shorter / longer * 0.95
 
     # 별칭 확인
-    for canonical, aliases in ALIASES.items():
-        norm_aliases = [normalize_name(a) for a in aliases + [canonical]]
+    for norm_aliases in _alias_groups():
         if n1 in norm_aliases and n2 in norm_aliases:
             return 0.9
 
@@ -117,6 +125,25 @@ def name_similarity(name1: str, name2: str) -> float:
     return max(0.0, similarity)
 
 
+@lru_cache(maxsize=1)
+def _alias_groups() -> tuple[frozenset, ...]:
+    """ALIASES를 정규화된 이름 집합 목록으로 변환한다 (1회 계산)."""
+    return tuple(
+        frozenset(normalize_name(a) for a in aliases + [canonical])
+        for canonical, aliases in ALIASES.items()
+    )
+
+
+def _confidence(score: float, dat_name: str, cycle_name: str) -> tuple[str, str]:
+    """유사도 점수를 (신뢰도, 매칭 근거)로 변환한다."""
+    if score >= 0.95:
+        return 'high', f'교차로명 정확 매칭 (유사도: {score:.2f})'
+    elif score >= 0.8:
+        return 'medium', f'교차로명 유사 매칭 (유사도: {score:.2f}, DAT: "{dat_name}" ↔ 주기표: "{cycle_name}")'
+    else:
+        return 'low', f'교차로명 부분 매칭 (유사도: {score:.2f}, DAT: "{dat_name}" ↔ 주기표: "{cycle_name}")'
+
+
 def match_dat_to_cycles(dat_entries: list[dict], cycle_entries: list[dict],
                          threshold: float = 0.7) -> list[dict]:
     """DAT 파싱 결과와 주기표 시트 정보를 매칭한다.
@@ -196,16 +223,8 @@ def match_dat_to_cycles(dat_entries: list[dict], cycle_entries: list[dict],
             result['cycle_files'] = cycle_list
             result['selected_cycle'] = cycle_list[0]  # 첫번째 사용
             used_cycles.add(cycle_name)
-
-            if best_score >= 0.95:
-                result['match_confidence'] = 'high'
-                result['match_details'] = f'교차로명 정확 매칭 (유사도: {best_score:.2f})'
-            elif best_score >= 0.8:
-                result['match_confidence'] = 'medium'
-                result['match_details'] = f'교차로명 유사 매칭 (유사도: {best_score:.2f}, DAT: "{dat_name}" ↔ 주기표: "{cycle_name}")'
-            else:
-                result['match_confidence'] = 'low'
-                result['match_details'] = f'교차로명 부분 매칭 (유사도: {best_score:.2f}, DAT: "{dat_name}" ↔ 주기표: "{cycle_name}")'
+            result['match_confidence'], result['match_details'] = _confidence(
+                best_score, dat_name, cycle_name)
         else:
             result['match_details'] = '주기표 매칭 없음'
 
@@ -261,55 +280,88 @@ def match_dat_to_cycles(dat_entries: list[dict], cycle_entries: list[dict],
 
 def _group_by_intersection(entries: list[dict], key: str) -> dict[str, list[dict]]:
     """교차로명 기준으로 그룹화한다. 정규화된 이름으로 그룹핑하되 원래 이름을 대표로 사용."""
+    section = _build_section(entries, key)
     groups: dict[str, list[dict]] = {}
-    norm_to_canonical: dict[str, str] = {}
+    if section['unnamed']:
+        groups[None] = section['unnamed']
+    groups.update(section['groups'])
+    return groups
+
+
+def _build_section(entries: list[dict], key: str) -> dict:
+    """항목을 그룹화하여 인덱스 섹션(그룹, 정규화 이름, n-gram)을 만든다."""
+    section = _empty_section()
 
     for entry in entries:
         name = entry.get(key)
-        if not name:
-            groups.setdefault(None, []).append(entry)
-            continue
-
-        norm = normalize_name(name)
+        norm = normalize_name(name) if name else ''
         if not norm:
-            groups.setdefault(None, []).append(entry)
+            section['unnamed'].append(entry)
             continue
+        _assign_group(section, norm, name).append(entry)
 
-        # 기존 그룹에서 정확 일치 또는 유사한 이름 찾기
-        matched_key = None
-        if norm in norm_to_canonical:
-            matched_key = norm_to_canonical[norm]
-        else:
-            # 정규화 이름의 포함 관계 확인 (더 공격적 매칭)
-            for existing_norm, canonical in norm_to_canonical.items():
-                if not existing_norm:
-                    continue
-                # 정규화 이름이 동일
-                if norm == existing_norm:
-                    matched_key = canonical
-                    norm_to_canonical[norm] = canonical
-                    break
-                # 한쪽이 다른쪽을 포함하고 길이 차이가 작음
-                if (norm in existing_norm or existing_norm in norm):
-                    shorter = min(len(norm), len(existing_norm))
-                    longer = max(len(norm), len(existing_norm))
-                    if shorter >= 2 and shorter / longer >= 0.7:
-                        matched_key = canonical
-                        norm_to_canonical[norm] = canonical
-                        break
-                # 편집거리 기반
-                if name_similarity(norm, existing_norm) >= 0.85:
+    return section
+
+
+def _empty_section() -> dict:
+    return {'groups': {}, 'norms': {}, 'ngrams': {}, 'unnamed': []}
+
+
+def _ngrams(norm: str) -> set[str]:
+    """후보 검색용 n-gram: 문자 bigram + 첫 글자 앵커."""
+    if not norm:
+        return set()
+    grams = {norm[i:i + 2] for i in range(len(norm) - 1)}
+    grams.add('^' + norm[0])
+    return grams
+
+
+def _index_norm(section: dict, norm: str, canonical: str):
+    section['norms'][norm] = canonical
+    for gram in _ngrams(norm):
+        section['ngrams'].setdefault(gram, []).append(norm)
+
+
+def _candidate_norms(norm: str, section: dict) -> list[str]:
+    """n-gram 또는 별칭을 공유하는 기존 정규화 이름 (등록 순서 유지)."""
+    found = set()
+    for gram in _ngrams(norm):
+        found.update(section['ngrams'].get(gram, ()))
+    renorm = normalize_name(norm)
+    for norm_aliases in _alias_groups():
+        if norm in norm_aliases or renorm in norm_aliases:
+            found.update(norm_aliases)
+    return [n for n in section['norms'] if n in found]
+
+
+def _assign_group(section: dict, norm: str, name: str) -> list[dict]:
+    """정규화 이름이 속할 그룹을 찾고, 없으면 새 그룹을 만든다. 그룹 리스트를 반환."""
+    norms = section['norms']
+
+    # 기존 그룹에서 정확 일치 또는 유사한 이름 찾기
+    matched_key = norms.get(norm)
+    if matched_key is None:
+        # 정규화 이름의 포함 관계 확인 (더 공격적 매칭)
+        for existing_norm in _candidate_norms(norm, section):
+            canonical = norms[existing_norm]
+            # 한쪽이 다른쪽을 포함하고 길이 차이가 작음
+            if norm in existing_norm or existing_norm in norm:
+                shorter = min(len(norm), len(existing_norm))
+                longer = max(len(norm), len(existing_norm))
+                if shorter >= 2 and shorter / longer >= 0.7:
                     matched_key = canonical
-                    norm_to_canonical[norm] = canonical
                     break
+            # 편집거리 기반
+            if name_similarity(norm, existing_norm) >= 0.85:
+                matched_key = canonical
+                break
 
-        if matched_key:
-            groups[matched_key].append(entry)
-        else:
-            norm_to_canonical[norm] = name
-            groups[name] = [entry]
+        if matched_key is None:
+            matched_key = name
+            section['groups'][name] = []
+        _index_norm(section, norm, matched_key)
 
-    return groups
+    return section['groups'][matched_key]
 
 
 def _select_best_dat(dat_list: list[dict]) -> Optional[dict]:
@@ -336,10 +388,276 @@ def _select_best_dat(dat_list: list[dict]) -> Optional[dict]:
     return sorted_list[0]
 
 
+# ── 영속 매칭 인덱스 (증분 매칭) ──
+
+MATCH_INDEX_VERSION = 1
+
+# 인덱스에 보존하는 항목 필드 (전체 파싱 결과 대신 경량 참조)
+_DAT_REF_KEYS = ('path', 'filename', 'size', 'manufacturer', 'date_modified',
+                 'intersection_name', 'intersection_number')
+_CYCLE_REF_KEYS = ('source_file', 'source_filename', 'sheet_name',
+                   'intersection_name', 'intersection_number')
+
+
+def build_match_index(dat_entries: list[dict], cycle_entries: list[dict],
+                      matches: list[dict], threshold: float = 0.7) -> dict:
+    """전체 매칭 결과로부터 증분 매칭용 인덱스를 구성한다.
+
+    Args:
+        dat_entries / cycle_entries: match_dat_to_cycles()에 넘긴 입력
+        matches: match_dat_to_cycles() 결과 (DAT 그룹 ↔ 주기표 그룹 연결 정보)
+        threshold: match_one()에서 사용할 매칭 임계값
+
+    Returns:
+        {
+            'version': int,
+            'threshold': float,
+            'dat':   {'groups', 'norms', 'ngrams', 'unnamed'},
+            'cycle': {'groups', 'norms', 'ngrams', 'unnamed'},
+            'links': {DAT 그룹명: 주기표 그룹명},
+            'cycle_numbers': {번호(str): 주기표 그룹명},
+        }
+    """
+    dat_section = _build_section(dat_entries, 'intersection_name')
+    cycle_section = _build_section(cycle_entries, 'intersection_name')
+
+    cycle_owner = {
+        id(c): name
+        for name, cycle_list in cycle_section['groups'].items()
+        for c in cycle_list
+    }
+
+    links = {}
+    for m in matches:
+        if m['dat_files'] and m['cycle_files']:
+            owner = cycle_owner.get(id(m['cycle_files'][0]))
+            if owner is not None:
+                links[m['intersection_name']] = owner
+
+    # 번호 기반 폴백 (match_dat_to_cycles와 동일: 먼저 나온 항목 우선)
+    cycle_numbers = {}
+    for c in cycle_entries:
+        number = c.get('intersection_number')
+        if number is None or str(number) in cycle_numbers:
+            continue
+        if c.get('intersection_name') in cycle_section['groups']:
+            cycle_numbers[str(number)] = c['intersection_name']
+
+    return {
+        'version': MATCH_INDEX_VERSION,
+        'threshold': threshold,
+        'dat': dat_section,
+        'cycle': cycle_section,
+        'links': links,
+        'cycle_numbers': cycle_numbers,
+    }
+
+
+def save_match_index(index: dict, path: str):
+    """매칭 인덱스를 JSON으로 저장한다 (항목은 경량 참조로 축약)."""
+    data = dict(index)
+    for kind, keys in (('dat', _DAT_REF_KEYS), ('cycle', _CYCLE_REF_KEYS)):
+        section = index[kind]
+        data[kind] = {
+            'groups': {
+                name: [_entry_ref(e, keys) for e in entries]
+                for name, entries in section['groups'].items()
+            },
+            'norms': section['norms'],
+            'ngrams': section['ngrams'],
+            'unnamed': [_entry_ref(e, keys) for e in section['unnamed']],
+        }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(data, f, ensure_ascii=False)
+
+
+def load_match_index(path: str) -> dict:
+    """저장된 매칭 인덱스를 읽는다. 버전이 다르면 ValueError."""
+    with open(path, 'r', encoding='utf-8') as f:
+        index = json.load(f)
+    if index.get('version') != MATCH_INDEX_VERSION:
+        raise ValueError(f'지원하지 않는 매칭 인덱스 버전: {index.get("version")}')
+    return index
+
+
+def match_one(index: dict, entry: dict) -> dict:
+    """DAT 파싱 결과 또는 주기표 시트 1건을 인덱스에 매칭하고 인덱스를 갱신한다.
+
+    전체 매칭을 다시 돌리지 않고 n-gram 후보만 비교하므로 수 ms 내에 끝난다.
+    이미 인덱스에 있는 파일(DAT는 path, 주기표는 source_file+sheet_name)은 기존 참조를 교체하므로
+    같은 항목을 여러 번 넣어도 결과가 같다.
+
+    Args:
+        index: build_match_index() 또는 load_match_index() 결과 (제자리 갱신)
+        entry: dat_parser.parse_dat() 결과 또는 xlsx_parser 시트 항목
+
+    Returns:
+        {
+            'kind': 'dat' | 'cycle',
+            'intersection_name': str|None,   # 대상 교차로 (DAT 그룹명 우선)
+            'group_name': str|None,          # 같은 종류 내 소속 그룹명
+            'matched_name': str|None,        # 반대편(주기표/DAT) 그룹명
+            'new_group': bool,
+            'score': float,
+            'match_confidence': str,         # high/medium/low
+            'match_details': str,
+        }
+    """
+    kind = 'cycle' if 'sheet_name' in entry else 'dat'
+    threshold = index.get('threshold', 0.7)
+    section = index[kind]
+    keys = _CYCLE_REF_KEYS if kind == 'cycle' else _DAT_REF_KEYS
+    _remove_ref(section, _ref_id(entry))
+
+    result = {
+        'kind': kind,
+        'intersection_name': None,
+        'group_name': None,
+        'matched_name': None,
+        'new_group': False,
+        'score': 0.0,
+        'match_confidence': 'low',
+        'match_details': '',
+    }
+
+    name = entry.get('intersection_name')
+    norm = normalize_name(name) if name else ''
+    if not norm:
+        section['unnamed'].append(_entry_ref(entry, keys))
+        result['match_details'] = '교차로명 추출 실패 (미분류)'
+        return result
+
+    group_count = len(section['groups'])
+    group = _assign_group(section, norm, name)
+    group.append(_entry_ref(entry, keys))
+    result['new_group'] = len(section['groups']) > group_count
+    group_name = section['norms'][norm]
+    result['group_name'] = group_name
+
+    if kind == 'dat':
+        _match_one_dat(index, group_name, group, threshold, result)
+    else:
+        # 번호 기반 폴백 등록 (build_match_index와 동일: 먼저 나온 항목 우선)
+        number = entry.get('intersection_number')
+        if number is not None:
+            index['cycle_numbers'].setdefault(str(number), group_name)
+        _match_one_cycle(index, group_name, threshold, result)
+
+    return result
+
+
+def _match_one_dat(index: dict, dat_name: str, dat_list: list[dict],
+                   threshold: float, result: dict):
+    result['intersection_name'] = dat_name
+
+    cycle_name = index['links'].get(dat_name)
+    if cycle_name is not None:
+        score = name_similarity(dat_name, cycle_name)
+    else:
+        score = 0.0
+        cycle_section = index['cycle']
+        for candidate in _candidate_groups(dat_name, cycle_section):
+            s = name_similarity(dat_name, candidate)
+            if s > score and s >= threshold:
+                score = s
+                cycle_name = candidate
+
+        # 번호 기반 폴백
+        number = dat_list[0].get('intersection_number')
+        if cycle_name is None and number is not None:
+            cycle_name = index['cycle_numbers'].get(str(number))
+            if cycle_name is not None:
+                score = 0.75
+
+        if cycle_name is not None:
+            index['links'][dat_name] = cycle_name
+
+    if cycle_name is None:
+        result['match_details'] = '주기표 매칭 없음'
+        return
+
+    result['matched_name'] = cycle_name
+    result['score'] = score
+    result['match_confidence'], result['match_details'] = _confidence(score, dat_name, cycle_name)
+
+
+def _match_one_cycle(index: dict, cycle_name: str, threshold: float, result: dict):
+    linked = [d for d, c in index['links'].items() if c == cycle_name]
+    if linked:
+        dat_name = linked[0]
+        score = name_similarity(dat_name, cycle_name)
+    else:
+        dat_name, score = None, 0.0
+        for candidate in _candidate_groups(cycle_name, index['dat']):
+            if candidate in index['links']:
+                continue
+            s = name_similarity(candidate, cycle_name)
+            if s > score and s >= threshold:
+                score = s
+                dat_name = candidate
+        if dat_name is not None:
+            index['links'][dat_name] = cycle_name
+
+    if dat_name is None:
+        result['intersection_name'] = cycle_name
+        result['match_details'] = 'DAT 파일 없음 (주기표만 존재)'
+        return
+
+    result['intersection_name'] = dat_name
+    result['matched_name'] = dat_name
+    result['score'] = score
+    result['match_confidence'], result['match_details'] = _confidence(score, dat_name, cycle_name)
+
+
+def _candidate_groups(name: str, section: dict) -> list[str]:
+    """다른 섹션에서 비교할 후보 그룹명 (n-gram/별칭 공유, 등록 순서)."""
+    norm = normalize_name(name)
+    seen = {}
+    for n in _candidate_norms(norm, section):
+        seen.setdefault(section['norms'][n], None)
+    return list(seen)
+
+
+def _entry_ref(entry: dict, keys: tuple) -> dict:
+    return {k: entry.get(k) for k in keys}
+
+
+def _ref_id(ref: dict) -> tuple:
+    """항목 식별 키: DAT는 path, 주기표는 (source_file, sheet_name)."""
+    if 'sheet_name' in ref:
+        return (ref.get('source_file'), ref.get('sheet_name'))
+    return (ref.get('path'),)
+
+
+def _remove_ref(section: dict, ref_id: tuple):
+    """섹션의 그룹/미분류 목록에서 같은 항목의 기존 참조를 뺀다 (그룹 자체는 유지)."""
+    for refs in (*section['groups'].values(), section['unnamed']):
+        refs[:] = [r for r in refs if _ref_id(r) != ref_id]
+
+
 if __name__ == '__main__':
+    import sys
+    import time
+
+    # 증분 매칭: python matcher.py <match_index.json> <파일.dat> [...]
+    if len(sys.argv) >= 3:
+        from dat_parser import parse_dat
+
+        index_path = sys.argv[1]
+        index = load_match_index(index_path)
+        for target in sys.argv[2:]:
+            start = time.perf_counter()
+            r = match_one(index, parse_dat(target))
+            elapsed = (time.perf_counter() - start) * 1000
+            print(json.dumps(r, ensure_ascii=False, indent=2))
+            print(f'  ({elapsed:.1f}ms)')
+        save_match_index(index, index_path)
+        sys.exit(0)
+
     # 단독 테스트용
     print('matcher.py - DAT ↔ 주기표 매칭 엔진')
     print('사용법: classify.py에서 호출됩니다.')
+    print('       python matcher.py <match_index.json> <파일.dat> ...  (증분 매칭)')
 
     # 유사도 테스트
     test_pairs = [
@@ -0,0 +1,210 @@
+"""
+요도 노드 추출 - 요도 PDF 텍스트에서 교차로 노드(번호, 이름, 좌표)를 만든다.
+
+사용법:
+    python scripts/node_extractor.py [PDF] [--page N] [--spans-file FILE] [--output FILE]
+                                     [--from-spans] [--symbols]
+
+기본값 (프로젝트 루트 기준):
+    PDF          : 프로젝트 루트의 *.pdf 중 첫 번째 (요도)
+    --spans-file : pdf_all_spans.json   (PDF 에서 읽은 텍스트 스팬, --from-spans 면 이 파일을 입력으로 사용)
+    --output     : pdf_extracted_nodes.json
+
+새 요도 PDF 개정판이 들어오면 이 스크립트 → edge_extractor.py 순으로 다시 실행한다.
+
+규칙 (기존 pdf_extracted_nodes.json 과 같은 결과):
+  1. 스팬: page.get_text('dict') 의 비어 있지 않은 스팬 (텍스트 공백 제거, 좌표 0.1pt 반올림)
+  2. 노드: 세 자리 숫자 스팬 = 제어기 번호, 스팬 중심 = node_cx/cy
+  3. 이름: 한글이 들어간 스팬 중 번호 중심에서 가장 가까운 것 (NAME_MAX_DIST 이내)
+     없으면 '(미확인)' / 이름 좌표 null
+  4. --symbols: 번호를 감싸는 채워진 사각형(라벨 박스)의 색/영역을 symbol_fill, symbol_rect 로 추가
+
+이름/라벨 박스는 spatial_index 격자로 찾으므로 스팬/도형 수에 비례하는 한 번의 순회로 끝난다.
+
+노드 항목:
+    {"code", "name", "node_cx", "node_cy", "name_cx", "name_cy"[, "symbol_fill", "symbol_rect"]}
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from parallel_io import atomic_write_json
+from spatial_index import PointGrid
+
+
+CODE_RE = re.compile(r'^\d{3}$')
+HANGUL_RE = re.compile(r'[가-힣]')
+
+UNKNOWN_NAME = '(미확인)'
+
+# 번호 중심 ↔ 이름 스팬 중심 최대 거리 (pt). 기존 요도의 최대 실측 17.8pt
+NAME_MAX_DIST = 25.0
+# 라벨 박스로 인정할 최대 크기 (pt)
+SYMBOL_MAX_SIZE = 30.0
+
+
+def extract_spans(pdf_path, page: int = 0) -> list[dict]:
+    """PDF 페이지의 텍스트 스팬 (pdf_all_spans.json 형식)."""
+    from pdf_geometry import open_pdf
+
+    with open_pdf(pdf_path) as doc:
+        text = doc[page].get_text('dict')
+
+    spans = []
+    for block in text['blocks']:
+        for line in block.get('lines', ()):
+            for s in line['spans']:
+                if not s['text'].strip():
+                    continue
+                x0, y0, x1, y1 = s['bbox']
+                spans.append({
+                    'text': s['text'].strip(),
+                    'x0': round(x0, 1),
+                    'y0': round(y0, 1),
+                    'x1': round(x1, 1),
+                    'y1': round(y1, 1),
+                    'cx': round((x0 + x1) / 2, 1),
+                    'cy': round((y0 + y1) / 2, 1),
+                    'size': round(s['size'], 1),
+                })
+    return spans
+
+
+def extract_nodes(spans: list[dict], geometry=None,
+                  name_max_dist: float = NAME_MAX_DIST) -> tuple[list[dict], list[str]]:
+    """스팬(+도형)에서 노드 목록을 만든다.
+
+    Args:
+        geometry: pdf_geometry.Geometry (주면 라벨 박스 symbol_fill/symbol_rect 추가)
+
+    Returns:
+        (번호순 노드 목록, 경고 목록)
+    """
+    warnings = []
+    codes = {}
+    for s in spans:
+        if CODE_RE.match(s['text']):
+            if s['text'] in codes:
+                warnings.append(f'번호 중복 {s["text"]}: ({s["cx"]}, {s["cy"]}) 무시')
+                continue
+            codes[s['text']] = s
+
+    names = [s for s in spans if HANGUL_RE.search(s['text'])]
+    name_grid = PointGrid((s['cx'], s['cy']) for s in names)
+    symbols = _symbol_boxes(geometry) if geometry is not None else None
+
+    nodes = []
+    for code in sorted(codes):
+        s = codes[code]
+        i, _ = name_grid.nearest(s['cx'], s['cy'], name_max_dist)
+        name = names[i] if i is not None else None
+        if name is None:
+            warnings.append(f'이름 없음 {code}: ({s["cx"]}, {s["cy"]}) 반경 {name_max_dist}pt 안에 한글 스팬 없음')
+        node = {
+            'code': code,
+            'name': name['text'] if name else UNKNOWN_NAME,
+            'node_cx': s['cx'],
+            'node_cy': s['cy'],
+            'name_cx': name['cx'] if name else None,
+            'name_cy': name['cy'] if name else None,
+        }
+        if symbols is not None:
+            node.update(_symbol_for(symbols, s['cx'], s['cy']))
+        nodes.append(node)
+    return nodes, warnings
+
+
+def _symbol_boxes(geometry) -> dict:
+    """채워진 단일 사각형 경로(라벨 박스)의 중심 격자와 (영역, 채움색)."""
+    from pdf_geometry import OPS
+
+    boxes = []
+    re_code = OPS.index('re')
+    for p in range(geometry.path_count):
+        start, end = int(geometry.path_start[p]), int(geometry.path_start[p + 1])
+        if end - start != 1 or geometry.op[start] != re_code:
+            continue
+        fill = geometry.fill[p]
+        if fill[0] != fill[0]:  # NaN: 채움 없음
+            continue
+        x0, y0, x1, y1 = (round(v, 1) for v in geometry.rect[p].tolist())
+        if x1 - x0 > SYMBOL_MAX_SIZE or y1 - y0 > SYMBOL_MAX_SIZE:
+            continue
+        boxes.append(([x0, y0, x1, y1], '#' + ''.join(f'{round(c * 255):02x}' for c in fill.tolist())))
+    grid = PointGrid(((r[0] + r[2]) / 2, (r[1] + r[3]) / 2) for r, _ in boxes)
+    return {'grid': grid, 'boxes': boxes}
+
+
+def _symbol_for(symbols: dict, x: float, y: float) -> dict:
+    """(x, y) 를 감싸는 가장 작은 라벨 박스."""
+    best: Optional[tuple] = None
+    for i, _ in symbols['grid'].within(x, y, SYMBOL_MAX_SIZE):
+        rect, fill = symbols['boxes'][i]
+        if rect[0] <= x <= rect[2] and rect[1] <= y <= rect[3]:
+            area = (rect[2] - rect[0]) * (rect[3] - rect[1])
+            if best is None or area < best[0]:
+                best = (area, rect, fill)
+    if best is None:
+        return {'symbol_fill': None, 'symbol_rect': None}
+    return {'symbol_fill': best[2], 'symbol_rect': best[1]}
+
+
+def main():
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+    parser = argparse.ArgumentParser(description='요도 PDF 노드 추출 (번호/이름 스팬 공간 결합)')
+    parser.add_argument('pdf', nargs='?', help='요도 PDF (기본: 프로젝트 루트의 첫 *.pdf)')
+    parser.add_argument('--page', type=int, default=0, help='페이지 번호 (0부터, 기본 0)')
+    parser.add_argument('--spans-file', default=str(project_root / 'pdf_all_spans.json'),
+                        help='텍스트 스팬 JSON (기본: pdf_all_spans.json)')
+    parser.add_argument('--output', default=str(project_root / 'pdf_extracted_nodes.json'),
+                        help='출력 노드 JSON (기본: pdf_extracted_nodes.json)')
+    parser.add_argument('--from-spans', action='store_true',
+                        help='PDF 를 읽지 않고 --spans-file 에서 노드 추출')
+    parser.add_argument('--symbols', action='store_true',
+                        help='라벨 박스 색/영역(symbol_fill, symbol_rect) 추가')
+    parser.add_argument('--name-max-dist', type=float, default=NAME_MAX_DIST,
+                        help=f'번호-이름 최대 거리 pt (기본 {NAME_MAX_DIST})')
+    args = parser.parse_args()
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    pdf = Path(args.pdf) if args.pdf else next(iter(sorted(project_root.glob('*.pdf'))), None)
+    needs_pdf = not args.from_spans or args.symbols
+    if needs_pdf and (pdf is None or not pdf.is_file()):
+        print(f'❌ PDF 없음: {pdf or project_root / "*.pdf"}')
+        sys.exit(1)
+
+    if args.from_spans:
+        with open(args.spans_file, 'r', encoding='utf-8') as f:
+            spans = json.load(f)
+        print(f'스팬 {len(spans)}개 ← {args.spans_file}')
+    else:
+        spans = extract_spans(pdf, args.page)
+        atomic_write_json(args.spans_file, spans)
+        print(f'스팬 {len(spans)}개 ← {pdf.name} p{args.page}')
+        print(f'  ✅ {args.spans_file}')
+
+    geometry = None
+    if args.symbols:
+        from pdf_geometry import load_geometry
+        geometry = load_geometry(pdf, args.page)
+
+    nodes, warnings = extract_nodes(spans, geometry, args.name_max_dist)
+    for w in warnings:
+        print(f'  ⚠ {w}')
+    atomic_write_json(args.output, nodes)
+    named = sum(1 for n in nodes if n['name_cx'] is not None)
+    print(f'노드 {len(nodes)}개 (이름 확인 {named}개)')
+    print(f'  ✅ {args.output}')
+
+
+if __name__ == '__main__':
+    main()
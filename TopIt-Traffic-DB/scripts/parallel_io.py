@@ -0,0 +1,156 @@
+"""
+병렬 I/O 유틸리티 - classify.py 복사/쓰기 단계용 스레드 풀 + 원자적 파일 쓰기.
+
+  - run_io_tasks(): 제한된 스레드 풀에서 작업 실행, 오류는 모아서 반환
+  - shared_executor(): 여러 classify 실행(batch_classify.py)이 스레드 풀 하나를 공유
+  - atomic_write_text() / atomic_write_json() / atomic_write_bytes(): 같은 폴더 임시파일에 쓴 뒤 rename
+    (중단되어도 반쯤 쓰인 info.json/master.json이 남지 않음)
+  - ProgressCounter: 여러 스레드의 진행 상황을 한 줄로 합쳐 표시
+"""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Callable
+
+
+# 네트워크 공유/느린 디스크에서 I/O 대기를 겹치기 위한 기본 작업자 수
+DEFAULT_IO_WORKERS = 8
+
+# shared_executor() 안에서는 모든 run_io_tasks()/io_executor()가 이 풀을 사용
+_shared_pool = None
+
+# umask는 조회하려면 바꿔야 하므로 (스레드 안전하지 않음) 임포트 시 한 번만 읽는다
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+@contextmanager
+def shared_executor(workers: int = DEFAULT_IO_WORKERS):
+    """블록 안의 모든 I/O 작업이 스레드 풀 하나를 공유하게 한다.
+
+    풀에 넣는 작업은 다른 풀 작업을 기다리지 않는 말단 작업이어야 한다 (교착 방지).
+    """
+    global _shared_pool
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+        _shared_pool = pool
+        try:
+            yield pool
+        finally:
+            _shared_pool = None
+
+
+def io_executor(workers: int):
+    """공유 풀이 있으면 그것을(닫지 않음), 없으면 새 풀을 with 문으로 쓸 수 있게 반환한다."""
+    if _shared_pool is not None:
+        return nullcontext(_shared_pool)
+    return ThreadPoolExecutor(max_workers=workers)
+
+
+def run_io_tasks(func: Callable, items: list, workers: int = DEFAULT_IO_WORKERS) -> tuple[list, list]:
+    """items 각각에 func를 실행한다.
+
+    Returns:
+        (results, errors) — results는 items 순서대로 (실패 항목은 None),
+        errors는 [(item, 예외)] 목록
+    """
+    results = [None] * len(items)
+    errors = []
+
+    if workers <= 1 or len(items) <= 1:
+        for i, item in enumerate(items):
+            try:
+                results[i] = func(item)
+            except Exception as e:
+                errors.append((item, e))
+        return results, errors
+
+    with io_executor(workers) as pool:
+        futures = {pool.submit(func, item): i for i, item in enumerate(items)}
+        for future in as_completed(futures):
+            i = futures[future]
+            try:
+                results[i] = future.result()
+            except Exception as e:
+                errors.append((items[i], e))
+
+    return results, errors
+
+
+def atomic_write_text(path, text: str):
+    """텍스트를 임시파일에 쓴 뒤 원자적으로 교체한다."""
+    _atomic_write(path, text, 'w', encoding='utf-8')
+
+
+def atomic_write_bytes(path, data: bytes):
+    """바이트열을 임시파일에 쓴 뒤 원자적으로 교체한다."""
+    _atomic_write(path, data, 'wb')
+
+
+def _atomic_write(path, data, mode: str, **kwargs):
+    path = Path(path)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f'.{path.name}.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, mode, **kwargs) as f:
+            f.write(data)
+        # mkstemp는 0600으로 만들므로 기존 파일 권한(없으면 umask 기본값)으로 맞춘다
+        os.chmod(tmp, _target_mode(path))
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.unlink(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _target_mode(path: Path) -> int:
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+
+def atomic_write_json(path, obj, indent=2):
+    """JSON을 원자적으로 기록한다."""
+    atomic_write_text(path, json.dumps(obj, ensure_ascii=False, indent=indent))
+
+
+class ProgressCounter:
+    """작업 종류별 진행 개수를 한 줄로 표시한다 (예: "DAT 120/200 · 엑셀 30/118"). 스레드 안전.
+
+    터미널이면 같은 줄을 갱신하고(최대 10회/초), 아니면 로그가 넘치지 않도록 finish() 때만 출력한다.
+    """
+
+    REFRESH = 0.1
+
+    def __init__(self, totals: dict[str, int], stream=None):
+        self.totals = dict(totals)
+        self.counts = {label: 0 for label in totals}
+        self.stream = stream or sys.stdout
+        self.live = hasattr(self.stream, 'isatty') and self.stream.isatty()
+        self._lock = threading.Lock()
+        self._last = 0.0
+
+    def advance(self, label: str, n: int = 1):
+        with self._lock:
+            self.counts[label] += n
+            now = time.monotonic()
+            if self.live and now - self._last >= self.REFRESH:
+                self._last = now
+                self.stream.write('\r  ' + self._line())
+                self.stream.flush()
+
+    def finish(self):
+        with self._lock:
+            self.stream.write(('\r  ' if self.live else '  ') + self._line() + '\n')
+            self.stream.flush()
+
+    def _line(self) -> str:
+        return ' · '.join(f'{label} {self.counts[label]}/{self.totals[label]}' for label in self.totals)
@@ -0,0 +1,271 @@
+"""
+요도 PDF 벡터 도형 추출 + 캐시 - page.get_drawings() 결과를 NumPy 배열로 한 번만 만든다.
+
+사용법:
+    python scripts/pdf_geometry.py 요도.pdf [--page N] [--refresh]      ← 요약 출력 (캐시 생성)
+
+    from pdf_geometry import load_geometry
+    geometry = load_geometry(pdf_path)              ← 캐시 적중 시 fitz 를 임포트하지 않음
+    chords = geometry.chords(geometry.select('l', 'c'))   ← (n, 4) x1, y1, x2, y2
+    drawings = geometry.drawings()                  ← get_drawings() 형태 (기존 스크립트 호환)
+
+PDF 전체 도형 목록을 읽는 것이 추출/디버그 스크립트에서 가장 느린 단계라,
+페이지별 결과를 {PDF 폴더}/.geometry_cache/{sha256 앞 16자}_p{페이지}.npz 에 저장해 재사용한다.
+PDF 내용이 바뀌면 해시가 달라지므로 캐시는 자동으로 무효가 된다.
+
+배열 (항목 = 도형 경로 안의 그리기 명령 1개, 경로 = get_drawings() 의 dict 1개):
+    op          uint8  [항목]      OPS 번호 ('l', 'c', 're', 'qu')
+    path        int32  [항목]      소속 경로 번호
+    pts         float32[항목, 8]   l: p1 p2 / c: p1 p2 p3 p4 / re: x0 y0 x1 y1 / qu: ul ur ll lr (빈칸 NaN)
+    orient      int8   [항목]      re 방향 (그 외 0)
+    path_start  int32  [경로+1]    경로별 항목 구간 (CSR)
+    color, fill float32[경로, 3]   RGB (없으면 NaN)
+    width       float32[경로]      선 굵기 (없으면 NaN)
+    ptype       uint8  [경로]      PATH_TYPES 번호 ('f', 's', 'fs')
+    close_path  int8   [경로]      closePath (-1 = None)
+    rect        float32[경로, 4]   경로 경계 상자
+    seqno       int32  [경로]
+
+MuPDF 좌표/색은 float32 이므로 float32 로 저장해도 값이 그대로 복원된다.
+"""
+
+import argparse
+import io
+import os
+import sys
+from collections import namedtuple
+from pathlib import Path
+
+import numpy as np
+
+from manifest import file_sha256
+from parallel_io import atomic_write_bytes
+
+
+CACHE_DIR_NAME = '.geometry_cache'
+GEOMETRY_VERSION = 1
+
+OPS = ('l', 'c', 're', 'qu')
+PATH_TYPES = ('f', 's', 'fs')
+
+Point = namedtuple('Point', 'x y')
+Rect = namedtuple('Rect', 'x0 y0 x1 y1')
+Quad = namedtuple('Quad', 'ul ur ll lr')
+
+_ARRAYS = ('op', 'path', 'pts', 'orient', 'path_start', 'color', 'fill',
+           'width', 'ptype', 'close_path', 'rect', 'seqno')
+
+
+class Geometry:
+    """PDF 1페이지의 도형 배열. load_geometry() 로 만든다."""
+
+    def __init__(self, arrays: dict, page_size: tuple[float, float], sha256: str, page: int):
+        for name in _ARRAYS:
+            setattr(self, name, arrays[name])
+        self.page_width, self.page_height = page_size
+        self.sha256 = sha256
+        self.page = page
+
+    @property
+    def item_count(self) -> int:
+        return len(self.op)
+
+    @property
+    def path_count(self) -> int:
+        return len(self.path_start) - 1
+
+    def select(self, *ops: str) -> np.ndarray:
+        """op 가 ops 중 하나인 항목 마스크."""
+        return np.isin(self.op, [OPS.index(o) for o in ops])
+
+    def chords(self, mask=None) -> np.ndarray:
+        """항목의 시작/끝점 (n, 4) float64. l/re 는 p1-p2 (re는 모서리), c 는 p1-p4, qu 는 ul-lr."""
+        op = self.op if mask is None else self.op[mask]
+        pts = self.pts if mask is None else self.pts[mask]
+        out = pts[:, 0:4].astype(np.float64)
+        for code in (OPS.index('c'), OPS.index('qu')):
+            rows = op == code
+            out[rows, 2:4] = pts[rows, 6:8]
+        return out
+
+    def drawings(self) -> list[dict]:
+        """page.get_drawings() 와 같은 형태의 목록 (items, type, color, fill, width, closePath, rect, seqno)."""
+        items = [_item(op, pts, orient) for op, pts, orient in
+                 zip(self.op.tolist(), self.pts.tolist(), self.orient.tolist())]
+        result = []
+        for p in range(self.path_count):
+            start, end = int(self.path_start[p]), int(self.path_start[p + 1])
+            close_path = int(self.close_path[p])
+            result.append({
+                'items': items[start:end],
+                'type': PATH_TYPES[self.ptype[p]],
+                'fill': _color(self.fill[p]),
+                'color': _color(self.color[p]),
+                'width': None if np.isnan(self.width[p]) else float(self.width[p]),
+                'closePath': None if close_path < 0 else bool(close_path),
+                'rect': Rect(*self.rect[p].tolist()),
+                'seqno': int(self.seqno[p]),
+            })
+        return result
+
+
+def load_geometry(pdf_path, page: int = 0, cache_dir=None, refresh: bool = False) -> Geometry:
+    """PDF 페이지의 도형 배열을 캐시에서 읽고, 없으면 추출하여 캐시에 저장한다.
+
+    Args:
+        cache_dir: 캐시 폴더 (기본: PDF 폴더/.geometry_cache)
+        refresh: 캐시를 무시하고 다시 추출
+    """
+    pdf_path = Path(pdf_path)
+    sha = file_sha256(pdf_path)
+    cache_path = Path(cache_dir or pdf_path.parent / CACHE_DIR_NAME) / f'{sha[:16]}_p{page}.npz'
+
+    if not refresh:
+        geometry = _read_cache(cache_path, sha, page)
+        if geometry is not None:
+            return geometry
+
+    arrays, page_size = extract_arrays(pdf_path, page)
+    geometry = Geometry(arrays, page_size, sha, page)
+    try:
+        _write_cache(cache_path, geometry)
+    except OSError:
+        pass  # 읽기 전용 위치: 캐시 없이 계속
+    return geometry
+
+
+def open_pdf(pdf_path):
+    """PyMuPDF 문서 열기 (1.24 이후 모듈 이름 pymupdf, 이전 버전은 fitz)."""
+    try:
+        import pymupdf
+    except ImportError:
+        import fitz as pymupdf
+    return pymupdf.open(pdf_path)
+
+
+def page_count(pdf_path) -> int:
+    with open_pdf(pdf_path) as doc:
+        return len(doc)
+
+
+def extract_arrays(pdf_path, page: int = 0) -> tuple[dict, tuple[float, float]]:
+    """PyMuPDF 로 페이지 도형을 읽어 배열로 변환한다 (캐시를 거치지 않음)."""
+    with open_pdf(pdf_path) as doc:
+        pg = doc[page]
+        page_size = (pg.rect.width, pg.rect.height)
+        drawings = pg.get_drawings()
+
+    n_items = sum(len(d.get('items', ())) for d in drawings)
+    n_paths = len(drawings)
+    op = np.zeros(n_items, np.uint8)
+    path = np.zeros(n_items, np.int32)
+    pts = np.full((n_items, 8), np.nan, np.float32)
+    orient = np.zeros(n_items, np.int8)
+    path_start = np.zeros(n_paths + 1, np.int32)
+    color = np.full((n_paths, 3), np.nan, np.float32)
+    fill = np.full((n_paths, 3), np.nan, np.float32)
+    width = np.full(n_paths, np.nan, np.float32)
+    ptype = np.zeros(n_paths, np.uint8)
+    close_path = np.full(n_paths, -1, np.int8)
+    rect = np.zeros((n_paths, 4), np.float32)
+    seqno = np.zeros(n_paths, np.int32)
+
+    k = 0
+    for p, d in enumerate(drawings):
+        path_start[p] = k
+        for item in d.get('items', ()):
+            name = item[0]
+            op[k] = OPS.index(name)
+            path[k] = p
+            if name == 're':
+                r = item[1]
+                pts[k, :4] = (r.x0, r.y0, r.x1, r.y1)
+                orient[k] = item[2] if len(item) > 2 else 0
+            elif name == 'qu':
+                q = item[1]
+                pts[k] = (q.ul.x, q.ul.y, q.ur.x, q.ur.y, q.ll.x, q.ll.y, q.lr.x, q.lr.y)
+            else:
+                coords = [c for pt in item[1:] for c in (pt.x, pt.y)]
+                pts[k, :len(coords)] = coords
+            k += 1
+        if d.get('color') is not None:
+            color[p] = d['color'][:3]
+        if d.get('fill') is not None:
+            fill[p] = d['fill'][:3]
+        if d.get('width') is not None:
+            width[p] = d['width']
+        ptype[p] = PATH_TYPES.index(d.get('type', 's'))
+        if d.get('closePath') is not None:
+            close_path[p] = int(bool(d['closePath']))
+        r = d.get('rect')
+        if r is not None:
+            rect[p] = (r.x0, r.y0, r.x1, r.y1)
+        seqno[p] = d.get('seqno', p)
+    path_start[n_paths] = k
+
+    arrays = {
+        'op': op, 'path': path, 'pts': pts, 'orient': orient, 'path_start': path_start,
+        'color': color, 'fill': fill, 'width': width, 'ptype': ptype,
+        'close_path': close_path, 'rect': rect, 'seqno': seqno,
+    }
+    return arrays, page_size
+
+
+def _read_cache(cache_path: Path, sha: str, page: int):
+    try:
+        with np.load(cache_path, allow_pickle=False) as data:
+            if int(data['version']) != GEOMETRY_VERSION or str(data['sha256']) != sha:
+                return None
+            arrays = {name: data[name] for name in _ARRAYS}
+            page_size = tuple(float(v) for v in data['page_size'])
+    except (OSError, KeyError, ValueError):
+        return None
+    return Geometry(arrays, page_size, sha, page)
+
+
+def _write_cache(cache_path: Path, geometry: Geometry):
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    buf = io.BytesIO()
+    np.savez(buf, version=GEOMETRY_VERSION, sha256=geometry.sha256,
+             page_size=np.array([geometry.page_width, geometry.page_height]),
+             **{name: getattr(geometry, name) for name in _ARRAYS})
+    atomic_write_bytes(cache_path, buf.getvalue())
+
+
+def _item(op: int, pts: list, orient: int) -> tuple:
+    name = OPS[op]
+    if name == 'l':
+        return (name, Point(pts[0], pts[1]), Point(pts[2], pts[3]))
+    if name == 'c':
+        return (name, *(Point(pts[i], pts[i + 1]) for i in range(0, 8, 2)))
+    if name == 're':
+        return (name, Rect(*pts[:4]), orient)
+    return (name, Quad(*(Point(pts[i], pts[i + 1]) for i in range(0, 8, 2))))
+
+
+def _color(rgb):
+    return None if np.isnan(rgb[0]) else tuple(rgb.tolist())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='요도 PDF 도형 추출 (NumPy 캐시)')
+    parser.add_argument('pdf', help='요도 PDF 경로')
+    parser.add_argument('--page', type=int, default=0, help='페이지 번호 (0부터, 기본 0)')
+    parser.add_argument('--cache-dir', help=f'캐시 폴더 (기본: PDF 폴더/{CACHE_DIR_NAME})')
+    parser.add_argument('--refresh', action='store_true', help='캐시를 무시하고 다시 추출')
+    args = parser.parse_args()
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    if not os.path.isfile(args.pdf):
+        print(f'❌ PDF 없음: {args.pdf}')
+        sys.exit(1)
+    geometry = load_geometry(args.pdf, args.page, args.cache_dir, args.refresh)
+    counts = np.bincount(geometry.op, minlength=len(OPS))
+    print(f'{args.pdf} p{args.page}: {geometry.page_width:.0f} x {geometry.page_height:.0f} pt, '
+          f'경로 {geometry.path_count}개, 항목 {geometry.item_count}개 '
+          f'({", ".join(f"{o} {c}" for o, c in zip(OPS, counts.tolist()) if c)})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,368 @@
+"""
+Postgres 일괄 적재 - classify 출력(master.json + 교차로별 info.json)을 supabase-schema.sql 테이블에 적재한다.
+
+seed/seed-supabase.mjs (HTTP로 50건씩 upsert, 히스토리 매번 중복 삽입) 대체:
+  1. master.json + info.json → 행 변환 (seed-supabase.mjs 와 같은 필드 매핑)
+  2. 임시 스테이징 테이블로 COPY (텍스트 형식 스트림, psycopg/psycopg2 공통)
+  3. 내용이 달라진 행만 INSERT ... ON CONFLICT DO UPDATE (IS DISTINCT FROM 비교)
+  4. 히스토리는 아직 없는 행만 일괄 INSERT (재적재해도 중복되지 않음)
+  5. route_diagram(id=1) 갱신, intersections_id_seq 를 최대 id로 재설정
+전체가 한 트랜잭션이므로 실패하면 DB는 이전 상태 그대로다.
+
+intersections.id 는 BC-xxx 의 숫자 부분이다 (sqlite_store.bc_number).
+
+사용법:
+    python scripts/pg_loader.py [--dsn DSN] [--db-dir DIR] [--init-schema] [--prune] [--dry-run]
+
+    DSN 생략 시 DATABASE_URL, 그것도 없으면 libpq 기본값(PGHOST, PGUSER ...)을 사용한다.
+    --init-schema 는 supabase-schema.sql 의 테이블/인덱스 부분만 실행한다
+    (RLS/Storage 부분은 Supabase 전용이라 로컬 Postgres에서는 건너뜀).
+
+psycopg(3) 또는 psycopg2 필요: pip install "psycopg[binary]"
+
+테스트 (로컬 Postgres, 테스트마다 임시 스키마 사용):
+    PG_TEST_DSN=postgresql://localhost/postgres python -m pytest tests/test_pg_loader.py
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from manifest import MANIFEST_NAME, safe_dirname
+from sqlite_store import bc_number
+
+
+PROJECT_ROOT = Path(os.path.dirname(os.path.abspath(__file__))).parent
+REPO_ROOT = PROJECT_ROOT.parent
+SCHEMA_PATH = REPO_ROOT / 'supabase-schema.sql'
+
+# supabase-schema.sql 에서 로컬 Postgres에 적용할 수 있는 부분의 끝 표시
+SCHEMA_LOCAL_END = '-- ── RLS'
+
+# (컬럼명, COPY 변환 종류)
+INTERSECTION_COLUMNS = [
+    ('id', 'int'),
+    ('name', 'text'),
+    ('alias', 'array'),
+    ('type', 'text'),
+    ('manufacturer', 'text'),
+    ('status', 'text'),
+    ('notes', 'text'),
+    ('has_dat', 'bool'),
+    ('has_cycle_table', 'bool'),
+    ('dat_phases', 'int'),
+    ('dat_cycle', 'int'),
+    ('dat', 'json'),
+    ('cycle_table', 'json'),
+    ('replacement', 'json'),
+    ('classification', 'json'),
+    ('lat', 'float'),
+    ('lng', 'float'),
+    ('address', 'text'),
+    ('routes', 'array'),
+    ('controller_model', 'text'),
+]
+
+HISTORY_COLUMNS = [
+    ('intersection_id', 'int'),
+    ('date', 'text'),
+    ('action', 'text'),
+    ('by', 'text'),
+    ('changes', 'json'),
+]
+
+
+# ── 입력 읽기 ──
+
+def load_db_rows(db_dir: Path) -> tuple[list[tuple], list[tuple], Optional[dict], list[str]]:
+    """classify 출력 폴더를 읽어 (교차로 행, 히스토리 행, 요도, 경고) 를 반환한다."""
+    db_dir = Path(db_dir)
+    with open(db_dir / 'master.json', 'r', encoding='utf-8') as f:
+        master = json.load(f)
+
+    # 교차로 폴더 위치: 매니페스트 기록 우선, 없으면 classify와 같은 규칙
+    dirs = {}
+    try:
+        with open(db_dir / MANIFEST_NAME, 'r', encoding='utf-8') as f:
+            dirs = {name: e['dir'] for name, e in json.load(f).get('intersections', {}).items()}
+    except (OSError, ValueError):
+        pass
+
+    rows = []
+    history_rows = []
+    warnings = []
+    seen = set()
+    for entry in master.get('intersections', []):
+        numeric_id = bc_number(entry.get('id'))
+        if not numeric_id:
+            warnings.append(f'비정상 ID: {entry.get("id")} ({entry.get("name")})')
+            continue
+        if numeric_id in seen:
+            warnings.append(f'중복 ID: {entry.get("id")} ({entry.get("name")})')
+            continue
+        seen.add(numeric_id)
+
+        name = entry['name']
+        info_path = db_dir / dirs.get(name, Path('교차로') / safe_dirname(name)) / 'info.json'
+        try:
+            with open(info_path, 'r', encoding='utf-8') as f:
+                info = json.load(f)
+        except (OSError, ValueError):
+            info = entry  # seed-supabase.mjs 와 같이 master 항목만으로 적재
+
+        rows.append(intersection_row(numeric_id, entry, info))
+        for h in info.get('history') or []:
+            history_rows.append((
+                numeric_id,
+                h.get('date') or None,  # 날짜 없는 이력은 NULL (적재일로 채우면 재적재 때 중복)
+                h.get('action', ''),
+                h.get('by', 'system'),
+                _json(h.get('changes')),
+            ))
+
+    route_diagram = None
+    try:
+        with open(db_dir / '요도' / 'routes.json', 'r', encoding='utf-8') as f:
+            routes = json.load(f)
+        if routes.get('nodes'):
+            route_diagram = {'nodes': routes['nodes'], 'edges': routes.get('edges', [])}
+    except (OSError, ValueError):
+        pass
+
+    return rows, history_rows, route_diagram, warnings
+
+
+def intersection_row(numeric_id: int, entry: dict, info: dict) -> tuple:
+    """master 항목 + info.json → intersections 행 (INTERSECTION_COLUMNS 순서)."""
+    dat = info.get('dat') or None
+    location = info.get('location') or {}
+    plans = (dat or {}).get('plans') or []
+
+    # 유효성 표시가 없는 계획은 split 합으로 판정 (seed-supabase.mjs 와 동일)
+    for plan in plans:
+        if 'valid' not in plan:
+            total = sum(plan.get('splits') or [])
+            plan['valid'] = total == plan.get('cycle') or total == (plan.get('cycle') or 0) * 2
+
+    has_dat = info.get('has_dat', entry.get('has_dat'))
+    if has_dat is None:
+        has_dat = bool(dat and dat.get('filename'))
+    has_cycle = info.get('has_cycle_table', entry.get('has_cycle_table'))
+    if has_cycle is None:
+        has_cycle = bool(info.get('cycle_table') and info['cycle_table'].get('filename'))
+
+    return (
+        numeric_id,
+        info.get('name') or entry['name'],
+        list(info.get('alias') or []),
+        info.get('type') or '',
+        info.get('manufacturer') or entry.get('manufacturer') or 'unknown',
+        info.get('status') or entry.get('status') or '미확인',
+        info.get('notes') or '',
+        bool(has_dat),
+        bool(has_cycle),
+        (dat or {}).get('phases') or entry.get('phases') or None,
+        (plans[0].get('cycle') if plans else None) or entry.get('cycle') or None,
+        _json(dat),
+        _json(info.get('cycle_table') or None),
+        _json(info.get('replacement') or None),
+        _json(info.get('_classification') or None),
+        location.get('lat') or None,
+        location.get('lng') or None,
+        location.get('address') or '',
+        list(info.get('routes') or []),
+        info.get('controller_model') or '',
+    )
+
+
+# ── COPY 텍스트 형식 ──
+
+def copy_text(rows: list[tuple], columns: list[tuple[str, str]]) -> str:
+    """행 목록을 COPY ... FROM STDIN (텍스트 형식) 데이터로 변환한다."""
+    kinds = [kind for _, kind in columns]
+    out = io.StringIO()
+    for row in rows:
+        out.write('\t'.join(_copy_field(v, k) for v, k in zip(row, kinds)))
+        out.write('\n')
+    return out.getvalue()
+
+
+def _copy_field(value, kind: str) -> str:
+    if value is None:
+        return r'\N'
+    if kind == 'bool':
+        return 't' if value else 'f'
+    if kind in ('int', 'float'):
+        return str(value)
+    if kind == 'array':
+        value = '{' + ','.join(
+            '"' + str(v).replace('\\', '\\\\').replace('"', '\\"') + '"' for v in value
+        ) + '}'
+    return (str(value).replace('\\', '\\\\').replace('\t', '\\t')
+            .replace('\n', '\\n').replace('\r', '\\r'))
+
+
+def _json(value) -> Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(value, ensure_ascii=False)
+
+
+# ── DB 드라이버 ──
+
+def connect(dsn: str):
+    """psycopg(3) 우선, 없으면 psycopg2 로 연결한다.
+
+    COPY 데이터와 JSON은 UTF-8 텍스트이므로 서버 기본 인코딩과 무관하게 client_encoding을 고정한다.
+    """
+    try:
+        import psycopg
+        return psycopg.connect(dsn, client_encoding='utf8')
+    except ImportError:
+        pass
+    try:
+        import psycopg2
+        return psycopg2.connect(dsn, client_encoding='utf8')
+    except ImportError:
+        raise RuntimeError('psycopg 미설치 (pip install "psycopg[binary]")')
+
+
+def copy_into(cur, table: str, columns: list[tuple[str, str]], rows: list[tuple]):
+    """rows를 table에 COPY 한다 (psycopg3: cursor.copy, psycopg2: copy_expert)."""
+    cols = ', '.join(f'"{name}"' for name, _ in columns)
+    sql = f'COPY {table} ({cols}) FROM STDIN'
+    data = copy_text(rows, columns)
+    if hasattr(cur, 'copy'):
+        with cur.copy(sql) as copy:
+            copy.write(data)
+    else:
+        cur.copy_expert(sql, io.StringIO(data))
+
+
+def local_schema_sql(path: Path = SCHEMA_PATH) -> str:
+    """supabase-schema.sql 중 테이블/인덱스 부분 (RLS/Storage 제외)."""
+    text = Path(path).read_text(encoding='utf-8')
+    end = text.find(SCHEMA_LOCAL_END)
+    return text[:end] if end >= 0 else text
+
+
+# ── 적재 ──
+
+def load(conn, rows: list[tuple], history_rows: list[tuple],
+         route_diagram: Optional[dict] = None, prune: bool = False) -> dict:
+    """한 트랜잭션으로 적재한다. 반환: 단계별 행 수."""
+    names = [name for name, _ in INTERSECTION_COLUMNS]
+    cols = ', '.join(names)
+    updatable = [n for n in names if n != 'id']
+    stats = {}
+
+    with conn.cursor() as cur:
+        cur.execute('CREATE TEMP TABLE _stage_intersections '
+                    '(LIKE intersections INCLUDING DEFAULTS) ON COMMIT DROP')
+        copy_into(cur, '_stage_intersections', INTERSECTION_COLUMNS, rows)
+
+        # 내용이 같은 행은 건드리지 않음 (updated_at 유지)
+        cur.execute(
+            f'INSERT INTO intersections ({cols}, updated_at) '
+            f'SELECT {cols}, now() FROM _stage_intersections '
+            f'ON CONFLICT (id) DO UPDATE SET '
+            + ', '.join(f'{n} = EXCLUDED.{n}' for n in updatable) + ', updated_at = now() '
+            'WHERE (' + ', '.join(f'intersections.{n}' for n in updatable) + ') '
+            'IS DISTINCT FROM (' + ', '.join(f'EXCLUDED.{n}' for n in updatable) + ') '
+            'RETURNING (xmax = 0)'
+        )
+        flags = [r[0] for r in cur.fetchall()]
+        stats['inserted'] = sum(1 for f in flags if f)
+        stats['updated'] = len(flags) - stats['inserted']
+        stats['unchanged'] = len(rows) - len(flags)
+
+        if prune:
+            cur.execute('DELETE FROM intersections i WHERE NOT EXISTS '
+                        '(SELECT 1 FROM _stage_intersections s WHERE s.id = i.id)')
+            stats['deleted'] = cur.rowcount
+
+        cur.execute('CREATE TEMP TABLE _stage_history '
+                    '(intersection_id INT, date DATE, action TEXT, "by" TEXT, changes JSONB) '
+                    'ON COMMIT DROP')
+        copy_into(cur, '_stage_history', HISTORY_COLUMNS, history_rows)
+        cur.execute(
+            'INSERT INTO intersection_history (intersection_id, date, action, "by", changes) '
+            'SELECT DISTINCT s.intersection_id, s.date, s.action, s."by", s.changes '
+            'FROM _stage_history s WHERE NOT EXISTS ('
+            '  SELECT 1 FROM intersection_history h'
+            '  WHERE h.intersection_id = s.intersection_id AND h.date IS NOT DISTINCT FROM s.date'
+            '    AND h.action IS NOT DISTINCT FROM s.action'
+            '    AND h."by" IS NOT DISTINCT FROM s."by"'
+            '    AND h.changes IS NOT DISTINCT FROM s.changes)'
+        )
+        stats['history'] = cur.rowcount
+
+        if route_diagram is not None:
+            cur.execute(
+                'INSERT INTO route_diagram (id, nodes, edges, updated_at) '
+                'VALUES (1, %s::jsonb, %s::jsonb, now()) '
+                'ON CONFLICT (id) DO UPDATE SET nodes = EXCLUDED.nodes, edges = EXCLUDED.edges, '
+                'updated_at = now() '
+                'WHERE (route_diagram.nodes, route_diagram.edges) '
+                'IS DISTINCT FROM (EXCLUDED.nodes, EXCLUDED.edges)',
+                (_json(route_diagram['nodes']), _json(route_diagram['edges'])),
+            )
+            stats['route_diagram'] = cur.rowcount
+
+        # 명시 id로 넣었으므로 SERIAL 시퀀스를 최대값으로 맞춤 (웹에서 새 교차로 추가 시 충돌 방지)
+        cur.execute("SELECT setval(pg_get_serial_sequence('intersections', 'id'), "
+                    "GREATEST((SELECT COALESCE(MAX(id), 0) FROM intersections), 1))")
+
+    conn.commit()
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='classify 출력 → Postgres 일괄 적재 (COPY)')
+    parser.add_argument('--dsn', default=os.environ.get('DATABASE_URL', ''),
+                        help='Postgres 접속 문자열 (기본: DATABASE_URL 또는 PG* 환경변수)')
+    parser.add_argument('--db-dir', default=str(PROJECT_ROOT / '보령시_신호DB'),
+                        help='classify 출력 폴더')
+    parser.add_argument('--init-schema', action='store_true',
+                        help='supabase-schema.sql 테이블/인덱스 생성 (로컬 Postgres용)')
+    parser.add_argument('--prune', action='store_true',
+                        help='master.json 에 없는 교차로 행 삭제')
+    parser.add_argument('--dry-run', action='store_true',
+                        help='DB에 연결하지 않고 변환 결과만 출력')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    rows, history_rows, route_diagram, warnings = load_db_rows(Path(args.db_dir))
+    print(f'읽기: 교차로 {len(rows)}개, 히스토리 {len(history_rows)}건, '
+          f'요도 {"있음" if route_diagram else "없음"} ({time.perf_counter() - started:.2f}s)')
+    for w in warnings:
+        print(f'  ⚠ {w}')
+    if args.dry_run:
+        return
+
+    conn = connect(args.dsn)
+    try:
+        if args.init_schema:
+            with conn.cursor() as cur:
+                cur.execute(local_schema_sql())
+            conn.commit()
+            print(f'스키마 적용: {SCHEMA_PATH.name}')
+        stats = load(conn, rows, history_rows, route_diagram, prune=args.prune)
+    finally:
+        conn.close()
+
+    print(f'적재 완료 ({time.perf_counter() - started:.2f}s): '
+          f'신규 {stats["inserted"]}, 변경 {stats["updated"]}, 동일 {stats["unchanged"]}'
+          + (f', 삭제 {stats["deleted"]}' if 'deleted' in stats else '')
+          + f', 히스토리 +{stats["history"]}')
+
+
+if __name__ == '__main__':
+    main()
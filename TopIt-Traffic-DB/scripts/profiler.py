@@ -0,0 +1,186 @@
+"""
+단계별 프로파일러 - classify.py --profile 용.
+
+STEP 단위로 벽시계 시간, CPU 시간, 최대 RSS, 처리 항목 수를 기록하고,
+파일/교차로 단위 소요 시간을 모아 가장 느린 입력을 보여준다.
+작업을 프로세스 풀에 넘기는 단계는 worker() 로 작업자 CPU 시간/최대 RSS 를 더한다
+(요약에서 * 표시 — 현재 프로세스 + 작업자 합계).
+결과는 Chrome 트레이스 뷰어(chrome://tracing, Perfetto)에서 열 수 있는 JSON으로 저장한다.
+
+사용:
+    prof = StageProfiler(enabled=args.profile)
+    prof.start('STEP 1 DAT 스캔')
+    t0 = prof.now()
+    ...파일 1개 처리...
+    prof.item(path, t0)
+    prof.finish(items=len(results))
+    prof.print_summary()
+    prof.write_trace(path)
+
+enabled=False이면 모든 메서드가 아무 일도 하지 않는다.
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# 요약에 표시할 가장 느린 항목 수
+SLOWEST_ITEMS = 10
+
+
+def peak_rss_bytes():
+    """프로세스 최대 RSS (바이트). 측정 불가 시 None."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux는 KB, macOS는 바이트 단위
+    return peak if sys.platform == 'darwin' else peak * 1024
+
+
+class StageProfiler:
+    """STEP 단위 계측기."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self.stages = []
+        self.items = []
+        self._current = None
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def now(self) -> float:
+        return time.perf_counter()
+
+    def start(self, name: str):
+        """새 단계를 시작한다. 진행 중인 단계가 있으면 먼저 종료한다."""
+        if not self.enabled:
+            return
+        if self._current is not None:
+            self.finish()
+        self._current = {
+            'name': name,
+            'wall_start': time.perf_counter(),
+            'cpu_start': time.process_time(),
+            'worker_cpu': 0.0,
+            'worker_rss': {},
+        }
+
+    def finish(self, items: int = None, **counts):
+        """진행 중인 단계를 종료하고 기록한다."""
+        if not self.enabled or self._current is None:
+            return
+        stage = self._current
+        self._current = None
+        wall_end = time.perf_counter()
+        peak_rss = peak_rss_bytes()
+        workers = stage['worker_rss']
+        if workers and peak_rss is not None:
+            # 작업자들은 동시에 떠 있으므로 각자의 최대치를 더한다 (상한 추정)
+            peak_rss += sum(workers.values())
+        self.stages.append({
+            'name': stage['name'],
+            'start': stage['wall_start'] - self._origin,
+            'wall': wall_end - stage['wall_start'],
+            'cpu': time.process_time() - stage['cpu_start'] + stage['worker_cpu'],
+            'peak_rss': peak_rss,
+            'workers': len(workers),
+            'worker_cpu': stage['worker_cpu'],
+            'items': items,
+            'counts': counts,
+        })
+
+    def worker(self, pid: int, cpu: float, peak_rss: int = None):
+        """다른 프로세스가 처리한 항목의 CPU 시간(초)과 그 프로세스의 최대 RSS(바이트)를 더한다.
+
+        현재 프로세스에서 처리한 항목(pid 동일)은 이미 process_time 에 들어 있으므로 무시한다.
+        """
+        if not self.enabled or self._current is None or pid == os.getpid():
+            return
+        with self._lock:
+            self._current['worker_cpu'] += cpu
+            rss = self._current['worker_rss']
+            rss[pid] = max(rss.get(pid, 0), peak_rss or 0)
+
+    def item(self, label: str, started: float, ended: float = None, tid: int = None, **args):
+        """단계 내 개별 항목(파일/교차로) 소요 시간을 기록한다. 스레드 안전.
+
+        다른 프로세스에서 처리한 항목은 그쪽에서 잰 ended(perf_counter)와 트레이스 줄(tid, 보통 pid)을 넘긴다.
+        """
+        if not self.enabled:
+            return
+        if ended is None:
+            ended = time.perf_counter()
+        stage = self._current['name'] if self._current else ''
+        with self._lock:
+            self.items.append({
+                'stage': stage,
+                'label': str(label),
+                'start': started - self._origin,
+                'duration': ended - started,
+                'tid': tid if tid is not None else threading.get_ident(),
+                'args': args,
+            })
+
+    def print_summary(self):
+        if not self.enabled:
+            return
+        self.finish()
+        print('\n[PROFILE] 단계별 소요')
+        print(f'  {"단계":24s} {"wall(s)":>8s} {"cpu(s)":>8s} {"peak RSS":>10s} {"항목":>6s}')
+        for s in self.stages:
+            rss = f'{s["peak_rss"] / 1048576:.1f}MB' if s['peak_rss'] else '-'
+            items = s['items'] if s['items'] is not None else '-'
+            name = f'{s["name"]} *' if s['workers'] else s['name']
+            print(f'  {name:24s} {s["wall"]:8.2f} {s["cpu"]:8.2f} {rss:>10s} {items:>6}')
+        for s in self.stages:
+            if s['workers']:
+                print(f'  * {s["name"]}: cpu/peak RSS 에 작업자 프로세스 {s["workers"]}개 포함 '
+                      f'(작업자 cpu {s["worker_cpu"]:.2f}s)')
+
+        slowest = sorted(self.items, key=lambda i: -i['duration'])[:SLOWEST_ITEMS]
+        if slowest:
+            print(f'\n[PROFILE] 가장 느린 입력 {len(slowest)}개')
+            for i in slowest:
+                print(f'  {i["duration"] * 1000:8.1f}ms  [{i["stage"]}] {os.path.basename(i["label"])}')
+
+    def write_trace(self, path):
+        """Chrome trace event 형식(JSON)으로 저장한다."""
+        if not self.enabled:
+            return
+        self.finish()
+        pid = os.getpid()
+        main_tid = threading.main_thread().ident
+        events = [{
+            'name': 'process_name', 'ph': 'M', 'pid': pid,
+            'args': {'name': 'classify.py'},
+        }]
+        for s in self.stages:
+            events.append({
+                'name': s['name'], 'cat': 'stage', 'ph': 'X', 'pid': pid, 'tid': main_tid,
+                'ts': s['start'] * 1e6, 'dur': s['wall'] * 1e6,
+                'args': {
+                    'cpu_s': round(s['cpu'], 4),
+                    'peak_rss_bytes': s['peak_rss'],
+                    'worker_processes': s['workers'],
+                    'worker_cpu_s': round(s['worker_cpu'], 4),
+                    'items': s['items'],
+                    **s['counts'],
+                },
+            })
+        for i in self.items:
+            events.append({
+                'name': os.path.basename(i['label']), 'cat': i['stage'], 'ph': 'X',
+                'pid': pid, 'tid': i['tid'],
+                'ts': i['start'] * 1e6, 'dur': i['duration'] * 1e6,
+                'args': {'path': i['label'], **i['args']},
+            })
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)
@@ -0,0 +1,356 @@
+"""
+요도 엑셀 노선 추출 - 요도 워크북 셀에 적힌 교차로명으로 가로/세로 노선을 만든다.
+
+사용법:
+    python scripts/route_extractor.py [XLS] [--sheet NAME] [--output-dir DIR]
+                                      [--routes FILE] [--analysis FILE] [--min-run 2] [--check]
+
+기본값 (프로젝트 루트 기준):
+    XLS          : 주기표엑셀/최신본/●수정_보령 신호제어기 요도_20211214.xls
+    --sheet      : 이름에 '요도'가 들어간 첫 시트 ('변경' 시트 제외, 없으면 첫 시트)
+    --output-dir : 보령시_신호DB/  (정식 교차로 ID: identity_index.json, 없으면 _manifest.json / master.json)
+    --routes     : {output-dir}/routes_extracted.json
+    --analysis   : {output-dir}/route_analysis_extracted.json
+    --check      : 프로젝트 루트의 routes.json / route_analysis.json 과 비교 (다르면 종료 코드 1)
+
+프로젝트 루트의 routes.json / route_analysis.json 은 기본값으로 덮어쓰지 않는다.
+갱신하려면 --routes / --analysis 로 직접 지정한다.
+
+규칙:
+  1. 셀 인덱스: 비어 있지 않은 셀만 (행, 열, 텍스트) 로 읽는다 (행/열 0부터, 행 우선 순서)
+  2. 제어기: 셀 텍스트가 정식 교차로 이름과 글자 그대로 같은 셀 (유사도 매칭 없음).
+     '터미널', '남대천' 같은 지명이나 '주공4R' 같은 도로명은 이름이 비슷해도 제어기가 아니다.
+     같은 이름의 정식 교차로가 둘 이상이면 어느 쪽인지 알 수 없으므로 연결하지 않는다.
+     도로명 셀은 정식 이름과 같을 때만 제어기로도 본다 (원의교차로, 무창포IC 등).
+  3. 노선: 같은 행의 제어기 min-run 개 이상 = 가로 노선 (열 순), 같은 열 = 세로 노선 (행 순)
+  4. 도로명: 노선 구간(첫~끝 제어기) 안, 같은 줄과 양옆 줄의 '3R'/'4R'/'교차로'/'IC' 로 끝나는
+     셀 중 노선 방향으로 가장 뒤에 있는 것 (없으면 이름 없는 노선)
+  셀을 행 우선으로 한 번 순회하며 행/열 버킷에 나눠 담으므로 셀 수에 비례해 끝난다.
+
+출력 (기존 routes.json / route_analysis.json 과 같은 스키마):
+    routes.json          {"version", "created", "source", "description",
+                          "routes": [{"id": "H1"|"V1", "name", "type", "excel_row"|"excel_column",
+                                      "controllers": [BC ID, ...], "intersection_names": [셀 텍스트, ...]}]}
+    route_analysis.json  {"source_file", "total_intersections_in_diagram", "total_routes",
+                          "routes": [{"type", "row"|"col", "road_name", "intersections": [{"id", "name", "position"}]}],
+                          "all_intersections": [{"row", "col", "name", "id", "position"}]}
+
+요도 개정판 중 교차로를 도형(텍스트 상자)으로 그린 워크북은 셀에 교차로명이 없어 노선이 나오지 않는다.
+"""
+
+import argparse
+import bisect
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from identity_index import IDENTITY_INDEX_NAME, canonical_items, load_identity_index
+from parallel_io import atomic_write_json
+from sqlite_store import bc_number
+from xlsx_parser import excel_backend
+
+
+DEFAULT_MIN_RUN = 2
+MIN_NAME_LEN = 2
+
+NAME_RE = re.compile(r'[가-힣A-Za-z]')
+ROAD_LABEL_RE = re.compile(r'(\d\s*R|교차로|IC)$', re.I)
+BC_ID_RE = re.compile(r'^BC-\d{3}$')
+
+DESCRIPTION = ('Route diagram for Boryeong City traffic signal controllers. '
+               'Routes represent major roads with controllers arranged in sequence.')
+
+
+def read_sparse_cells(path, sheet: Optional[str] = None) -> tuple[str, list[tuple[int, int, str]]]:
+    """워크북 시트의 비어 있지 않은 셀 [(행, 열, 텍스트), ...] (행 우선 순서).
+
+    Returns:
+        (시트 이름, 셀 목록)
+    """
+    path = str(path)
+    if path.lower().endswith('.xlsx'):
+        openpyxl = excel_backend('openpyxl')
+        if openpyxl is None:
+            raise ImportError('openpyxl 미설치')
+        wb = openpyxl.load_workbook(path, read_only=True, data_only=True)
+        try:
+            ws = wb[_pick_sheet(wb.sheetnames, sheet)]
+            cells = [(r, c, _text(v))
+                     for r, row in enumerate(ws.iter_rows(values_only=True))
+                     for c, v in enumerate(row) if _text(v)]
+            return ws.title, cells
+        finally:
+            wb.close()
+
+    xlrd = excel_backend('xlrd')
+    if xlrd is None:
+        raise ImportError('xlrd 미설치')
+    wb = xlrd.open_workbook(path, on_demand=True)
+    try:
+        ws = wb.sheet_by_name(_pick_sheet(wb.sheet_names(), sheet))
+        cells = [(r, c, _text(v))
+                 for r in range(ws.nrows)
+                 for c, v in enumerate(ws.row_values(r)) if _text(v)]
+        return ws.name, cells
+    finally:
+        wb.release_resources()
+
+
+def find_routes(cells: list[tuple[int, int, str]], names: dict[str, str],
+                min_run: int = DEFAULT_MIN_RUN) -> tuple[list[dict], list[dict]]:
+    """셀 목록에서 제어기와 가로/세로 노선을 찾는다.
+
+    Args:
+        cells: read_sparse_cells() 셀 (행 우선 순서)
+        names: 정식 교차로 이름 → ID (load_canonical_names())
+
+    Returns:
+        (노선 목록 [{'type', 'line', 'road_name', 'controllers': [제어기, ...]}] (가로 행순 → 세로 열순),
+         제어기 목록 [{'row', 'col', 'name', 'id'}] (셀 순서))
+    """
+    controllers = []
+    runs = {'horizontal': {}, 'vertical': {}}
+    labels = {'horizontal': {}, 'vertical': {}}
+
+    for r, c, text in cells:
+        cid = names.get(text)
+        if ROAD_LABEL_RE.search(text):
+            labels['horizontal'].setdefault(r, []).append((c, text))
+            labels['vertical'].setdefault(c, []).append((r, text))
+            if cid is None:
+                continue
+        if cid is None or len(text) < MIN_NAME_LEN or not NAME_RE.search(text):
+            continue
+        ctrl = {'row': r, 'col': c, 'name': text, 'id': cid}
+        controllers.append(ctrl)
+        runs['horizontal'].setdefault(r, []).append(ctrl)
+        runs['vertical'].setdefault(c, []).append(ctrl)
+
+    routes = []
+    for kind, pos_key in (('horizontal', 'col'), ('vertical', 'row')):
+        for line in sorted(runs[kind]):
+            run = runs[kind][line]
+            if len(run) < min_run:
+                continue
+            routes.append({
+                'type': kind,
+                'line': line,
+                'road_name': _road_label(labels[kind], line, run[0][pos_key], run[-1][pos_key]),
+                'controllers': run,
+            })
+    return routes, controllers
+
+
+def _road_label(labels: dict, line: int, lo: int, hi: int) -> Optional[str]:
+    """line±1 줄의 [lo, hi] 구간 안 도로명 셀 중 가장 뒤 (위치 순) 것."""
+    best = None
+    for k in (line - 1, line, line + 1):
+        items = labels.get(k)
+        if not items:
+            continue
+        i = bisect.bisect_right(items, (hi, '\uffff')) - 1
+        if i >= 0 and items[i][0] >= lo and (best is None or items[i][0] > best[0]):
+            best = items[i]
+    return best[1] if best else None
+
+
+def build_routes_json(routes: list[dict], source: str) -> dict:
+    counters = {'horizontal': 0, 'vertical': 0}
+    items = []
+    for route in routes:
+        kind = route['type']
+        counters[kind] += 1
+        n = counters[kind]
+        items.append({
+            'id': f'{kind[0].upper()}{n}',
+            'name': route['road_name'] or f'Unnamed {kind.capitalize()} Route {n}',
+            'type': kind,
+            ('excel_row' if kind == 'horizontal' else 'excel_column'): route['line'],
+            'controllers': [c['id'] for c in route['controllers']],
+            'intersection_names': [c['name'] for c in route['controllers']],
+        })
+    return {
+        'version': '1.0',
+        'created': datetime.now().strftime('%Y-%m-%d'),
+        'source': source,
+        'description': DESCRIPTION,
+        'routes': items,
+    }
+
+
+def build_analysis_json(routes: list[dict], controllers: list[dict], source: str) -> dict:
+    def ref(c):
+        return {'id': c['id'], 'name': c['name'], 'position': [c['row'], c['col']]}
+
+    ordered = sorted(controllers, key=lambda c: (bc_number(c['id']), str(c['id']), c['row'], c['col']))
+    return {
+        'source_file': source,
+        'total_intersections_in_diagram': len(controllers),
+        'total_routes': len(routes),
+        'routes': [{
+            'type': route['type'],
+            ('row' if route['type'] == 'horizontal' else 'col'): route['line'],
+            'road_name': route['road_name'],
+            'intersections': [ref(c) for c in route['controllers']],
+        } for route in routes],
+        'all_intersections': [{'row': c['row'], 'col': c['col'], **ref(c)} for c in ordered],
+    }
+
+
+def load_canonical_names(output_dir) -> Optional[dict[str, str]]:
+    """정식 교차로 이름 → BC ID (identity_index.json, 없으면 classify 결과). 목록이 없으면 None.
+
+    ID는 'BC-xxx' 형식으로 맞춘다 (master.json 에는 '208' 처럼 번호만 적힌 판도 있음).
+    같은 이름이 둘 이상의 ID 에 쓰이면 그 이름은 뺀다.
+    """
+    output_dir = Path(output_dir)
+    index = load_identity_index(output_dir / IDENTITY_INDEX_NAME)
+    items = list(index['canonical'].items()) if index and index['canonical'] else canonical_items(output_dir)
+    if not items:
+        return None
+    names, ambiguous = {}, set()
+    for cid, name in items:
+        cid = f'BC-{bc_number(cid):03d}'
+        if name in names and names[name] != cid:
+            ambiguous.add(name)
+        names[name] = cid
+    return {name: cid for name, cid in names.items() if name not in ambiguous}
+
+
+def compare_routes(routes_json: dict, analysis_json: dict,
+                   expected_routes: dict, expected_analysis: dict) -> list[str]:
+    """추출 결과와 기준 routes.json / route_analysis.json 의 차이 (없으면 빈 목록).
+
+    노선 ID/이름/방향/줄, 교차로명 순서와 셀 위치를 비교하고, 추출 결과의 제어기 ID가
+    모두 'BC-xxx' 형식인지 확인한다. 제어기 번호 자체는 classify 실행마다 달라질 수 있어 비교하지 않는다.
+    """
+    def route_rows(data):
+        return [(r['id'], r['name'], r['type'], r.get('excel_row', r.get('excel_column')),
+                 r['intersection_names']) for r in data['routes']]
+
+    def analysis_rows(data):
+        return [(r['type'], r.get('row', r.get('col')), r['road_name'],
+                 [(i['name'], list(i['position'])) for i in r['intersections']]) for r in data['routes']]
+
+    def cells(data):
+        return sorted((i['row'], i['col'], i['name']) for i in data['all_intersections'])
+
+    diffs = []
+    ids = [('routes.json', cid) for r in routes_json['routes'] for cid in r['controllers']]
+    ids += [('route_analysis.json', i['id']) for r in analysis_json['routes'] for i in r['intersections']]
+    ids += [('route_analysis.json', i['id']) for i in analysis_json['all_intersections']]
+    for label, cid in ids:
+        if not BC_ID_RE.match(str(cid)):
+            diffs.append(f'{label}: BC ID 형식 아님 ({cid!r})')
+    for label, got, want in (('routes.json', route_rows(routes_json), route_rows(expected_routes)),
+                             ('route_analysis.json', analysis_rows(analysis_json),
+                              analysis_rows(expected_analysis))):
+        if len(got) != len(want):
+            diffs.append(f'{label}: 노선 {len(got)}개 (기준 {len(want)}개)')
+        for i, (a, b) in enumerate(zip(got, want)):
+            if a != b:
+                diffs.append(f'{label} routes[{i}]: {a} (기준 {b})')
+    got, want = cells(analysis_json), cells(expected_analysis)
+    for cell in sorted(set(got) - set(want)):
+        diffs.append(f'route_analysis.json all_intersections: 추가 {cell}')
+    for cell in sorted(set(want) - set(got)):
+        diffs.append(f'route_analysis.json all_intersections: 누락 {cell}')
+    return diffs
+
+
+def _pick_sheet(names: list[str], sheet: Optional[str]) -> str:
+    if sheet is not None:
+        if sheet not in names:
+            raise ValueError(f'시트 없음: {sheet} (있는 시트: {", ".join(names)})')
+        return sheet
+    for name in names:
+        if '요도' in name and '변경' not in name:
+            return name
+    return names[0]
+
+
+def _text(value) -> str:
+    if value is None or isinstance(value, (int, float)):
+        return ''
+    return str(value).strip()
+
+
+def main():
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+    parser = argparse.ArgumentParser(description='요도 엑셀 노선 추출 (희소 셀 인덱스)')
+    parser.add_argument('xls', nargs='?',
+                        default=str(project_root / '주기표엑셀' / '최신본' / '●수정_보령 신호제어기 요도_20211214.xls'),
+                        help='요도 워크북 (.xls/.xlsx)')
+    parser.add_argument('--sheet', help="시트 이름 (기본: 이름에 '요도'가 들어간 첫 시트)")
+    parser.add_argument('--output-dir', default=str(project_root / '보령시_신호DB'),
+                        help='classify 출력 폴더 (정식 교차로 ID, 기본: 보령시_신호DB/)')
+    parser.add_argument('--routes',
+                        help='노선 JSON (기본: {output-dir}/routes_extracted.json)')
+    parser.add_argument('--analysis',
+                        help='노선 분석 JSON (기본: {output-dir}/route_analysis_extracted.json)')
+    parser.add_argument('--min-run', type=int, default=DEFAULT_MIN_RUN,
+                        help=f'노선으로 볼 최소 제어기 수 (기본 {DEFAULT_MIN_RUN})')
+    parser.add_argument('--check', action='store_true',
+                        help='프로젝트 루트의 routes.json / route_analysis.json 과 비교')
+    args = parser.parse_args()
+    args.routes = args.routes or str(Path(args.output_dir) / 'routes_extracted.json')
+    args.analysis = args.analysis or str(Path(args.output_dir) / 'route_analysis_extracted.json')
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    if not os.path.isfile(args.xls):
+        print(f'❌ 요도 워크북 없음: {args.xls}')
+        sys.exit(1)
+    names = load_canonical_names(args.output_dir)
+    if names is None:
+        print(f'❌ 정식 교차로 목록 없음: {args.output_dir} (classify.py 먼저 실행)')
+        sys.exit(1)
+
+    try:
+        sheet, cells = read_sparse_cells(args.xls, args.sheet)
+    except (ImportError, ValueError) as e:
+        print(f'❌ {e}')
+        sys.exit(1)
+    routes, controllers = find_routes(cells, names, args.min_run)
+
+    source = Path(args.xls).name
+    print(f'{source} [{sheet}]: 셀 {len(cells)}개 → 제어기 {len(controllers)}개')
+    if not controllers:
+        print('  ⚠ 셀에서 교차로명을 찾지 못함 (교차로를 도형으로 그린 요도일 수 있음)')
+    horizontal = sum(1 for r in routes if r['type'] == 'horizontal')
+    print(f'  노선 {len(routes)}개 (가로 {horizontal}, 세로 {len(routes) - horizontal})')
+
+    routes_json = build_routes_json(routes, source)
+    analysis_json = build_analysis_json(routes, controllers, source)
+    for route in routes_json['routes']:
+        print(f'    {route["id"]:4s} {route["name"]}: {" → ".join(route["intersection_names"])}')
+    atomic_write_json(args.routes, routes_json)
+    atomic_write_json(args.analysis, analysis_json)
+    print(f'  ✅ {args.routes}')
+    print(f'  ✅ {args.analysis}')
+
+    if args.check:
+        expected = [project_root / 'routes.json', project_root / 'route_analysis.json']
+        missing = [str(p) for p in expected if not p.is_file()]
+        if missing:
+            print(f'  ❌ 비교 기준 없음: {", ".join(missing)}')
+            sys.exit(1)
+        diffs = compare_routes(routes_json, analysis_json,
+                               *(json.loads(p.read_text(encoding='utf-8')) for p in expected))
+        if diffs:
+            print(f'  ❌ 기준 노선과 다름 ({len(diffs)}건)')
+            for diff in diffs:
+                print(f'    {diff}')
+            sys.exit(1)
+        print('  ✅ 기준 routes.json / route_analysis.json 과 같음 (BC 번호 제외)')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,335 @@
+"""
+신호 네트워크 그래프 - 노드/간선 JSON을 CSR(압축 희소 행) 구조로 읽어 조회한다.
+
+사용법:
+    python scripts/signal_graph.py                              ← pdf_extracted_nodes/edges.json 요약
+    python scripts/signal_graph.py --routes 보령시_신호DB/요도/routes.json
+    python scripts/signal_graph.py --neighbors 001 023          ← 노드 이웃 조회
+
+    from signal_graph import load_pdf_graph
+    graph = load_pdf_graph('pdf_extracted_nodes.json', 'pdf_extracted_edges.json')
+    graph.neighbors('001')          ← [('079', 61.1), ...]  O(차수)
+    graph.components()              ← [[노드 ID, ...], ...] 큰 것부터
+    graph.isolated()                ← 차수 0 노드
+    graph.degree_distribution()     ← {차수: 노드 수}
+
+입력 형식:
+    PDF 추출     pdf_extracted_nodes.json + pdf_extracted_edges.json   ID = 요도 번호, 가중치 = distance_pts
+    graph 형식   요도/routes.json {"format": "graph", nodes[{id, name, x, y}], edges[{from, to}]}
+                 ID = 노드 id, 가중치 = 좌표 간 거리
+    노선 형식    routes.json {"routes": [{"controllers": [BC-xxx, ...]}]}  ID = BC ID, 노선 순서대로 연결, 가중치 1
+
+무방향 그래프이며 간선은 양방향으로 한 번씩 저장한다 (중복/자기 자신 간선은 제거).
+CSR 배열은 원본 파일 sha256 을 키로 {원본 폴더}/.graph_cache/ 에 .npz 로 저장되어,
+원본이 그대로면 다음 실행은 JSON 파싱/정렬 없이 배열만 읽는다.
+"""
+
+import argparse
+import io
+import json
+import math
+import os
+import sys
+from collections import Counter
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from manifest import file_sha256, fingerprint
+from parallel_io import atomic_write_bytes
+
+
+CACHE_DIR_NAME = '.graph_cache'
+GRAPH_VERSION = 1
+
+
+class SignalGraph:
+    """CSR 무방향 그래프. 노드 번호 i 의 이웃은 indices[indptr[i]:indptr[i+1]]."""
+
+    def __init__(self, ids, names, xy, indptr, indices, weights, dropped: int = 0):
+        self.ids = list(ids)
+        self.names = list(names)
+        self.xy = xy
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+        self.dropped = dropped
+        self._index = {node_id: i for i, node_id in enumerate(self.ids)}
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._index
+
+    @property
+    def edge_count(self) -> int:
+        return len(self.indices) // 2
+
+    def index(self, node_id) -> int:
+        """노드 ID → 노드 번호. 없으면 KeyError."""
+        return self._index[node_id]
+
+    def name(self, node_id) -> str:
+        return self.names[self._index[node_id]]
+
+    def neighbors(self, node_id) -> list[tuple[str, float]]:
+        """이웃 [(노드 ID, 가중치), ...] (노드 번호순)."""
+        i = self._index[node_id]
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return [(self.ids[j], w) for j, w in
+                zip(self.indices[start:end].tolist(), self.weights[start:end].tolist())]
+
+    def degree(self, node_id) -> int:
+        i = self._index[node_id]
+        return int(self.indptr[i + 1] - self.indptr[i])
+
+    def degrees(self) -> np.ndarray:
+        """노드 번호순 차수 배열."""
+        return np.diff(self.indptr)
+
+    def isolated(self) -> list[str]:
+        """차수 0 노드 ID."""
+        return [self.ids[i] for i in np.flatnonzero(self.degrees() == 0).tolist()]
+
+    def degree_distribution(self) -> dict[int, int]:
+        """{차수: 노드 수} (차수순)."""
+        counts = np.bincount(self.degrees())
+        return {d: int(c) for d, c in enumerate(counts.tolist()) if c}
+
+    def component_labels(self) -> np.ndarray:
+        """노드 번호순 연결 요소 번호 (0부터, 처음 나온 노드 순)."""
+        labels = np.full(len(self.ids), -1, np.int32)
+        indptr, indices = self.indptr.tolist(), self.indices.tolist()
+        current = 0
+        for root in range(len(self.ids)):
+            if labels[root] >= 0:
+                continue
+            labels[root] = current
+            stack = [root]
+            while stack:
+                i = stack.pop()
+                for j in indices[indptr[i]:indptr[i + 1]]:
+                    if labels[j] < 0:
+                        labels[j] = current
+                        stack.append(j)
+            current += 1
+        return labels
+
+    def components(self) -> list[list[str]]:
+        """연결 요소별 노드 ID 목록 (큰 요소부터, 같은 크기는 첫 노드 번호순)."""
+        groups = {}
+        for i, label in enumerate(self.component_labels().tolist()):
+            groups.setdefault(label, []).append(self.ids[i])
+        return sorted(groups.values(), key=len, reverse=True)
+
+    def edges(self) -> list[tuple[str, str, float]]:
+        """간선 [(ID, ID, 가중치), ...] (각 간선 1번, 노드 번호순)."""
+        result = []
+        for i in range(len(self.ids)):
+            for k in range(self.indptr[i], self.indptr[i + 1]):
+                j = int(self.indices[k])
+                if i < j:
+                    result.append((self.ids[i], self.ids[j], float(self.weights[k])))
+        return result
+
+
+def build_graph(nodes: list[dict], edges, default_weight: float = 1.0) -> SignalGraph:
+    """노드/간선 목록으로 CSR 그래프를 만든다.
+
+    Args:
+        nodes: [{'id', 'name'?, 'x'?, 'y'?}, ...] (이 순서가 노드 번호)
+        edges: [(ID, ID, 가중치 또는 None), ...]. 가중치가 None 이면 좌표 거리, 좌표도 없으면 default_weight.
+               없는 노드를 가리키거나 자기 자신을 잇는 간선은 버리고 dropped 로 센다.
+    """
+    ids = [str(n['id']) for n in nodes]
+    index = {node_id: i for i, node_id in enumerate(ids)}
+    if len(index) != len(ids):
+        dup = [k for k, c in Counter(ids).items() if c > 1]
+        raise ValueError(f'노드 ID 중복: {", ".join(dup[:10])}')
+    names = [n.get('name') or '' for n in nodes]
+    xy = np.array([[_coord(n.get('x')), _coord(n.get('y'))] for n in nodes],
+                  dtype=np.float64).reshape(-1, 2)
+
+    pairs = {}
+    dropped = 0
+    for a, b, w in edges:
+        i, j = index.get(str(a)), index.get(str(b))
+        if i is None or j is None or i == j:
+            dropped += 1
+            continue
+        key = (i, j) if i < j else (j, i)
+        if key in pairs:
+            continue
+        if w is None:
+            d = math.hypot(*(xy[i] - xy[j]).tolist())
+            w = default_weight if math.isnan(d) else d
+        pairs[key] = float(w)
+
+    n = len(ids)
+    if pairs:
+        ij = np.array(list(pairs.keys()), dtype=np.int32)
+        w = np.array(list(pairs.values()), dtype=np.float64)
+        src = np.concatenate([ij[:, 0], ij[:, 1]])
+        dst = np.concatenate([ij[:, 1], ij[:, 0]])
+        both = np.concatenate([w, w])
+        order = np.lexsort((dst, src))
+        src, dst, both = src[order], dst[order], both[order]
+    else:
+        src = dst = np.zeros(0, np.int32)
+        both = np.zeros(0, np.float64)
+    indptr = np.zeros(n + 1, np.int32)
+    np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+    return SignalGraph(ids, names, xy, indptr, dst.astype(np.int32), both, dropped)
+
+
+def load_pdf_graph(nodes_path, edges_path, cache: bool = True) -> SignalGraph:
+    """pdf_extracted_nodes.json + pdf_extracted_edges.json (ID = 요도 번호)."""
+    def parse():
+        with open(nodes_path, 'r', encoding='utf-8') as f:
+            nodes = json.load(f)
+        with open(edges_path, 'r', encoding='utf-8') as f:
+            edges = json.load(f)
+        return build_graph(
+            [{'id': n['code'], 'name': n['name'], 'x': n['node_cx'], 'y': n['node_cy']} for n in nodes],
+            [(e['from_code'], e['to_code'], e.get('distance_pts')) for e in edges])
+    return _cached([nodes_path, edges_path], parse, cache)
+
+
+def load_route_graph(path, cache: bool = True) -> SignalGraph:
+    """routes.json (graph 형식 또는 노선 형식)."""
+    def parse():
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') == 'graph' or 'nodes' in data:
+            nodes = [{'id': n['id'], 'name': n.get('name'), 'x': n.get('x'), 'y': n.get('y')}
+                     for n in data.get('nodes', [])]
+            edges = [(e['from'], e['to'], e.get('weight')) for e in data.get('edges', [])]
+            return build_graph(nodes, edges)
+
+        nodes = {}
+        edges = []
+        for route in data.get('routes', []):
+            controllers = route.get('controllers', [])
+            names = route.get('intersection_names', [])
+            for k, bc_id in enumerate(controllers):
+                nodes.setdefault(bc_id, {'id': bc_id, 'name': names[k] if k < len(names) else ''})
+            edges.extend((a, b, 1.0) for a, b in zip(controllers[:-1], controllers[1:]))
+        return build_graph(sorted(nodes.values(), key=lambda n: n['id']), edges)
+    return _cached([path], parse, cache)
+
+
+def save_graph(path, graph: SignalGraph, key: str = ''):
+    """CSR 배열을 .npz 로 원자적 저장. key 는 원본 지문 (load_graph 에서 비교)."""
+    buf = io.BytesIO()
+    np.savez(buf, version=GRAPH_VERSION, key=key,
+             ids=np.array(graph.ids, dtype=str), names=np.array(graph.names, dtype=str),
+             xy=graph.xy, indptr=graph.indptr, indices=graph.indices, weights=graph.weights,
+             dropped=graph.dropped)
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    atomic_write_bytes(path, buf.getvalue())
+
+
+def load_graph(path, key: Optional[str] = None) -> Optional[SignalGraph]:
+    """save_graph 파일을 읽는다. 없거나 버전/key 가 다르면 None."""
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if int(data['version']) != GRAPH_VERSION:
+                return None
+            if key is not None and str(data['key']) != key:
+                return None
+            return SignalGraph(data['ids'].tolist(), data['names'].tolist(), data['xy'],
+                               data['indptr'], data['indices'], data['weights'], int(data['dropped']))
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _cached(sources: list, parse, cache: bool) -> SignalGraph:
+    """원본 파일 sha256 이 같으면 캐시된 CSR 을 읽고, 아니면 parse() 후 저장한다."""
+    if not cache:
+        return parse()
+    key = fingerprint([file_sha256(p) for p in sources])
+    cache_path = Path(sources[-1]).parent / CACHE_DIR_NAME / f'{Path(sources[-1]).stem}_{key[:16]}.npz'
+    graph = load_graph(cache_path, key)
+    if graph is None:
+        graph = parse()
+        try:
+            save_graph(cache_path, graph, key)
+        except OSError:
+            pass  # 읽기 전용 위치: 캐시 없이 계속
+    return graph
+
+
+def _coord(value) -> float:
+    return float('nan') if value is None else float(value)
+
+
+def print_summary(graph: SignalGraph, top: int = 10):
+    components = graph.components()
+    isolated = graph.isolated()
+    degrees = graph.degrees()
+    print(f'  노드 {len(graph)}개, 간선 {graph.edge_count}개'
+          + (f' (버린 간선 {graph.dropped}개)' if graph.dropped else ''))
+    if len(graph):
+        print(f'  평균 차수 {degrees.mean():.2f}, 최대 차수 {int(degrees.max())}')
+    connected = [c for c in components if len(c) > 1]
+    print(f'  연결 요소 {len(connected)}개 (크기: {", ".join(str(len(c)) for c in connected[:10])}'
+          f'{" …" if len(connected) > 10 else ""}), 고립 노드 {len(isolated)}개')
+
+    print('\n  차수 분포:')
+    for d, count in graph.degree_distribution().items():
+        print(f'    차수 {d}: {count}개')
+
+    print(f'\n  차수 상위 {top}:')
+    for i in np.argsort(-degrees, kind='stable')[:top].tolist():
+        print(f'    [{graph.ids[i]}] {graph.names[i]}: {int(degrees[i])}')
+
+    if isolated:
+        print(f'\n  고립 노드 ({len(isolated)}):')
+        for node_id in isolated:
+            print(f'    [{node_id}] {graph.name(node_id)}')
+
+
+def main():
+    project_root = Path(os.path.dirname(os.path.abspath(__file__))).parent
+
+    parser = argparse.ArgumentParser(description='신호 네트워크 그래프 (CSR) 요약/조회')
+    parser.add_argument('--nodes', default=str(project_root / 'pdf_extracted_nodes.json'),
+                        help='PDF 노드 JSON (기본: pdf_extracted_nodes.json)')
+    parser.add_argument('--edges', default=str(project_root / 'pdf_extracted_edges.json'),
+                        help='PDF 간선 JSON (기본: pdf_extracted_edges.json)')
+    parser.add_argument('--routes', help='routes.json (graph/노선 형식) 을 대신 읽음')
+    parser.add_argument('--neighbors', nargs='+', metavar='ID', help='노드 이웃 조회')
+    parser.add_argument('--no-cache', action='store_true', help='CSR 캐시를 쓰지 않음')
+    args = parser.parse_args()
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    cache = not args.no_cache
+    if args.routes:
+        graph = load_route_graph(args.routes, cache)
+        print(f'{args.routes}')
+    else:
+        graph = load_pdf_graph(args.nodes, args.edges, cache)
+        print(f'{args.nodes} + {args.edges}')
+
+    if not args.neighbors:
+        print_summary(graph)
+        return
+    missing = 0
+    for node_id in args.neighbors:
+        if node_id not in graph:
+            print(f'❌ 없음: {node_id}')
+            missing += 1
+            continue
+        neighbors = ', '.join(f'[{j}] {graph.name(j)} ({w:.1f})' for j, w in graph.neighbors(node_id))
+        print(f'[{node_id}] {graph.name(node_id)} (차수 {graph.degree(node_id)}): {neighbors or "-"}')
+    if missing:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
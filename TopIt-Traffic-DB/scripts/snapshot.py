@@ -0,0 +1,331 @@
+"""
+바이너리 스냅샷 - classify 결과를 mmap으로 바로 열 수 있는 단일 파일로 저장한다.
+
+사용법:
+    python scripts/snapshot.py 보령시_신호DB/signal_db.snap            ← 요약
+    python scripts/snapshot.py 보령시_신호DB/signal_db.snap BC-038 12  ← 교차로 조회 (JSON)
+
+도구가 교차로 몇 개를 조회하려고 master.json + info.json 전체를 읽고 파싱하는 대신,
+파일을 mmap 하고 헤더(고정 크기)만 해석한 뒤 필요한 레코드만 디코딩한다.
+열기 비용은 교차로 수와 무관하고, BC ID 조회는 직접 주소 인덱스로 O(1)이다.
+
+파일 구조 (리틀 엔디안, 모든 구역은 8바이트 정렬):
+    header   HEADER (고정 크기, 각 구역 오프셋)
+    index    uint32[index_len]        ← BC 번호 → 레코드 번호+1 (0 = 없음)
+    records  RECORD[count]            ← 교차로 고정 폭 레코드 (BC 번호순)
+    plans    PLAN[plan_count]         ← 전체 타이밍 계획 평면 배열 (레코드별 연속 구간)
+    splits   uint16[split_count]      ← 전체 현시 시간 평면 배열 (계획별 연속 구간)
+    strings  UTF-8 문자열 테이블       ← (오프셋, 길이)로 참조, 같은 문자열은 1벌
+
+내용만으로 결정되는 바이트열이므로 (생성 시각 없음) 같은 결과면 파일을 다시 쓰지 않는다.
+Windows에서는 다른 프로세스가 mmap 중인 파일을 교체할 수 없어, 내용이 바뀔 때만 교체한다.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from pathlib import Path
+from typing import Iterator, Optional
+
+from parallel_io import atomic_write_bytes
+from sqlite_store import bc_number
+
+
+SNAPSHOT_NAME = 'signal_db.snap'
+SNAPSHOT_MAGIC = b'TSDB'
+SNAPSHOT_VERSION = 1
+
+# magic, version, record_size, plan_size, count, index_len, plan_count, split_count,
+# index_off, records_off, plans_off, splits_off, strings_off, strings_len
+HEADER = struct.Struct('<4sHHHxxIIIIQQQQQQ')
+
+# 레코드의 문자열 필드 (각각 uint32 오프셋 + uint32 길이)
+STRING_FIELDS = (
+    'id', 'name', 'type', 'manufacturer', 'status', 'dir',
+    'dat_filename', 'dat_original_filename',
+    'cycle_filename', 'cycle_source_file', 'cycle_sheet_name',
+    'address', 'confidence',
+)
+
+# bc_number, 문자열 참조 ×N, phases, flags, plan_count, plan_start, lat, lng
+RECORD = struct.Struct('<I' + 'II' * len(STRING_FIELDS) + 'HBxHxxIdd')
+
+# plan, cycle, offset, valid, split_count, split_start
+PLAN = struct.Struct('<HHHBBI')
+SPLIT = struct.Struct('<H')
+INDEX = struct.Struct('<I')
+
+FLAG_HAS_DAT = 0x01
+FLAG_HAS_CYCLE_TABLE = 0x02
+FLAG_HAS_LOCATION = 0x04
+
+_ALIGN = 8
+
+
+def build_snapshot(infos: list[dict], dirs: Optional[dict] = None) -> bytes:
+    """교차로 info 목록을 스냅샷 바이트열로 만든다.
+
+    Args:
+        infos: classify의 info.json 딕셔너리 목록
+        dirs: {교차로명: 출력 폴더명} (매니페스트 intersections의 dir)
+
+    Raises:
+        ValueError: BC 번호가 없거나 중복된 교차로
+    """
+    dirs = dirs or {}
+    strings = _StringTable()
+    records = []
+    plans = []
+    splits = []
+
+    ordered = sorted(infos, key=lambda info: bc_number(info['id']))
+    seen = set()
+    for info in ordered:
+        number = bc_number(info['id'])
+        if number <= 0 or number in seen:
+            raise ValueError(f'스냅샷 ID 오류: {info["id"]} ({info["name"]})')
+        seen.add(number)
+
+        dat = info.get('dat') or {}
+        cycle_table = info.get('cycle_table') or {}
+        location = info.get('location') or {}
+        lat, lng = location.get('lat'), location.get('lng')
+        values = {
+            'id': info['id'],
+            'name': info['name'],
+            'type': info.get('type', ''),
+            'manufacturer': info.get('manufacturer', 'unknown'),
+            'status': info.get('status', ''),
+            'dir': dirs.get(info['name'], ''),
+            'dat_filename': dat.get('filename') or '',
+            'dat_original_filename': dat.get('original_filename') or '',
+            'cycle_filename': cycle_table.get('filename') or '',
+            'cycle_source_file': cycle_table.get('source_file') or '',
+            'cycle_sheet_name': cycle_table.get('sheet_name') or '',
+            'address': location.get('address') or '',
+            'confidence': (info.get('_classification') or {}).get('confidence') or '',
+        }
+
+        flags = 0
+        if dat.get('filename'):
+            flags |= FLAG_HAS_DAT
+        if cycle_table.get('filename'):
+            flags |= FLAG_HAS_CYCLE_TABLE
+        if lat is not None and lng is not None:
+            flags |= FLAG_HAS_LOCATION
+
+        plan_start = len(plans)
+        for p in dat.get('plans', []):
+            plan_splits = p.get('splits') or []
+            plans.append((
+                p.get('plan') or 0, p.get('cycle') or 0, p.get('offset') or 0,
+                int(bool(p.get('valid'))), len(plan_splits), len(splits),
+            ))
+            splits.extend(int(s or 0) for s in plan_splits)
+
+        refs = []
+        for field in STRING_FIELDS:
+            refs.extend(strings.add(values[field]))
+        records.append((
+            number, *refs,
+            dat.get('phases') or 0, flags, len(plans) - plan_start, plan_start,
+            float('nan') if lat is None else float(lat),
+            float('nan') if lng is None else float(lng),
+        ))
+
+    index_len = max(seen) + 1 if seen else 0
+    index = [0] * index_len
+    for i, record in enumerate(records):
+        index[record[0]] = i + 1
+
+    blob = strings.blob()
+    index_off = _aligned(HEADER.size)
+    records_off = _aligned(index_off + INDEX.size * index_len)
+    plans_off = _aligned(records_off + RECORD.size * len(records))
+    splits_off = _aligned(plans_off + PLAN.size * len(plans))
+    strings_off = _aligned(splits_off + SPLIT.size * len(splits))
+
+    buf = bytearray(strings_off + len(blob))
+    HEADER.pack_into(buf, 0, SNAPSHOT_MAGIC, SNAPSHOT_VERSION, RECORD.size, PLAN.size,
+                     len(records), index_len, len(plans), len(splits),
+                     index_off, records_off, plans_off, splits_off, strings_off, len(blob))
+    struct.pack_into(f'<{index_len}I', buf, index_off, *index)
+    for i, record in enumerate(records):
+        RECORD.pack_into(buf, records_off + i * RECORD.size, *record)
+    for i, plan in enumerate(plans):
+        PLAN.pack_into(buf, plans_off + i * PLAN.size, *plan)
+    struct.pack_into(f'<{len(splits)}H', buf, splits_off, *splits)
+    buf[strings_off:] = blob
+    return bytes(buf)
+
+
+def write_snapshot(path, infos: list[dict], dirs: Optional[dict] = None) -> bool:
+    """스냅샷을 원자적으로 저장한다. 기존 파일과 내용이 같으면 쓰지 않고 False."""
+    path = Path(path)
+    data = build_snapshot(infos, dirs)
+    try:
+        if path.stat().st_size == len(data) and path.read_bytes() == data:
+            return False
+    except OSError:
+        pass
+    atomic_write_bytes(path, data)
+    return True
+
+
+class Snapshot:
+    """mmap 기반 스냅샷 리더. 열 때는 헤더만 읽고, 레코드는 조회 시 디코딩한다.
+
+        with Snapshot('보령시_신호DB/signal_db.snap') as snap:
+            info = snap.get('BC-038')
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._read_header()
+        except Exception:
+            self._mm.close()
+            raise
+
+    def _read_header(self):
+        if len(self._mm) < HEADER.size:
+            raise ValueError(f'스냅샷 파일이 아님: {self.path}')
+        (magic, version, record_size, plan_size, self.count, self.index_len,
+         self.plan_count, self.split_count, self._index_off, self._records_off,
+         self._plans_off, self._splits_off, self._strings_off, strings_len
+         ) = HEADER.unpack_from(self._mm, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError(f'스냅샷 파일이 아님: {self.path}')
+        if version != SNAPSHOT_VERSION or record_size != RECORD.size or plan_size != PLAN.size:
+            raise ValueError(f'지원하지 않는 스냅샷 버전: {self.path} (v{version})')
+        if self._strings_off + strings_len > len(self._mm):
+            raise ValueError(f'스냅샷 파일 손상 (길이 부족): {self.path}')
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, bc_id) -> bool:
+        return self.find(bc_id) is not None
+
+    def __iter__(self) -> Iterator[dict]:
+        for i in range(self.count):
+            yield self.record(i)
+
+    def find(self, bc_id) -> Optional[int]:
+        """'BC-038' / 38 → 레코드 번호 (없으면 None). 인덱스 1회 조회."""
+        number = bc_number(bc_id)
+        if not 0 < number < self.index_len:
+            return None
+        slot = INDEX.unpack_from(self._mm, self._index_off + number * INDEX.size)[0]
+        return slot - 1 if slot else None
+
+    def get(self, bc_id, plans: bool = True) -> Optional[dict]:
+        """BC ID로 교차로 1건을 조회한다 (없으면 None)."""
+        i = self.find(bc_id)
+        return None if i is None else self.record(i, plans)
+
+    def record(self, i: int, plans: bool = True) -> dict:
+        """레코드 번호 i (0 ~ count-1) 를 딕셔너리로 디코딩한다."""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        fields = RECORD.unpack_from(self._mm, self._records_off + i * RECORD.size)
+        n = len(STRING_FIELDS)
+        result = {
+            field: self._string(fields[1 + 2 * k], fields[2 + 2 * k])
+            for k, field in enumerate(STRING_FIELDS)
+        }
+        phases, flags, plan_count, plan_start, lat, lng = fields[1 + 2 * n:]
+        result.update({
+            'phases': phases,
+            'has_dat': bool(flags & FLAG_HAS_DAT),
+            'has_cycle_table': bool(flags & FLAG_HAS_CYCLE_TABLE),
+            'lat': lat if flags & FLAG_HAS_LOCATION else None,
+            'lng': lng if flags & FLAG_HAS_LOCATION else None,
+            'plan_count': plan_count,
+        })
+        if plans:
+            result['plans'] = [self._plan(plan_start + k) for k in range(plan_count)]
+        return result
+
+    def _plan(self, j: int) -> dict:
+        plan, cycle, offset, valid, split_count, split_start = PLAN.unpack_from(
+            self._mm, self._plans_off + j * PLAN.size)
+        splits = struct.unpack_from(f'<{split_count}H', self._mm,
+                                    self._splits_off + split_start * SPLIT.size)
+        return {
+            'plan': plan,
+            'cycle': cycle,
+            'offset': offset,
+            'splits': list(splits),
+            'valid': bool(valid),
+        }
+
+    def _string(self, offset: int, length: int) -> str:
+        start = self._strings_off + offset
+        return self._mm[start:start + length].decode('utf-8')
+
+
+class _StringTable:
+    """UTF-8 문자열 테이블. 같은 문자열은 한 번만 저장한다."""
+
+    def __init__(self):
+        self._refs = {}
+        self._parts = []
+        self._size = 0
+
+    def add(self, text: str) -> tuple[int, int]:
+        ref = self._refs.get(text)
+        if ref is None:
+            data = text.encode('utf-8')
+            ref = (self._size, len(data))
+            self._refs[text] = ref
+            self._parts.append(data)
+            self._size += len(data)
+        return ref
+
+    def blob(self) -> bytes:
+        return b''.join(self._parts)
+
+
+def _aligned(offset: int) -> int:
+    return (offset + _ALIGN - 1) // _ALIGN * _ALIGN
+
+
+def main():
+    if len(sys.argv) < 2:
+        print(__doc__)
+        sys.exit(1)
+    if hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
+
+    with Snapshot(sys.argv[1]) as snap:
+        if len(sys.argv) == 2:
+            print(f'{snap.path}: 교차로 {len(snap)}개, 타이밍 계획 {snap.plan_count}개, '
+                  f'BC 번호 범위 1~{snap.index_len - 1}')
+            return
+        missing = 0
+        for bc_id in sys.argv[2:]:
+            info = snap.get(bc_id)
+            if info is None:
+                print(f'❌ 없음: {bc_id}', file=sys.stderr)
+                missing += 1
+            else:
+                print(json.dumps(info, ensure_ascii=False, indent=2))
+        if missing:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
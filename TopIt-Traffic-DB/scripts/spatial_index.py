@@ -0,0 +1,147 @@
+"""
+2D 공간 인덱스 - 요도 PDF 좌표(pt)의 점 집합에 대한 균일 격자 인덱스.
+
+요도 간선 추출 스크립트(extract_edges*.py, debug_*.py)가 선분 끝점/경유점마다
+전체 노드를 훑던 nearest_node 를 대신한다. 점은 cell 크기 격자 칸에 나눠 담고,
+조회는 질의점 주변 칸만 본다 (노드 밀도가 고르면 조회당 O(1), 전체 O(점 수)).
+
+사용 예:
+    from spatial_index import load_nodes, node_grid
+
+    nodes = load_nodes('pdf_extracted_nodes.json')
+    grid = node_grid(nodes)
+    i, d = grid.nearest(px, py, max_dist=40.0)      ← 없으면 (None, inf)
+    grid.within(px, py, 15.0)                        ← [(i, d), ...] 거리순
+    grid.k_nearest(px, py, 3)                        ← [(i, d), ...] 거리순
+
+거리는 math.hypot 으로 계산하고, 거리가 같으면 번호가 작은 점을 먼저 돌려준다
+(전체를 순서대로 훑던 기존 nearest_node 와 같은 결과).
+"""
+
+import heapq
+import json
+import math
+from typing import Optional
+
+
+class PointGrid:
+    """점 목록 [(x, y), ...] 에 대한 균일 격자 인덱스. 반환하는 번호는 입력 순서."""
+
+    def __init__(self, points, cell: Optional[float] = None):
+        self.points = [(float(x), float(y)) for x, y in points]
+        self.cell = cell or _auto_cell(self.points)
+        self._cells = {}
+        for i, (x, y) in enumerate(self.points):
+            self._cells.setdefault(self._key(x, y), []).append(i)
+        if self._cells:
+            cxs = [k[0] for k in self._cells]
+            cys = [k[1] for k in self._cells]
+            self._bounds = (min(cxs), min(cys), max(cxs), max(cys))
+        else:
+            self._bounds = None
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def nearest(self, x: float, y: float, max_dist: float = math.inf) -> tuple[Optional[int], float]:
+        """가장 가까운 점 (번호, 거리). max_dist 안에 없으면 (None, inf)."""
+        if self._bounds is None:
+            return None, math.inf
+        qx, qy = self._key(x, y)
+        best_i, best_d = None, math.inf
+        for r in range(self._max_ring(qx, qy) + 1):
+            # 링 r 칸의 점은 질의점에서 최소 (r-1)*cell 떨어져 있다
+            reach = max(r - 1, 0) * self.cell
+            if reach > max_dist or (best_i is not None and reach > best_d):
+                break
+            for i in self._ring(qx, qy, r):
+                px, py = self.points[i]
+                d = math.hypot(x - px, y - py)
+                if d < best_d or (d == best_d and i < best_i):
+                    best_i, best_d = i, d
+        if best_d <= max_dist:
+            return best_i, best_d
+        return None, math.inf
+
+    def within(self, x: float, y: float, radius: float) -> list[tuple[int, float]]:
+        """반경 radius 이내의 모든 점 [(번호, 거리), ...] (거리, 번호순)."""
+        if self._bounds is None or radius < 0:
+            return []
+        x0, y0 = self._key(x - radius, y - radius)
+        x1, y1 = self._key(x + radius, y + radius)
+        bx0, by0, bx1, by1 = self._bounds
+        found = []
+        for cx in range(max(x0, bx0), min(x1, bx1) + 1):
+            for cy in range(max(y0, by0), min(y1, by1) + 1):
+                for i in self._cells.get((cx, cy), ()):
+                    px, py = self.points[i]
+                    d = math.hypot(x - px, y - py)
+                    if d <= radius:
+                        found.append((d, i))
+        found.sort()
+        return [(i, d) for d, i in found]
+
+    def k_nearest(self, x: float, y: float, k: int,
+                  max_dist: float = math.inf) -> list[tuple[int, float]]:
+        """가까운 점 k개 [(번호, 거리), ...] (거리, 번호순). max_dist 밖의 점은 제외."""
+        if self._bounds is None or k <= 0:
+            return []
+        qx, qy = self._key(x, y)
+        heap = []  # (-거리, -번호) 최대 힙: 현재 k개 중 가장 먼 점이 맨 앞
+        for r in range(self._max_ring(qx, qy) + 1):
+            reach = max(r - 1, 0) * self.cell
+            if reach > max_dist or (len(heap) == k and reach > -heap[0][0]):
+                break
+            for i in self._ring(qx, qy, r):
+                px, py = self.points[i]
+                d = math.hypot(x - px, y - py)
+                if d > max_dist:
+                    continue
+                item = (-d, -i)
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return [(-ni, -nd) for nd, ni in sorted(heap, reverse=True)]
+
+    def _key(self, x: float, y: float) -> tuple[int, int]:
+        return math.floor(x / self.cell), math.floor(y / self.cell)
+
+    def _max_ring(self, qx: int, qy: int) -> int:
+        """질의 칸에서 점이 있는 모든 칸을 덮는 데 필요한 링 수."""
+        bx0, by0, bx1, by1 = self._bounds
+        return max(qx - bx0, bx1 - qx, qy - by0, by1 - qy, 0)
+
+    def _ring(self, qx: int, qy: int, r: int):
+        """질의 칸에서 체비쇼프 거리 r 인 칸들의 점 번호."""
+        cells = self._cells
+        if r == 0:
+            yield from cells.get((qx, qy), ())
+            return
+        for cx in range(qx - r, qx + r + 1):
+            yield from cells.get((cx, qy - r), ())
+            yield from cells.get((cx, qy + r), ())
+        for cy in range(qy - r + 1, qy + r):
+            yield from cells.get((qx - r, cy), ())
+            yield from cells.get((qx + r, cy), ())
+
+
+def load_nodes(path) -> list[dict]:
+    """pdf_extracted_nodes.json → [{'code', 'name', 'node_cx', 'node_cy', ...}, ...]"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def node_grid(nodes: list[dict], cell: Optional[float] = None) -> PointGrid:
+    """노드 목록의 (node_cx, node_cy) 인덱스. 번호는 nodes 의 순서와 같다."""
+    return PointGrid(((n['node_cx'], n['node_cy']) for n in nodes), cell)
+
+
+def _auto_cell(points) -> float:
+    """칸 하나에 점이 평균 1~2개 들어가도록 경계 상자 면적에서 칸 크기를 정한다."""
+    if len(points) < 2:
+        return 1.0
+    xs = [p[0] for p in points]
+    ys = [p[1] for p in points]
+    area = max(max(xs) - min(xs), 1.0) * max(max(ys) - min(ys), 1.0)
+    return max(math.sqrt(2.0 * area / len(points)), 1.0)
@@ -0,0 +1,197 @@
+"""
+SQLite 출력 백엔드 - classify 결과를 인덱스가 있는 단일 DB 파일로 저장한다.
+
+테이블은 supabase-schema.sql과 같은 구조를 따른다 (Supabase 오프라인 대용):
+  - intersections         ← info.json 1건 = 1행 (배열/객체 컬럼은 JSON 텍스트)
+  - intersection_history  ← info.json history
+  - route_diagram         ← 요도/routes.json (nodes, edges)
+  - timing_plans          ← dat.plans 를 행 단위로 분리 (주기/옵셋 조회용)
+
+intersections.id 는 BC-xxx 의 숫자 부분이고, 원래 ID는 bc_id 컬럼에 보존한다.
+전체를 임시 파일에 한 트랜잭션으로 쓴 뒤 교체하므로 읽는 쪽은 항상 완전한 DB를 본다.
+
+조회 예:
+    sqlite3 signal_db.sqlite "SELECT name FROM intersections WHERE manufacturer='서돌전자'"
+    sqlite3 signal_db.sqlite "SELECT i.name, p.plan FROM timing_plans p
+                              JOIN intersections i ON i.id = p.intersection_id WHERE p.cycle = 150"
+"""
+
+import json
+import os
+import re
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+
+SQLITE_NAME = 'signal_db.sqlite'
+
+SCHEMA = """
+CREATE TABLE intersections (
+  id INTEGER PRIMARY KEY,
+  bc_id TEXT UNIQUE,
+  name TEXT NOT NULL,
+  alias TEXT DEFAULT '[]',
+  type TEXT DEFAULT '',
+  manufacturer TEXT DEFAULT 'unknown',
+  status TEXT DEFAULT '미확인',
+  notes TEXT DEFAULT '',
+  has_dat INTEGER DEFAULT 0,
+  has_cycle_table INTEGER DEFAULT 0,
+  dat_phases INTEGER,
+  dat_cycle INTEGER,
+  dat TEXT,
+  cycle_table TEXT,
+  replacement TEXT,
+  classification TEXT,
+  lat REAL,
+  lng REAL,
+  address TEXT DEFAULT '',
+  routes TEXT DEFAULT '[]',
+  controller_model TEXT DEFAULT '',
+  created_at TEXT,
+  updated_at TEXT
+);
+
+CREATE TABLE intersection_history (
+  id INTEGER PRIMARY KEY,
+  intersection_id INTEGER REFERENCES intersections(id) ON DELETE CASCADE,
+  date TEXT,
+  action TEXT,
+  "by" TEXT DEFAULT 'web',
+  changes TEXT,
+  created_at TEXT
+);
+
+CREATE TABLE route_diagram (
+  id INTEGER PRIMARY KEY,
+  nodes TEXT DEFAULT '[]',
+  edges TEXT DEFAULT '[]',
+  updated_at TEXT
+);
+
+CREATE TABLE timing_plans (
+  intersection_id INTEGER REFERENCES intersections(id) ON DELETE CASCADE,
+  plan INTEGER,
+  cycle INTEGER,
+  "offset" INTEGER,
+  splits TEXT,
+  valid INTEGER,
+  PRIMARY KEY (intersection_id, plan)
+);
+
+CREATE INDEX idx_intersections_manufacturer ON intersections(manufacturer);
+CREATE INDEX idx_intersections_status ON intersections(status);
+CREATE INDEX idx_intersections_has_dat ON intersections(has_dat);
+CREATE INDEX idx_intersections_has_cycle_table ON intersections(has_cycle_table);
+CREATE INDEX idx_intersections_dat_cycle ON intersections(dat_cycle);
+CREATE INDEX idx_history_intersection_id ON intersection_history(intersection_id);
+CREATE INDEX idx_timing_plans_cycle ON timing_plans(cycle);
+"""
+
+
+def write_sqlite(path, infos: list[dict], route_diagram: Optional[dict] = None) -> dict:
+    """교차로 info 목록을 SQLite DB로 저장한다 (기존 파일은 원자적으로 교체).
+
+    Args:
+        path: 출력 .sqlite 경로
+        infos: classify의 info.json 딕셔너리 목록
+        route_diagram: {'nodes': [...], 'edges': [...]} (없으면 빈 행)
+
+    Returns:
+        테이블별 행 수
+    """
+    path = Path(path)
+    tmp = path.with_name(path.name + '.tmp')
+    if tmp.exists():
+        tmp.unlink()
+
+    now = datetime.now().isoformat(timespec='seconds')
+    rows = []
+    history_rows = []
+    plan_rows = []
+    for info in infos:
+        row = intersection_row(info, now)
+        rows.append(row)
+        for h in info.get('history', []):
+            history_rows.append((
+                row[0], h.get('date'), h.get('action', ''), h.get('by', 'system'),
+                _json(h.get('changes')), now,
+            ))
+        for p in (info.get('dat') or {}).get('plans', []):
+            plan_rows.append((
+                row[0], p.get('plan'), p.get('cycle'), p.get('offset'),
+                _json(p.get('splits', [])), int(bool(p.get('valid'))),
+            ))
+
+    diagram = route_diagram or {}
+    conn = sqlite3.connect(tmp)
+    try:
+        conn.executescript(SCHEMA)
+        with conn:
+            conn.executemany(
+                f'INSERT INTO intersections VALUES ({",".join("?" * 23)})', rows)
+            conn.executemany(
+                'INSERT INTO intersection_history '
+                '(intersection_id, date, action, "by", changes, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)', history_rows)
+            conn.executemany(
+                'INSERT INTO timing_plans VALUES (?, ?, ?, ?, ?, ?)', plan_rows)
+            conn.execute(
+                'INSERT INTO route_diagram (id, nodes, edges, updated_at) VALUES (1, ?, ?, ?)',
+                (_json(diagram.get('nodes', [])), _json(diagram.get('edges', [])), now))
+    finally:
+        conn.close()
+
+    os.replace(tmp, path)
+    return {
+        'intersections': len(rows),
+        'intersection_history': len(history_rows),
+        'timing_plans': len(plan_rows),
+    }
+
+
+def intersection_row(info: dict, now: str) -> tuple:
+    """info.json → intersections 행 (seed-supabase.mjs와 같은 필드 매핑)."""
+    dat = info.get('dat')
+    cycle_table = info.get('cycle_table')
+    location = info.get('location') or {}
+    plans = (dat or {}).get('plans') or []
+    return (
+        bc_number(info['id']),
+        info['id'],
+        info['name'],
+        _json(info.get('alias', [])),
+        info.get('type', ''),
+        info.get('manufacturer', 'unknown'),
+        info.get('status', '미확인'),
+        info.get('notes', ''),
+        int(bool(dat and dat.get('filename'))),
+        int(bool(cycle_table and cycle_table.get('filename'))),
+        (dat or {}).get('phases') or None,
+        plans[0].get('cycle') if plans else None,
+        _json(dat),
+        _json(cycle_table),
+        _json(info.get('replacement')),
+        _json(info.get('_classification')),
+        location.get('lat'),
+        location.get('lng'),
+        location.get('address', ''),
+        _json(info.get('routes', [])),
+        info.get('controller_model', ''),
+        now,
+        now,
+    )
+
+
+def bc_number(bc_id) -> int:
+    """'BC-038' / '38' → 38"""
+    digits = re.sub(r'\D', '', str(bc_id))
+    return int(digits) if digits else 0
+
+
+def _json(value) -> Optional[str]:
+    if value is None:
+        return None
+    return json.dumps(value, ensure_ascii=False)
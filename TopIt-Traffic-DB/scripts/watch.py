@@ -0,0 +1,200 @@
+"""
+드롭 폴더 감시 데몬 - 새 DAT/주기표가 들어오면 classify를 증분 실행한다.
+
+사용법:
+    python scripts/watch.py [classify 옵션] [--interval 초] [--debounce 초] [--max-wait 초] [--once]
+
+동작:
+  1. 시작 시 classify 1회 실행 (이전 실행 이후 바뀐 것만 처리)
+  2. interval 간격으로 DAT/엑셀 트리와 요도 PDF 노드/노선 파일을 폴링 (경로, 크기, 수정시각)
+     (요도 파일만 바뀌면 classify 는 identity_index.json 만 갱신)
+  3. 변경이 감지되면 debounce 동안 추가 변경이 없을 때까지 기다린 뒤 배치 실행
+     (복사 중인 파일은 크기/시각이 계속 바뀌므로 끝날 때까지 대기)
+     계속 파일이 들어와도 max-wait가 지나면 그때까지의 변경으로 실행
+  4. 배치는 classify.run() 증분 경로를 그대로 탄다:
+     변경 파일만 재파싱 → 전체 재매칭 → 내용이 바뀐 교차로 info.json/master.json만 재기록
+
+  5. 배치가 실패하면 그 변경을 보관했다가 debounce×2, ×4, … (최대 MAX_RETRY_BACKOFF초) 뒤 재시도한다.
+     그 사이 새 변경이 들어오면 debounce 후 보관한 변경과 합쳐 바로 실행한다.
+
+배치 실행 중에는 폴링하지 않으므로 그동안의 변경은 다음 배치 하나로 합쳐진다
+(대기열이 파일 트리 크기 이상으로 쌓이지 않음). 쓰기 작업자 수는 --workers로 제한한다.
+"""
+
+import os
+import signal
+import sys
+import time
+import traceback
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from classify import build_parser, run, source_dirs, diagram_sources, _setup_console, DEFAULT_CITY
+from inventory import build_inventory
+
+
+DEFAULT_INTERVAL = 2.0
+DEFAULT_DEBOUNCE = 3.0
+DEFAULT_MAX_WAIT = 30.0
+MAX_RETRY_BACKOFF = 300.0
+
+
+def snapshot(dat_dir, xlsx_dir, dat: bool = True, xlsx: bool = True, extra=()) -> dict:
+    """감시 대상 파일의 {경로: (크기, 수정시각 ns)}. classify와 같은 인벤토리 순회/스킵 규칙을 쓴다.
+
+    extra: 트리 밖에서 함께 감시할 개별 파일 (요도 PDF 노드/노선 파일 등, 없으면 제외)
+    """
+    inventory = build_inventory(dat_dir if dat else None, xlsx_dir if xlsx else None)
+    files = {
+        str(e['path']): (e['size'], e['mtime_ns'])
+        for entries in inventory.values()
+        for e in entries
+    }
+    for path in extra:
+        try:
+            st = os.stat(path)
+        except OSError:
+            continue
+        files[str(path)] = (st.st_size, st.st_mtime_ns)
+    return files
+
+
+def diff_snapshots(old: dict, new: dict) -> set:
+    """추가/수정/삭제된 경로 집합."""
+    changed = {p for p, sig in new.items() if old.get(p) != sig}
+    changed.update(set(old) - set(new))
+    return changed
+
+
+class DropFolderWatcher:
+    """폴링 + debounce 로 변경을 모아 classify.run()을 배치 실행한다."""
+
+    def __init__(self, args, interval: float = DEFAULT_INTERVAL,
+                 debounce: float = DEFAULT_DEBOUNCE, max_wait: float = DEFAULT_MAX_WAIT):
+        self.args = args
+        self.interval = interval
+        self.debounce = debounce
+        self.max_wait = max(max_wait, debounce)
+        self.pending = set()
+        self.first_change = None
+        self.last_change = None
+        self.batches = 0
+        self.failed = set()      # 실패한 배치의 변경 경로 (재시도 대상)
+        self.failures = 0        # 연속 실패 횟수
+        self.retry_at = None     # 다음 재시도 시각 (monotonic), 실패가 없으면 None
+
+    def poll(self) -> dict:
+        dat_dir, xlsx_dir, output_dir = source_dirs(self.args)
+        # 교차로 식별 인덱스 소스 (classify 가 변경 없는 실행에서도 반영)
+        extra = [p for p in diagram_sources(self.args) if p is not None]
+        extra.append(output_dir / '요도' / 'routes.json')
+        return snapshot(dat_dir, xlsx_dir,
+                        dat=not self.args.xlsx_only, xlsx=not self.args.dat_only, extra=extra)
+
+    def run_batch(self, reason: str, paths: frozenset = frozenset()) -> bool:
+        """classify 증분 실행. 실패해도 데몬은 계속 동작하고, paths를 보관했다가 backoff 후 재시도한다.
+
+        Returns:
+            성공 여부
+        """
+        self.batches += 1
+        started = time.perf_counter()
+        _log(f'배치 #{self.batches} 시작: {reason}')
+        try:
+            result = run(self.args)
+        except Exception:
+            self.failed |= paths
+            self.failures += 1
+            delay = min(self.debounce * 2 ** self.failures, MAX_RETRY_BACKOFF)
+            self.retry_at = time.monotonic() + delay
+            _log(f'배치 #{self.batches} 실패 ({self.failures}회 연속, {delay:.0f}s 후 재시도):\n'
+                 f'{traceback.format_exc()}')
+            return False
+        self.failed = set()
+        self.failures = 0
+        self.retry_at = None
+        elapsed = time.perf_counter() - started
+        if result is None:
+            _log(f'배치 #{self.batches} 건너뜀 (소스 디렉토리 없음)')
+            return True
+        rewritten = result['rewritten']
+        shown = ', '.join(rewritten[:5]) + (f' 외 {len(rewritten) - 5}개' if len(rewritten) > 5 else '')
+        _log(f'배치 #{self.batches} 완료 {elapsed:.1f}s — 변경 입력 {result["changed"]}개, '
+             f'교차로 {len(rewritten)}개 갱신{f" ({shown})" if rewritten else ""}, '
+             f'master.json {"갱신" if result["master_updated"] else "유지"}')
+        return True
+
+    def serve(self, once: bool = False):
+        """감시 루프. Ctrl+C로 종료."""
+        dat_dir, xlsx_dir, _ = source_dirs(self.args)
+        _log(f'{self.args.city} 감시 시작 (폴링 {self.interval}s, debounce {self.debounce}s, 최대 대기 {self.max_wait}s)')
+        _log(f'  DAT: {dat_dir}')
+        _log(f'  주기표: {xlsx_dir}')
+
+        last = self.poll()
+        self.run_batch('시작 시 동기화')
+        if once:
+            return
+
+        while True:
+            time.sleep(self.interval)
+            current = self.poll()
+            changed = diff_snapshots(last, current)
+            last = current
+            now = time.monotonic()
+
+            if changed:
+                if not self.pending:
+                    self.first_change = now
+                self.pending.update(changed)
+                self.last_change = now
+
+            ready = bool(self.pending) and (now - self.last_change >= self.debounce
+                                            or now - self.first_change >= self.max_wait)
+            retry = self.retry_at is not None and now >= self.retry_at
+            if not (ready or retry):
+                continue
+            paths = frozenset(self.pending | self.failed)
+            names = sorted(os.path.basename(p) for p in paths)
+            reason = f'{len(names)}개 파일 변경 ({", ".join(names[:3])}{" …" if len(names) > 3 else ""})'
+            if not ready:
+                reason = f'재시도 #{self.failures}: {reason if names else "시작 시 동기화"}'
+            self.pending.clear()
+            # last는 배치 전 스냅샷 그대로 두어 배치 중 들어온 변경도 다음 폴링에서 감지한다
+            self.run_batch(reason, paths)
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _log(msg: str):
+    print(f'[{datetime.now().strftime("%H:%M:%S")}] {msg}', flush=True)
+
+
+def main():
+    parser = build_parser()
+    parser.description = f'신호DB 드롭 폴더 감시 (classify 증분 실행, 기본 도시: {DEFAULT_CITY})'
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL,
+                        help=f'폴링 간격 초 (기본 {DEFAULT_INTERVAL})')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE,
+                        help=f'마지막 변경 후 대기 초 (기본 {DEFAULT_DEBOUNCE})')
+    parser.add_argument('--max-wait', type=float, default=DEFAULT_MAX_WAIT,
+                        help=f'변경이 계속될 때 최대 대기 초 (기본 {DEFAULT_MAX_WAIT})')
+    parser.add_argument('--once', action='store_true',
+                        help='시작 시 동기화만 하고 종료')
+    args = parser.parse_args()
+    _setup_console()
+
+    # 서비스 관리자(systemd, nssm 등)의 종료 요청도 Ctrl+C와 같이 처리
+    signal.signal(signal.SIGTERM, _raise_interrupt)
+    watcher = DropFolderWatcher(args, args.interval, args.debounce, args.max_wait)
+    try:
+        watcher.serve(once=args.once)
+    except KeyboardInterrupt:
+        _log(f'감시 종료 (배치 {watcher.batches}회)')
+
+
+if __name__ == '__main__':
+    main()
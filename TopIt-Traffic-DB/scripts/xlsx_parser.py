@@ -7,20 +7,24 @@
   - 신규 파일: "01_20 신규.xls" → 시트별 교차로
 """
 
+import importlib
 import os
 import re
 from pathlib import Path
 from typing import Optional
 
-try:
-    import openpyxl
-except ImportError:
-    openpyxl = None
+# 엑셀 백엔드(openpyxl/xlrd)는 임포트 비용이 커서 실제로 엑셀을 열 때 로드한다.
+_BACKENDS = {}
 
-try:
-    import xlrd
-except ImportError:
-    xlrd = None
+
+def excel_backend(name: str):
+    """엑셀 백엔드 모듈(openpyxl/xlrd)을 지연 로드한다. 미설치 시 None. 다른 모듈도 이 함수로 연다."""
+    if name not in _BACKENDS:
+        try:
+            _BACKENDS[name] = importlib.import_module(name)
+        except ImportError:
+            _BACKENDS[name] = None
+    return _BACKENDS[name]
 
 
 # 무시할 시트명 (정확 일치, 소문자)
@@ -66,6 +70,7 @@ def parse_excel_file(filepath: str) -> list[dict]:
 
 
 def _parse_xlsx(filepath: str) -> list[dict]:
+    openpyxl = excel_backend('openpyxl')
     if openpyxl is None:
         return [_error_entry(filepath, 'openpyxl 미설치')]
 
@@ -110,6 +115,7 @@ def _parse_xlsx(filepath: str) -> list[dict]:
 
 
 def _parse_xls(filepath: str) -> list[dict]:
+    xlrd = excel_backend('xlrd')
     if xlrd is None:
         return [_error_entry(filepath, 'xlrd 미설치')]
 
@@ -257,36 +263,41 @@ def _extract_name_from_cells(cell_texts: list[str]) -> Optional[str]:
     return None
 
 
+def list_excel_files(directory: str) -> list[Path]:
+    """디렉토리 내 주기표 후보 엑셀 파일 경로를 반환한다 (.xlsx 먼저, 이후 .xls, inventory 순회 사용)."""
+    from inventory import build_inventory, paths
+    return paths(build_inventory(xlsx_dir=directory), 'xlsx')
+
+
+def is_skipped_excel(filename: str) -> bool:
+    """주기표가 아닌 엑셀 파일(임시/요도/설계 등)인지 판별한다."""
+    # 임시 파일 스킵
+    if filename.startswith('~$'):
+        return True
+    # 요도 파일 스킵
+    if '요도' in filename:
+        return True
+    # DNG/이미지/zip 파일 스킵
+    if os.path.splitext(filename)[1].lower() in ('.dng', '.png', '.jpg', '.zip'):
+        return True
+    # 설계/도면 관련 파일 스킵
+    skip_keywords = ['설계', '도면', 'DBSheet', '제어기조사']
+    return any(kw in filename for kw in skip_keywords)
+
+
+def scan_excel_file(excel_file) -> list[dict]:
+    """엑셀 파일 1개의 시트별 교차로 정보를 반환한다. 오류는 error 항목으로 반환한다."""
+    try:
+        return parse_excel_file(str(excel_file))
+    except Exception as e:
+        return [_error_entry(str(excel_file), str(e))]
+
+
 def scan_excel_directory(directory: str) -> list[dict]:
     """디렉토리 내 모든 엑셀 파일을 스캔하여 시트별 교차로 정보를 반환한다."""
     results = []
-    dir_path = Path(directory)
-
-    for ext_pattern in ['*.xlsx', '*.xls']:
-        for excel_file in sorted(dir_path.rglob(ext_pattern)):
-            # 임시 파일 스킵
-            if excel_file.name.startswith('~$'):
-                continue
-            # 요도 파일 스킵
-            if '요도' in excel_file.name:
-                continue
-            # DNG/이미지 파일 스킵
-            if excel_file.suffix.lower() in ('.dng', '.png', '.jpg'):
-                continue
-            # 설계/도면 관련 파일 스킵
-            skip_keywords = ['설계', '도면', 'DBSheet', '제어기조사']
-            if any(kw in excel_file.name for kw in skip_keywords):
-                continue
-            # zip 파일 스킵
-            if excel_file.suffix.lower() == '.zip':
-                continue
-
-            try:
-                sheets = parse_excel_file(str(excel_file))
-                results.extend(sheets)
-            except Exception as e:
-                results.append(_error_entry(str(excel_file), str(e)))
-
+    for excel_file in list_excel_files(directory):
+        results.extend(scan_excel_file(excel_file))
     return results
 
 
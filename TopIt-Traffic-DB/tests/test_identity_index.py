@@ -0,0 +1,71 @@
+"""
+identity_index 테스트 - 정식 교차로 목록이 바뀔 때 증분 갱신 결과가 --rebuild 와 같은지 확인한다.
+
+    python -m pytest tests/test_identity_index.py
+"""
+
+import sys
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+
+from identity_index import new_index, resolve, set_canonical, update_source
+
+
+PDF_ENTRIES = [
+    {'key': '001', 'name': '대천사거리', 'hint': None},
+    {'key': '002', 'name': '보령모텔', 'hint': None},
+    {'key': '003', 'name': '(미확인)', 'hint': '3'},
+    {'key': '004', 'name': '원의교차로', 'hint': '7'},
+    {'key': '005', 'name': '선촌', 'hint': None},
+]
+
+
+def _build(canonical, entries=PDF_ENTRIES):
+    index = new_index()
+    set_canonical(index, canonical)
+    update_source(index, 'pdf', entries)
+    return index
+
+
+def _assert_same_as_rebuild(before, after):
+    index = _build(before)
+    set_canonical(index, after)
+    rebuilt = _build(after)
+    assert index['sources']['pdf']['keys'] == rebuilt['sources']['pdf']['keys']
+    assert index['sources']['pdf']['scores'] == rebuilt['sources']['pdf']['scores']
+    return index
+
+
+def test_new_same_name_canonical_makes_exact_key_ambiguous():
+    before = [('BC-001', '대천사거리'), ('BC-002', '보령모텔')]
+    index = _assert_same_as_rebuild(before, before + [('BC-004', '대천사거리')])
+    assert resolve(index, 'pdf', '001') is None
+
+
+def test_removed_duplicate_makes_key_resolvable_again():
+    before = [('BC-001', '대천사거리'), ('BC-004', '대천사거리')]
+    index = _assert_same_as_rebuild(before, [('BC-001', '대천사거리')])
+    assert resolve(index, 'pdf', '001') == 'BC-001'
+
+
+def test_hint_target_change_relinks_key():
+    before = [('BC-003', '주공'), ('BC-010', '원의교차로')]
+    after = [('BC-003', '주공'), ('BC-007', '원의교차로'), ('BC-010', '원의교차로')]
+    index = _assert_same_as_rebuild(before, after)
+    assert resolve(index, 'pdf', '003') == 'BC-003'
+    assert resolve(index, 'pdf', '004') == 'BC-007'
+
+
+def test_renamed_and_removed_targets_match_rebuild():
+    before = [('BC-001', '대천사거리'), ('BC-002', '보령모텔'), ('BC-005', '선촌교차로')]
+    after = [('BC-001', '대천삼거리'), ('BC-005', '선촌교차로'), ('BC-006', '보령모텔')]
+    _assert_same_as_rebuild(before, after)
+
+
+def test_unchanged_canonical_is_noop():
+    canonical = [('BC-001', '대천사거리')]
+    index = _build(canonical)
+    assert set_canonical(index, canonical) is False
+    assert resolve(index, 'pdf', '001') == 'BC-001'
@@ -0,0 +1,146 @@
+"""
+pg_loader 적재 테스트 - 로컬 Postgres 에 대해 실행한다.
+
+    PG_TEST_DSN=postgresql://localhost/postgres python -m pytest tests/test_pg_loader.py
+
+PG_TEST_DSN 이 없으면 DB 테스트는 건너뛴다. 테스트마다 임시 스키마를 만들고 끝나면 지운다.
+"""
+
+import json
+import os
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / 'scripts'))
+
+import pg_loader
+from manifest import safe_dirname
+
+
+PG_TEST_DSN = os.environ.get('PG_TEST_DSN')
+
+needs_pg = pytest.mark.skipif(not PG_TEST_DSN, reason='PG_TEST_DSN 미설정')
+
+
+def write_db_dir(root: Path, infos: dict) -> Path:
+    """classify 출력 형태의 폴더 (master.json + 교차로/{이름}/info.json)."""
+    root.mkdir(parents=True, exist_ok=True)
+    master = {'intersections': [{'id': bc_id, 'name': info['name']} for bc_id, info in infos.items()]}
+    (root / 'master.json').write_text(json.dumps(master, ensure_ascii=False), encoding='utf-8')
+    for info in infos.values():
+        folder = root / '교차로' / safe_dirname(info['name'])
+        folder.mkdir(parents=True)
+        (folder / 'info.json').write_text(json.dumps(info, ensure_ascii=False), encoding='utf-8')
+    return root
+
+
+def sample_infos() -> dict:
+    return {
+        'BC-001': {
+            'name': '대천사거리',
+            'notes': '',
+            'history': [
+                {'date': '2024-05-01', 'action': '분류', 'by': 'system', 'changes': {'status': '미확인'}},
+            ],
+        },
+        'BC-002': {
+            'name': '궁촌4R',
+            'alias': ['궁촌 사거리'],
+            'history': [
+                {'date': '2024-05-01', 'action': '분류', 'by': 'system', 'changes': None},
+                # 같은 이력이 두 번 기록된 info.json 도 한 건만 적재되어야 한다
+                {'date': '2024-05-01', 'action': '분류', 'by': 'system', 'changes': None},
+            ],
+        },
+    }
+
+
+@pytest.fixture
+def conn():
+    schema = f'loader_test_{uuid.uuid4().hex[:8]}'
+    try:
+        connection = pg_loader.connect(PG_TEST_DSN)
+    except RuntimeError as e:
+        pytest.skip(str(e))
+    with connection.cursor() as cur:
+        cur.execute(f'CREATE SCHEMA {schema}')
+        cur.execute(f'SET search_path TO {schema}')
+        cur.execute(pg_loader.local_schema_sql())
+    connection.commit()
+    try:
+        yield connection
+    finally:
+        connection.rollback()
+        with connection.cursor() as cur:
+            cur.execute(f'DROP SCHEMA {schema} CASCADE')
+        connection.commit()
+        connection.close()
+
+
+def load_dir(conn, db_dir: Path) -> dict:
+    rows, history_rows, route_diagram, warnings = pg_loader.load_db_rows(db_dir)
+    assert warnings == []
+    return pg_loader.load(conn, rows, history_rows, route_diagram)
+
+
+def fetch(conn, sql: str) -> list[tuple]:
+    with conn.cursor() as cur:
+        cur.execute(sql)
+        return cur.fetchall()
+
+
+def test_copy_text_escapes_fields():
+    rows = [(1, 'a\tb\nc', ['x"y', 'z\\w'], None, True)]
+    columns = [('id', 'int'), ('name', 'text'), ('alias', 'array'), ('dat', 'json'), ('has_dat', 'bool')]
+    assert pg_loader.copy_text(rows, columns) == '1\ta\\tb\\nc\t{"x\\\\"y","z\\\\\\\\w"}\t\\N\tt\n'
+
+
+@needs_pg
+def test_reload_is_noop(conn, tmp_path):
+    db_dir = write_db_dir(tmp_path, sample_infos())
+
+    first = load_dir(conn, db_dir)
+    assert (first['inserted'], first['updated'], first['unchanged']) == (2, 0, 0)
+    assert first['history'] == 2
+    stamps = fetch(conn, 'SELECT id, updated_at FROM intersections ORDER BY id')
+
+    second = load_dir(conn, db_dir)
+    assert (second['inserted'], second['updated'], second['unchanged']) == (0, 0, 2)
+    assert second['history'] == 0
+    assert fetch(conn, 'SELECT id, updated_at FROM intersections ORDER BY id') == stamps
+    assert fetch(conn, 'SELECT count(*) FROM intersection_history') == [(2,)]
+
+
+@needs_pg
+def test_changed_row_updates_only_that_row(conn, tmp_path):
+    infos = sample_infos()
+    load_dir(conn, write_db_dir(tmp_path / 'v1', infos))
+
+    infos['BC-001']['notes'] = '신호 현시 변경'
+    infos['BC-001']['history'].append(
+        {'date': '2024-06-01', 'action': '수정', 'by': 'web', 'changes': {'notes': '신호 현시 변경'}})
+    stats = load_dir(conn, write_db_dir(tmp_path / 'v2', infos))
+
+    assert (stats['inserted'], stats['updated'], stats['unchanged']) == (0, 1, 1)
+    assert stats['history'] == 1
+    assert fetch(conn, 'SELECT notes FROM intersections WHERE id = 1') == [('신호 현시 변경',)]
+    assert fetch(conn, 'SELECT count(*) FROM intersection_history WHERE intersection_id = 1') == [(2,)]
+
+
+def test_undated_history_loads_as_null(tmp_path):
+    infos = {'BC-001': {'name': '대천사거리', 'history': [{'action': '분류', 'by': 'system'}]}}
+    _, history_rows, _, _ = pg_loader.load_db_rows(write_db_dir(tmp_path, infos))
+    assert history_rows == [(1, None, '분류', 'system', None)]
+
+
+@needs_pg
+def test_undated_history_reload_is_noop(conn, tmp_path):
+    infos = {'BC-001': {'name': '대천사거리', 'history': [{'action': '분류', 'by': 'system'}]}}
+    db_dir = write_db_dir(tmp_path, infos)
+
+    assert load_dir(conn, db_dir)['history'] == 1
+    assert load_dir(conn, db_dir)['history'] == 0
+    assert fetch(conn, 'SELECT date FROM intersection_history') == [(None,)]
@@ -0,0 +1,84 @@
+"""
+route_extractor 회귀 테스트 - 요도 워크북에서 추출한 노선을 커밋된 routes.json / route_analysis.json 과 비교한다.
+
+    python -m pytest tests/test_route_extractor.py
+
+xlrd 가 없거나 요도 워크북/보령시_신호DB 가 없으면 회귀 테스트는 건너뛴다.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_ROOT / 'scripts'))
+
+import route_extractor
+from xlsx_parser import excel_backend
+
+
+WORKBOOK = PROJECT_ROOT / '주기표엑셀' / '최신본' / '●수정_보령 신호제어기 요도_20211214.xls'
+DB_DIR = PROJECT_ROOT / '보령시_신호DB'
+
+
+def test_find_routes_exact_names_only():
+    names = {'주공': 'BC-001', '보령모텔': 'BC-002', '원의교차로': 'BC-003', '선촌교차로': 'BC-004'}
+    cells = [
+        (0, 0, '선촌교차로'), (0, 2, '원의교차로'), (0, 4, '주공4R'), (0, 6, '터미널'),
+        (1, 4, '주공'),
+        (2, 4, '보령모텔'),
+    ]
+    routes, controllers = route_extractor.find_routes(cells, names)
+
+    assert [c['name'] for c in controllers] == ['선촌교차로', '원의교차로', '주공', '보령모텔']
+    assert [(r['type'], r['line'], [c['name'] for c in r['controllers']]) for r in routes] == [
+        ('horizontal', 0, ['선촌교차로', '원의교차로']),
+        ('vertical', 4, ['주공', '보령모텔']),
+    ]
+    assert routes[0]['road_name'] == '원의교차로'
+
+
+def test_load_canonical_names_drops_ambiguous(tmp_path):
+    master = {'intersections': [{'id': 'BC-001', 'name': '주공'}, {'id': 'BC-002', 'name': '터미널'},
+                                {'id': 'BC-003', 'name': '터미널'}]}
+    (tmp_path / 'master.json').write_text(json.dumps(master, ensure_ascii=False), encoding='utf-8')
+
+    assert route_extractor.load_canonical_names(tmp_path) == {'주공': 'BC-001'}
+
+
+def test_load_canonical_names_formats_bare_numbers(tmp_path):
+    master = {'intersections': [{'id': '208', 'name': '선촌교차로'}, {'id': '15', 'name': '정심원'}]}
+    (tmp_path / 'master.json').write_text(json.dumps(master, ensure_ascii=False), encoding='utf-8')
+
+    assert route_extractor.load_canonical_names(tmp_path) == {'선촌교차로': 'BC-208', '정심원': 'BC-015'}
+
+
+def test_compare_routes_rejects_bare_ids():
+    routes = [{'type': 'horizontal', 'line': 0, 'road_name': None,
+               'controllers': [{'row': 0, 'col': 0, 'name': '주공', 'id': '1'},
+                               {'row': 0, 'col': 2, 'name': '보령모텔', 'id': 'BC-002'}]}]
+    routes_json = route_extractor.build_routes_json(routes, 'x.xls')
+    analysis_json = route_extractor.build_analysis_json(routes, routes[0]['controllers'], 'x.xls')
+
+    diffs = route_extractor.compare_routes(routes_json, analysis_json, routes_json, analysis_json)
+    assert diffs and all("'1'" in d for d in diffs)
+
+
+@pytest.mark.skipif(excel_backend('xlrd') is None or not WORKBOOK.is_file() or not DB_DIR.is_dir(),
+                    reason='xlrd 미설치 또는 요도 워크북/보령시_신호DB 없음')
+def test_matches_committed_routes():
+    names = route_extractor.load_canonical_names(DB_DIR)
+    _, cells = route_extractor.read_sparse_cells(WORKBOOK)
+    routes, controllers = route_extractor.find_routes(cells, names)
+    source = WORKBOOK.name
+    routes_json = route_extractor.build_routes_json(routes, source)
+    analysis_json = route_extractor.build_analysis_json(routes, controllers, source)
+
+    expected_routes, expected_analysis = [json.loads((PROJECT_ROOT / name).read_text(encoding='utf-8'))
+                                          for name in ('routes.json', 'route_analysis.json')]
+    assert route_extractor.compare_routes(routes_json, analysis_json, expected_routes, expected_analysis) == []
+    # 커밋된 파일은 이 master.json 번호로 만들었으므로 BC ID 까지 같아야 한다
+    assert [r['controllers'] for r in routes_json['routes']] == [r['controllers'] for r in expected_routes['routes']]
+    assert analysis_json['all_intersections'] == expected_analysis['all_intersections']
@@ -26,6 +26,24 @@ async function writeJson(filepath, data) {
   await fs.writeFile(filepath, JSON.stringify(data, null, 2), 'utf-8');
 }
 
+// 교차로 폴더의 DAT/주기표는 제자리에서 덮어쓰지 않고 임시파일 → rename으로 교체한다.
+// (기존 파일이 다른 경로와 inode를 공유하는 하드링크여도 그쪽 내용은 바뀌지 않음)
+function tempPathFor(filepath) {
+  return path.join(path.dirname(filepath),
+    `.${path.basename(filepath)}.${process.pid}.${Date.now()}.tmp`);
+}
+
+async function replaceFile(filepath, write) {
+  const tmp = tempPathFor(filepath);
+  try {
+    await write(tmp);
+    await fs.rename(tmp, filepath);
+  } catch (e) {
+    await fs.rm(tmp, { force: true });
+    throw e;
+  }
+}
+
 function getIntersectionDir(id) {
   // id → master.json에서 name 찾아서 폴더명 결정
   return null; // findIntersectionDir에서 처리
@@ -557,7 +575,7 @@ app.post('/api/dat-register', upload.single('file'), async (req, res) => {
       useId = existingId;
 
       await fs.mkdir(dirPath, { recursive: true });
-      await fs.copyFile(req.file.path, path.join(dirPath, datFilename));
+      await replaceFile(path.join(dirPath, datFilename), tmp => fs.copyFile(req.file.path, tmp));
 
       // 기존 info.json 읽기
       const infoPath = path.join(dirPath, 'info.json');
@@ -588,7 +606,7 @@ app.post('/api/dat-register', upload.single('file'), async (req, res) => {
           if (phases.length > 0) {
             const xlsxBuf = await generateCycleTable(name, phases, periods, datInfo);
             const cycleFilename = `${name}_주기표.xlsx`;
-            await fs.writeFile(path.join(dirPath, cycleFilename), xlsxBuf);
+            await replaceFile(path.join(dirPath, cycleFilename), tmp => fs.writeFile(tmp, xlsxBuf));
             info.cycle_table = { filename: cycleFilename };
             info.history.unshift({ date: today, action: '주기표 재생성', by: 'system' });
             cycleMessage = '주기표가 재생성되었습니다.';
@@ -637,7 +655,7 @@ app.post('/api/dat-register', upload.single('file'), async (req, res) => {
       useId = String(maxNum + 1);
 
       await fs.mkdir(dirPath, { recursive: true });
-      await fs.copyFile(req.file.path, path.join(dirPath, datFilename));
+      await replaceFile(path.join(dirPath, datFilename), tmp => fs.copyFile(req.file.path, tmp));
 
       const info = {
         id: useId,
@@ -674,7 +692,7 @@ app.post('/api/dat-register', upload.single('file'), async (req, res) => {
           if (phases.length > 0) {
             const xlsxBuf = await generateCycleTable(name, phases, periods, datInfo);
             const cycleFilename = `${name}_주기표.xlsx`;
-            await fs.writeFile(path.join(dirPath, cycleFilename), xlsxBuf);
+            await replaceFile(path.join(dirPath, cycleFilename), tmp => fs.writeFile(tmp, xlsxBuf));
             info.cycle_table = { filename: cycleFilename };
             info.history.unshift({ date: today, action: '주기표 자동 생성', by: 'system' });
             cycleMessage = '주기표가 자동 생성되었습니다.';